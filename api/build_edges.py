@@ -0,0 +1,78 @@
+"""Derive Edges.csv for a Nodes.csv that was written without one.
+
+Crawls run with a CSV output (wikipedia_extractor.py --output Nodes.csv)
+write Edges.csv themselves. Older Nodes.csv files carry no URLs, so the
+person -> event relationships are recovered from each person's
+"Battles / wars" infobox text, plus the hand-curated links the network
+view was originally built on:
+
+    python api/build_edges.py Nodes.csv Edges.csv
+"""
+import os
+import sys
+import csv
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_sinks import EDGES_CSV_FIELDS
+
+WAR_KEYS = ('Battles / wars', 'Battles/wars', 'Wars', 'Battles')
+
+KEY_PEOPLE = ['p1', 'p2', 'p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10']
+WORLD_WAR_PEOPLE = ['p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10']
+NORMANDY_PEOPLE = ['p4', 'p5', 'p6', 'p7', 'p8']
+
+CURATED_EDGES = (
+    [(person, 'e1') for person in KEY_PEOPLE] +  # Key people to Korean War
+    [(person, event) for person in WORLD_WAR_PEOPLE for event in ['e4', 'e5']] +  # Key people to WWI/WWII
+    [(person, event) for person in NORMANDY_PEOPLE for event in ['e15', 'e16']] +  # Military leaders to Overlord/Normandy
+    [('p5', event) for event in ['e35', 'e36', 'e51', 'e52']]  # MacArthur to Philippines
+)
+
+def events_in_text(text, events):
+    """Event IDs whose names appear in text, longest names first so 'World War I' doesn't match 'World War II'"""
+    found = []
+    for name, event_id in events:
+        if name in text:
+            found.append(event_id)
+            text = text.replace(name, '\0')
+    return found
+
+def build_edges(rows):
+    node_ids = {row['node_id'] for row in rows}
+    events = sorted(((row['name'], row['node_id']) for row in rows if row['node_type'] == 'Event' and row['name']),
+                    key=lambda event: -len(event[0]))
+    edges = [edge for edge in CURATED_EDGES if edge[0] in node_ids and edge[1] in node_ids]
+    seen = set(edges)
+    for row in rows:
+        if row['node_type'] != 'Person':
+            continue
+        try:
+            metadata = json.loads(row.get('metadata') or '{}')
+        except ValueError:
+            continue
+        text = ' '.join(metadata.get(key, '') for key in WAR_KEYS)
+        for event_id in events_in_text(text, events):
+            edge = (row['node_id'], event_id)
+            if edge not in seen:
+                seen.add(edge)
+                edges.append(edge)
+    return edges
+
+def main():
+    nodes_path = sys.argv[1] if len(sys.argv) > 1 else 'Nodes.csv'
+    edges_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(nodes_path), 'Edges.csv')
+    with open(nodes_path, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    edges = build_edges(rows)
+    with open(edges_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=EDGES_CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows({'source_id': source_id, 'target_id': target_id, 'relationship': 'involvement'}
+                         for source_id, target_id in edges)
+    print(f"Wrote {len(edges)} edges for {len(rows)} nodes to {edges_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
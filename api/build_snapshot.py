@@ -0,0 +1,35 @@
+"""Compile Nodes.csv and Edges.csv into the snapshot the API loads at startup.
+
+The snapshot holds the parsed rows, the node and adjacency indexes and the
+precomputed responses, so a cold start unpickles one file instead of
+parsing the CSV. The API writes it itself the first time it parses the CSV
+(and again whenever the data hash no longer matches them); run this as a
+build step to have it ready before the first start:
+
+    python api/build_snapshot.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import csv_reader
+
+def main():
+    nodes_path = csv_reader.find_data_file('Nodes.csv')
+    if nodes_path is None:
+        print("Nodes.csv not found")
+        return 1
+    csv_data = csv_reader.read_csv_data()
+    if not csv_data:
+        return 1
+    with csv_reader.app.app_context():
+        graph = csv_reader.build_csv_graph(csv_data)
+    snapshot_path = csv_reader.save_snapshot(graph)
+    if snapshot_path is None:
+        return 1
+    print(f"Wrote {snapshot_path} ({os.path.getsize(snapshot_path) // 1024} KB, data version {graph.version})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,606 @@
 import csv
+import gzip
 import json
 import os
-from flask import Flask, jsonify, make_response
+import sys
+import pickle
+import hashlib
+import threading
+from urllib.parse import urlparse
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from flask import Flask, Response, jsonify, make_response, request
 from flask_cors import CORS
 
+try:
+    import brotli
+except ImportError:  # Optional: responses are still served gzipped
+    brotli = None
+
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'ETag'])
 
 # Add proper headers to all responses
 @app.after_request
 def add_headers(response):
     response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    response.headers['Content-Type'] = 'application/json; charset=utf-8'
+    # Endpoints serving immutable data set their own caching headers
+    if 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+    # Streamed responses (NDJSON) and Prometheus metrics set their own content type
+    if not response.is_streamed and response.mimetype != 'text/plain':
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
     return response
 
 # Cache the CSV data to avoid reading it multiple times
 _csv_data = None
+_graph = None
+# Graphs of recently used finished extraction jobs, by session ID, least recently used first
+_job_graphs = OrderedDict()
+_job_graphs_lock = threading.Lock()
+# A CSV job's graph holds all its nodes and payloads in memory, so only this many are kept
+MAX_JOB_GRAPHS = 8
+_job_manager = None
+_session_store = None
+_job_manager_lock = threading.Lock()
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# Output of extraction jobs, one directory per job (see extraction_jobs.py)
+JOBS_DIR = os.path.join(ROOT_DIR, 'jobs')
+# Crawls that may run at the same time; more are queued
+MAX_CONCURRENT_JOBS = 2
+# Seconds between keep-alive comments on an idle event stream
+EVENT_STREAM_HEARTBEAT = 15
+MAX_JOB_DEGREE = 10
+
+# The bundled Nodes.csv is session 1; extraction jobs are numbered from 2
+CSV_SESSION_ID = 1
+CSV_SESSION = {
+    'id': CSV_SESSION_ID,
+    'name': 'Korean War Data (CSV)',
+    'seed_url': 'https://en.wikipedia.org/wiki/Korean_War',
+    'max_degree': 3,
+    'status': 'completed',
+    'started_at': '2024-01-01T00:00:00',
+    'completed_at': '2024-01-01T00:00:00'
+}
+
+# When set, the only directory searched for Nodes.csv, Edges.csv and the snapshot (used by the benchmarks)
+DATA_DIR = None
+
+# Precompiled graph written by api/build_snapshot.py; set to None to always parse the CSV
+SNAPSHOT_FILE = 'Nodes.snapshot.pickle'
+# Bump when GraphIndex's attributes change so older snapshots are rebuilt
+SNAPSHOT_FORMAT = 3
+
+# Nodes that are always part of the network view: Korean War and key people
+DEFAULT_VISIBLE_IDS = ['e1', 'p1', 'p2', 'p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10']
+
+# Largest ?depth= accepted by the expand endpoint
+MAX_EXPAND_DEPTH = 3
+
+# Read-only responses may be reused this long before the client revalidates
+CACHE_MAX_AGE = 300
+
+# Page size limits for /nodes?limit=
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def accepted_codings(accept_encoding):
+    """(coding, q) for each coding listed in an Accept-Encoding header; an unreadable q-value counts as 0"""
+    codings = []
+    for part in (accept_encoding or '').split(','):
+        coding, *params = part.split(';')
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        if coding.strip():
+            codings.append((coding.strip().lower(), q))
+    return codings
+
+def etag_matches(if_none_match, etags):
+    """Whether an If-None-Match header names any of etags (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = {tag.strip()[2:] if tag.strip().startswith('W/') else tag.strip() for tag in if_none_match.split(',')}
+    return any(etag in tags for etag in etags)
+
+class PrecomputedResponse:
+    """A JSON payload serialized and compressed once, served by ETag"""
+    def __init__(self, body, etag, encodings=None):
+        self.etag = etag
+        if encodings is None:
+            encodings = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+            if brotli is not None:
+                encodings['br'] = brotli.compress(body)
+        self.encodings = encodings
+
+    def etag_for(self, encoding):
+        # Each encoding is a different representation, so it gets its own strong ETag
+        return f'"{self.etag}"' if encoding == 'identity' else f'"{self.etag}-{encoding}"'
+
+    def matches(self, if_none_match):
+        return etag_matches(if_none_match, [self.etag_for(encoding) for encoding in self.encodings])
+
+    def pick_encoding(self, accept_encoding):
+        accepted = {coding for coding, q in accepted_codings(accept_encoding) if q > 0}
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in self.encodings:
+                return encoding
+        return 'identity'
+
+def precompute_responses(graph):
+    """Serialize and compress every read-only payload for graph"""
+    for key in PRECOMPUTED_PAYLOADS:
+        precomputed_response(graph, key)
+
+def precomputed_response(graph, key):
+    """The serialized payload for key, built on first use if graph wasn't precomputed"""
+    precomputed = graph.responses.get(key)
+    if precomputed is None:
+        body = app.json.response(PRECOMPUTED_PAYLOADS[key](graph)).get_data()
+        precomputed = graph.responses[key] = PrecomputedResponse(body, f"{graph.version}-{key}")
+    return precomputed
+
+def serve_precomputed(graph, key, cache_control=f'public, max-age={CACHE_MAX_AGE}'):
+    """Serve a precomputed payload, answering If-None-Match with 304"""
+    precomputed = precomputed_response(graph, key)
+    encoding = precomputed.pick_encoding(request.headers.get('Accept-Encoding'))
+    if precomputed.matches(request.headers.get('If-None-Match')):
+        response = make_response('', 304)
+    else:
+        response = make_response(precomputed.encodings[encoding])
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.headers['ETag'] = precomputed.etag_for(encoding)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+class GraphIndex:
+    """Indexed view of the loaded nodes and edges, built once per data load.
+
+    Gives O(1) lookup by node_id, adjacency lists and per-type and
+    per-degree buckets so endpoints never scan the full node list.
+    """
+    def __init__(self, rows, edges):
+        self.rows = rows
+        # Session fields (id, name, seed_url, status, ...) served with this graph
+        self.session = {}
+        # Hash of the data files, set by get_graph; part of every ETag
+        self.version = ''
+        # Serialized read-only payloads, keyed by endpoint (see precompute_responses)
+        self.responses = {}
+        self.nodes = {}
+        self.positions = {}
+        self.by_type = defaultdict(list)
+        self.by_degree = defaultdict(list)
+        # CSV positions per type and degree, ascending, for paging through a filter
+        self.type_positions = defaultdict(list)
+        self.degree_positions = defaultdict(list)
+        self.degree_counts = {}
+        for position, row in enumerate(rows):
+            node_id = row.get('node_id', '')
+            node_type = row.get('node_type', 'Unknown')
+            degree = row['degree']
+            self.nodes[node_id] = row
+            self.positions[node_id] = position
+            self.by_type[node_type].append(row)
+            self.by_degree[degree].append(row)
+            self.type_positions[node_type].append(position)
+            self.degree_positions[degree].append(position)
+            counts = self.degree_counts.setdefault(degree, {'Event': 0, 'Person': 0})
+            if node_type in counts:
+                counts[node_type] += 1
+
+        # Edges keep their direction for links; expansion walks them both ways
+        self.outgoing = defaultdict(list)
+        self.adjacency = defaultdict(list)
+        for edge in edges:
+            source_id, target_id = edge.get('source_id', ''), edge.get('target_id', '')
+            if source_id in self.nodes and target_id in self.nodes:
+                self.outgoing[source_id].append(edge)
+                self.adjacency[source_id].append(target_id)
+                self.adjacency[target_id].append(source_id)
+
+    def get(self, node_id):
+        return self.nodes.get(node_id)
+
+    def neighbors(self, node_id):
+        return self.adjacency.get(node_id, [])
+
+    def within(self, node_id, depth):
+        """IDs of the nodes at most depth hops from node_id, including itself"""
+        seen = {node_id}
+        frontier = [node_id]
+        for _ in range(depth):
+            next_frontier = []
+            for current_id in frontier:
+                for neighbor_id in self.neighbors(current_id):
+                    if neighbor_id not in seen:
+                        seen.add(neighbor_id)
+                        next_frontier.append(neighbor_id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return seen
+
+    def links_between(self, node_ids):
+        """Links for every edge whose two ends are both in node_ids"""
+        return [{
+            'source': edge['source_id'],
+            'target': edge['target_id'],
+            'type': edge.get('relationship') or 'involvement'
+        } for source_id in sorted(node_ids, key=self.positions.__getitem__)
+            for edge in self.outgoing.get(source_id, []) if edge['target_id'] in node_ids]
+
+    def select(self, node_type=None, degree=None):
+        """Ascending CSV positions of the nodes matching the filters"""
+        if node_type is None and degree is None:
+            return range(len(self.rows))
+        if degree is None:
+            return self.type_positions.get(node_type, [])
+        if node_type is None:
+            return self.degree_positions.get(degree, [])
+        return [position for position in self.degree_positions.get(degree, [])
+                if self.rows[position].get('node_type') == node_type]
+
+    def in_file_order(self, node_ids):
+        """The rows for node_ids, in the order they appear in the CSV"""
+        return [self.nodes[node_id] for node_id in sorted(node_ids, key=self.positions.__getitem__)]
+
+    def page(self, node_type=None, degree=None, cursor=0, limit=None, with_metadata=True):
+        """Rows matching the filters from CSV position cursor on, and the cursor of the next page (or None)"""
+        positions = self.select(node_type, degree)
+        start = bisect_left(positions, cursor)
+        end = len(positions) if limit is None else min(start + limit, len(positions))
+        next_cursor = positions[end] if end < len(positions) else None
+        return [self.rows[position] for position in positions[start:end]], next_cursor
+
+    def node_count(self, node_type=None):
+        return len(self.rows) if node_type is None else len(self.by_type.get(node_type, []))
+
+class StoredGraph:
+    """A session in the SessionStore, answering the same queries as GraphIndex.
+
+    Nothing is loaded up front: every lookup is an indexed query, so many
+    large sessions can be served at once. The small read-only payloads are
+    built on first request; the full node list never is (see
+    serve_stored_nodes).
+    """
+    def __init__(self, store, session_id, session):
+        self.store = store
+        self.session_id = session_id
+        self.session = session
+        self.responses = {}
+        self.degree_counts = store.degree_counts(session_id)
+        # Stored sessions don't change once finished
+        self.version = hashlib.sha256(json.dumps([session, self.degree_counts], sort_keys=True,
+                                                 default=str).encode('utf-8')).hexdigest()[:16]
+
+    def get(self, node_id):
+        rows = self.in_file_order([node_id])
+        return rows[0] if rows else None
+
+    def neighbors(self, node_id):
+        return [neighbor_id for _, neighbor_id in self.store.neighbors(self.session_id, [node_id])]
+
+    def within(self, node_id, depth):
+        """IDs of the nodes at most depth hops from node_id, including itself; one query per hop"""
+        seen = {node_id}
+        frontier = [node_id]
+        for _ in range(depth):
+            next_frontier = []
+            for _, neighbor_id in self.store.neighbors(self.session_id, frontier):
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    next_frontier.append(neighbor_id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return seen
+
+    def links_between(self, node_ids):
+        """Links for every edge whose two ends are both in node_ids"""
+        return [{
+            'source': edge['source_id'],
+            'target': edge['target_id'],
+            'type': edge['relationship'] or 'involvement'
+        } for edge in self.store.edges_from(self.session_id, node_ids) if edge['target_id'] in node_ids]
+
+    def in_file_order(self, node_ids):
+        """The rows for node_ids, in the order they were stored"""
+        return [self.stored_row(row) for row in self.store.get_nodes(self.session_id, node_ids)]
+
+    def page(self, node_type=None, degree=None, cursor=0, limit=None, with_metadata=True):
+        """Rows matching the filters from position cursor on, and the cursor of the next page (or None).
+
+        Without a limit the rows are read lazily, MAX_PAGE_SIZE at a time.
+        """
+        if limit is None:
+            return self.iter_rows(node_type, degree, cursor, with_metadata), None
+        rows = self.store.page_nodes(self.session_id, node_type, degree, cursor, limit + 1, with_metadata)
+        next_cursor = rows.pop()['position'] if len(rows) > limit else None
+        return [self.stored_row(row) for row in rows], next_cursor
+
+    @staticmethod
+    def stored_row(row):
+        if 'metadata' in row:
+            row['metadata'] = parse_metadata(row['metadata'])
+        return row
+
+    def iter_rows(self, node_type, degree, cursor, with_metadata):
+        while cursor is not None:
+            rows, cursor = self.page(node_type, degree, cursor, MAX_PAGE_SIZE, with_metadata)
+            yield from rows
+
+    def node_count(self, node_type=None):
+        return self.store.node_count(self.session_id, node_type)
+
+def get_graph(session_id=CSV_SESSION_ID):
+    """Return the indexed graph of a session, building it on first use.
+
+    None when the session doesn't exist, or is an extraction job that
+    hasn't finished.
+    """
+    global _graph, _csv_data
+
+    if session_id != CSV_SESSION_ID:
+        return get_job_graph(session_id)
+
+    if _graph is None:
+        graph = load_snapshot()
+        if graph is None:
+            csv_data = read_csv_data()
+            if not csv_data:
+                return None
+            graph = build_csv_graph(csv_data)
+            save_snapshot(graph)
+        _csv_data = graph.rows
+        _graph = graph
+    return _graph
+
+def build_graph(csv_data, edges, session, version):
+    """Index the nodes and edges and precompute the read-only responses"""
+    graph = GraphIndex(csv_data, edges)
+    graph.session = session
+    graph.version = version
+    precompute_responses(graph)
+    return graph
+
+def build_csv_graph(csv_data):
+    """The graph of the bundled CSV session"""
+    return build_graph(csv_data, read_edges_data(), dict(CSV_SESSION),
+                       data_version(find_data_file('Nodes.csv'), find_data_file('Edges.csv')))
+
+def get_job_graph(session_id):
+    """The graph written by a finished extraction job; the MAX_JOB_GRAPHS most recently used are kept"""
+    with _job_graphs_lock:
+        graph = _job_graphs.get(session_id)
+        if graph is not None:
+            _job_graphs.move_to_end(session_id)
+            return graph
+    job = get_job_manager().get(session_id)
+    if job is None or job.status not in ('completed', 'stopped'):
+        return None
+    if job.config.get('output_type') == 'sql':
+        graph = StoredGraph(get_session_store(), session_id, job_session(job))
+    else:
+        nodes_path = os.path.join(job.output_dir, 'Nodes.csv')
+        edges_path = os.path.join(job.output_dir, 'Edges.csv')
+        csv_data = read_nodes_file(nodes_path) if os.path.exists(nodes_path) else []
+        graph = build_graph(csv_data, read_edges_file(edges_path) if os.path.exists(edges_path) else [],
+                            job_session(job), data_version(nodes_path, edges_path))
+    with _job_graphs_lock:
+        _job_graphs[session_id] = graph
+        while len(_job_graphs) > MAX_JOB_GRAPHS:
+            _job_graphs.popitem(last=False)
+    return graph
+
+def get_job_manager():
+    """The extraction job manager, created on first use"""
+    global _job_manager
+
+    with _job_manager_lock:
+        if _job_manager is None:
+            # extraction_jobs.py lives next to the extractor at the repo root
+            if ROOT_DIR not in sys.path:
+                sys.path.insert(0, ROOT_DIR)
+            from extraction_jobs import JobManager
+            _job_manager = JobManager(JOBS_DIR, max_workers=MAX_CONCURRENT_JOBS, first_job_id=CSV_SESSION_ID + 1)
+        return _job_manager
+
+def get_session_store():
+    """The SessionStore the extraction jobs write into; request threads share its connection pool"""
+    global _session_store
+
+    store_path = get_job_manager().store_path
+    with _job_manager_lock:
+        if _session_store is None:
+            from session_store import SessionStore
+            _session_store = SessionStore(store_path)
+        return _session_store
+
+def job_session(job):
+    """Session fields of an extraction job"""
+    seed_url = job.config.get('seed_url', '')
+    title = urlparse(seed_url).path.rsplit('/', 1)[-1].replace('_', ' ')
+    return {
+        'id': job.job_id,
+        'name': f"{title} (extraction {job.job_id})",
+        'seed_url': seed_url,
+        'max_degree': job.config.get('max_degree'),
+        'status': job.status,
+        'started_at': job.started_at,
+        'completed_at': job.completed_at
+    }
+
+def job_sessions():
+    """Session summaries of the extraction jobs, oldest first"""
+    if _job_manager is None and not os.path.isdir(JOBS_DIR):
+        return []
+    sessions = []
+    for job in get_job_manager().list():
+        graph = get_job_graph(job.job_id)
+        if graph is not None:
+            sessions.append(session_summary(graph))
+        else:
+            sessions.append({**job_session(job), 'total_nodes': job.progress.get('nodes', 0),
+                             'events_count': 0, 'people_count': 0})
+    return sessions
+
+def session_missing(session_id):
+    """Error response for a session whose graph isn't available"""
+    if session_id == CSV_SESSION_ID:
+        return jsonify({'error': 'No CSV data found'}), 500
+    job = get_job_manager().get(session_id)
+    if job is None:
+        return jsonify({'error': 'Session not found'}), 404
+    if job.status == 'failed':
+        return jsonify({'error': f'Extraction failed: {job.error}'}), 409
+    return jsonify({'error': f'Extraction is still {job.status}'}), 409
+
+def snapshot_state(graph):
+    """The graph as plain built-in types, for pickling"""
+    state = dict(vars(graph))
+    state['responses'] = {key: (response.etag, response.encodings) for key, response in graph.responses.items()}
+    return {'format': SNAPSHOT_FORMAT, 'version': graph.version, 'graph': state}
+
+def save_snapshot(graph):
+    """Write the snapshot next to Nodes.csv so later starts load it. Returns its path, or None"""
+    if not SNAPSHOT_FILE:
+        return None
+    try:
+        nodes_path = find_data_file('Nodes.csv')
+        if nodes_path is None:
+            return None
+        snapshot_path = os.path.normpath(os.path.join(os.path.dirname(nodes_path), SNAPSHOT_FILE))
+        temporary_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(snapshot_state(graph), file, protocol=pickle.HIGHEST_PROTOCOL)
+        # Concurrent workers starting together never see a partly written file
+        os.replace(temporary_path, snapshot_path)
+        return snapshot_path
+    except Exception as e:
+        print(f"Error writing snapshot: {e}")
+        return None
+
+def load_snapshot():
+    """Load the precompiled graph, or None when it is missing or older than the CSV files"""
+    if not SNAPSHOT_FILE:
+        return None
+    try:
+        snapshot_path = find_data_file(SNAPSHOT_FILE)
+        if snapshot_path is None:
+            return None
+        with open(snapshot_path, 'rb') as file:
+            snapshot = pickle.load(file)
+        current_version = data_version(find_data_file('Nodes.csv'), find_data_file('Edges.csv'))
+        if snapshot.get('format') != SNAPSHOT_FORMAT or snapshot.get('version') != current_version:
+            print(f"Ignoring stale snapshot {snapshot_path}; it is rebuilt from the CSV files")
+            return None
+        graph = GraphIndex.__new__(GraphIndex)
+        vars(graph).update(snapshot['graph'])
+        graph.responses = {key: PrecomputedResponse(None, etag, encodings)
+                           for key, (etag, encodings) in graph.responses.items()}
+        print(f"Loaded {len(graph.rows)} nodes from snapshot {snapshot_path}")
+        return graph
+    except Exception as e:
+        print(f"Error reading snapshot: {e}")
+        return None
+
+def data_version(*paths):
+    """Short content hash of the data files, so ETags change whenever the data does"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if path and os.path.exists(path):
+            with open(path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def network_node(node, include_metadata=False):
+    """Node shape used by the network and expand endpoints"""
+    transformed_node = {
+        'id': node.get('node_id', ''),
+        'title': node.get('name', ''),
+        'node_type': node.get('node_type', ''),
+        'degree': node['degree'],
+        'description': node.get('description', ''),
+        'start_date': node.get('start_date', ''),
+        'end_date': node.get('end_date', '')
+    }
+    if include_metadata:
+        transformed_node['metadata'] = node.get('metadata', {})
+    return transformed_node
+
+def parse_metadata(value):
+    """Decode the JSON metadata column of a CSV row into a dict"""
+    if not value:
+        return {}
+    try:
+        metadata = json.loads(value)
+    except ValueError:
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+def wants_metadata():
+    """Whether the request asked for metadata with ?include=metadata"""
+    return 'metadata' in request.args.get('include', '').split(',')
+
+def find_data_file(filename):
+    """Locate a data file next to the repo root or in the working directory"""
+    if DATA_DIR:
+        path = os.path.join(DATA_DIR, filename)
+        return path if os.path.exists(path) else None
+    possible_paths = [
+        os.path.join(os.path.dirname(__file__), '..', filename),
+        os.path.join(os.getcwd(), filename),
+        filename
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+def read_edges_file(edges_path):
+    with open(edges_path, 'r', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+def read_edges_data():
+    """Read the relationships between nodes from Edges.csv"""
+    try:
+        edges_path = find_data_file('Edges.csv')
+        if edges_path is None:
+            print("Edges.csv not found; nodes will have no relationships")
+            return []
+        edges = read_edges_file(edges_path)
+        print(f"Successfully loaded {len(edges)} edges from CSV")
+        return edges
+    except Exception as e:
+        print(f"Error reading edges CSV: {e}")
+        return []
+
+def read_nodes_file(csv_path):
+    """Rows of a Nodes.csv file with degree and metadata decoded"""
+    data = []
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        csv_reader = csv.DictReader(file)
+        for row in csv_reader:
+            row['degree'] = int(row.get('degree') or 0)
+            row['metadata'] = parse_metadata(row.get('metadata'))
+            data.append(row)
+    return data
 
 def read_csv_data():
     """Read data from Nodes.csv file with caching"""
@@ -29,17 +611,7 @@ def read_csv_data():
     
     try:
         # Try multiple possible paths for the CSV file
-        possible_paths = [
-            os.path.join(os.path.dirname(__file__), '..', 'Nodes.csv'),
-            os.path.join(os.getcwd(), 'Nodes.csv'),
-            'Nodes.csv'
-        ]
-        
-        csv_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                csv_path = path
-                break
+        csv_path = find_data_file('Nodes.csv')
         
         if csv_path is None:
             print("CSV file not found in any of the expected locations")
@@ -48,47 +620,95 @@ def read_csv_data():
         print(f"Reading CSV from: {csv_path}")
         
         # Read CSV file using built-in csv module
-        data = []
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                data.append(row)
-        
-        _csv_data = data
+        _csv_data = read_nodes_file(csv_path)
         print(f"Successfully loaded {len(_csv_data)} nodes from CSV")
         return _csv_data
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return []
 
+def session_summary(graph):
+    """Session fields with node counts, as listed by /api/sessions"""
+    return {
+        **graph.session,
+        'total_nodes': graph.node_count(),
+        # Count nodes by type
+        'events_count': graph.node_count('Event'),
+        'people_count': graph.node_count('Person')
+    }
+
+def sessions_payload(graph):
+    return [session_summary(graph)]
+
+def session_payload(graph):
+    return {
+        'session': {**graph.session, 'total_nodes': graph.node_count()},
+        'degree_counts': graph.degree_counts
+    }
+
+def session_node(node, include_metadata=False):
+    """Node shape returned by the nodes endpoint, matching frontend expectations"""
+    transformed_node = {
+        'id': node.get('node_id', ''),
+        'node_id': node.get('node_id', ''),
+        'name': node.get('name', ''),
+        'url': node.get('url') or '',  # Nodes.csv doesn't have URLs
+        'node_type': node.get('node_type', ''),
+        'degree': node['degree'],
+        'parent_url': node.get('parent_url') or '',
+        'created_at': '2024-01-01T00:00:00',
+        'updated_at': '2024-01-01T00:00:00',
+        'description': node.get('description', ''),
+        'start_date': node.get('start_date', ''),
+        'end_date': node.get('end_date', '')
+    }
+    if include_metadata:
+        transformed_node['metadata'] = node.get('metadata', {})
+    return transformed_node
+
+SESSION_NODE_FIELDS = list(session_node({'degree': 0}, include_metadata=True))
+
+def nodes_payload(graph, include_metadata=False):
+    rows, _ = graph.page(with_metadata=include_metadata)
+    return [session_node(node, include_metadata) for node in rows]
+
+def network_payload(graph, include_metadata=False):
+    # Start with only Korean War and key people
+    initial_ids = {node_id for node_id in DEFAULT_VISIBLE_IDS if graph.get(node_id)}
+    initial_nodes = [network_node(node, include_metadata) for node in graph.in_file_order(initial_ids)]
+    
+    # Connect them through their relationships
+    initial_links = graph.links_between(initial_ids)
+    
+    return {
+        'nodes': initial_nodes,
+        'links': initial_links
+    }
+
+# Read-only payloads serialized once per data load
+PRECOMPUTED_PAYLOADS = {
+    'sessions': sessions_payload,
+    'session': session_payload,
+    'nodes': nodes_payload,
+    'nodes+metadata': lambda graph: nodes_payload(graph, include_metadata=True),
+    'network': network_payload,
+    'network+metadata': lambda graph: network_payload(graph, include_metadata=True),
+}
+
 @app.route('/api/sessions', methods=['GET'])
 def get_sessions():
-    """Get all sessions (for prototype, return a single CSV session)"""
+    """Get all sessions: the bundled CSV data, then every extraction job"""
     try:
-        # For prototype, we'll create a single session representing the CSV data
-        csv_data = read_csv_data()
+        graph = get_graph()
         
-        if not csv_data:
+        if not graph:
             return jsonify({'error': 'No CSV data found'}), 500
         
-        # Count nodes by type
-        events_count = len([node for node in csv_data if node.get('node_type') == 'Event'])
-        people_count = len([node for node in csv_data if node.get('node_type') == 'Person'])
-        
-        session = {
-            'id': 1,
-            'name': 'Korean War Data (CSV)',
-            'seed_url': 'https://en.wikipedia.org/wiki/Korean_War',
-            'max_degree': 3,
-            'total_nodes': len(csv_data),
-            'status': 'completed',
-            'started_at': '2024-01-01T00:00:00',
-            'completed_at': '2024-01-01T00:00:00',
-            'events_count': events_count,
-            'people_count': people_count
-        }
-        
-        return jsonify([session])
+        jobs = job_sessions()
+        if not jobs:
+            # The list changes as soon as an extraction starts, so clients revalidate every time
+            return serve_precomputed(graph, 'sessions', cache_control='no-cache')
+        return jsonify([session_summary(graph)] + jobs)
         
     except Exception as e:
         print(f"Error in get_sessions: {e}")
@@ -98,41 +718,12 @@ def get_sessions():
 def get_session(session_id):
     """Get session details"""
     try:
-        if session_id != 1:
-            return jsonify({'error': 'Session not found'}), 404
-        
-        csv_data = read_csv_data()
-        
-        if not csv_data:
-            return jsonify({'error': 'No CSV data found'}), 500
+        graph = get_graph(session_id)
         
-        # Count nodes by degree and type
-        degree_counts = {}
-        for node in csv_data:
-            degree = int(node.get('degree', 0))
-            node_type = node.get('node_type', 'Unknown')
-            
-            if degree not in degree_counts:
-                degree_counts[degree] = {'Event': 0, 'Person': 0}
-            
-            if node_type in degree_counts[degree]:
-                degree_counts[degree][node_type] += 1
-        
-        session = {
-            'id': 1,
-            'name': 'Korean War Data (CSV)',
-            'seed_url': 'https://en.wikipedia.org/wiki/Korean_War',
-            'max_degree': 3,
-            'total_nodes': len(csv_data),
-            'status': 'completed',
-            'started_at': '2024-01-01T00:00:00',
-            'completed_at': '2024-01-01T00:00:00'
-        }
+        if not graph:
+            return session_missing(session_id)
         
-        return jsonify({
-            'session': session,
-            'degree_counts': degree_counts
-        })
+        return serve_precomputed(graph, 'session')
         
     except Exception as e:
         print(f"Error in get_session: {e}")
@@ -140,165 +731,146 @@ def get_session(session_id):
 
 @app.route('/api/sessions/<int:session_id>/nodes', methods=['GET'])
 def get_session_nodes(session_id):
-    """Get nodes for a session"""
+    """Get nodes for a session.
+
+    Without query parameters (or with only include=metadata) this is the
+    whole session as one array with an ETag: precomputed for CSV
+    sessions, streamed from the database for stored ones.
+    Metadata is left out unless asked for with include=metadata (or
+    listed in fields). Otherwise:
+      limit, cursor  page through the nodes; the cursor for the next page
+                     is in the X-Next-Cursor header (absent on the last page)
+      fields         comma-separated subset of node fields to return
+      node_type, degree  filters
+      format=ndjson  stream one JSON object per line instead of an array
+                     (also chosen by Accept: application/x-ndjson)
+    """
     try:
-        if session_id != 1:
-            return jsonify({'error': 'Session not found'}), 404
+        graph = get_graph(session_id)
         
-        csv_data = read_csv_data()
+        if not graph:
+            return session_missing(session_id)
         
-        if not csv_data:
-            return jsonify({'error': 'No CSV data found'}), 500
-        
-        # Transform data to match frontend expectations
-        nodes = []
-        for node in csv_data:
-            transformed_node = {
-                'id': node.get('node_id', ''),
-                'node_id': node.get('node_id', ''),
-                'name': node.get('name', ''),
-                'url': '',  # CSV doesn't have URLs
-                'node_type': node.get('node_type', ''),
-                'degree': int(node.get('degree', 0)),
-                'parent_url': '',  # CSV doesn't have parent URLs
-                'created_at': '2024-01-01T00:00:00',
-                'updated_at': '2024-01-01T00:00:00',
-                'description': node.get('description', ''),
-                'start_date': node.get('start_date', ''),
-                'end_date': node.get('end_date', ''),
-                'metadata': node.get('metadata', {})
-            }
-            nodes.append(transformed_node)
-        
-        return jsonify(nodes)
+        if wants_ndjson():
+            return serve_node_page(graph)
+        args = list(request.args.items(multi=True))
+        if args and args != [('include', 'metadata')]:
+            return serve_node_page(graph)
+        # The whole session, with or without metadata
+        key = 'nodes+metadata' if args else 'nodes'
+        if isinstance(graph, StoredGraph):
+            return serve_stored_nodes(graph, key)
+        return serve_precomputed(graph, key)
         
     except Exception as e:
         print(f"Error in get_session_nodes: {e}")
         return jsonify({'error': str(e)}), 500
 
+def serve_stored_nodes(graph, key):
+    """A stored session's whole node list as a JSON array, streamed from the store a page at a time"""
+    # Stored sessions don't change once finished, so the graph version makes a strong ETag
+    etag = f'"{graph.version}-{key}"'
+    if etag_matches(request.headers.get('If-None-Match'), [etag]):
+        response = make_response('', 304)
+    else:
+        with_metadata = key == 'nodes+metadata'
+        rows, _ = graph.page(cursor=0, with_metadata=with_metadata)
+
+        def generate():
+            yield '['
+            for index, row in enumerate(rows):
+                yield (',' if index else '') + app.json.dumps(session_node(row, with_metadata))
+            yield ']'
+
+        response = Response(generate(), mimetype='application/json')
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = f'public, max-age={CACHE_MAX_AGE}'
+    return response
+
+def wants_ndjson():
+    return request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson'
+
+def serve_node_page(graph):
+    """A filtered, projected page of nodes as a JSON array or an NDJSON stream"""
+    fields = None
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in SESSION_NODE_FIELDS]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    degree = request.args.get('degree')
+    if degree is not None:
+        if not (degree.isascii() and degree.isdigit()):
+            return jsonify({'error': 'degree must be a non-negative integer'}), 400
+        degree = int(degree)
+
+    # Metadata is the bulk of every row: only sent when asked for
+    with_metadata = wants_metadata() or (fields is not None and 'metadata' in fields)
+
+    cursor = request.args.get('cursor', '0')
+    limit = request.args.get('limit')
+    if not (cursor.isascii() and cursor.isdigit()):
+        return jsonify({'error': 'cursor must be a non-negative integer'}), 400
+    if limit is None:
+        # A cursor without a limit pages at the default size
+        limit = DEFAULT_PAGE_SIZE if 'cursor' in request.args else None
+    elif not (limit.isascii() and limit.isdigit()) or int(limit) < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    else:
+        limit = min(int(limit), MAX_PAGE_SIZE)
+
+    # The cursor is the position (in the CSV, or in the store) of the first node on the page
+    rows, next_cursor = graph.page(request.args.get('node_type'), degree, int(cursor), limit, with_metadata)
+
+    def page_nodes():
+        for row in rows:
+            node = session_node(row, with_metadata)
+            yield node if fields is None else {field: node[field] for field in fields}
+
+    if wants_ndjson():
+        response = Response((app.json.dumps(node) + '\n' for node in page_nodes()),
+                            mimetype='application/x-ndjson')
+    else:
+        response = jsonify(list(page_nodes()))
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+    return response
+
 @app.route('/api/sessions/<int:session_id>/nodes/<node_id>/expand', methods=['POST'])
 def expand_node(session_id, node_id):
-    """Expand a node - show related events for people, related people for events"""
+    """Expand a node - show related events for people, related people for events.
+
+    ?depth=N also reveals the nodes up to N hops away (default 1);
+    ?include=metadata adds each node's infobox metadata.
+    """
     try:
-        if session_id != 1:
-            return jsonify({'error': 'Session not found'}), 404
+        depth = request.args.get('depth', '1')
+        if not (depth.isascii() and depth.isdigit()) or not 1 <= int(depth) <= MAX_EXPAND_DEPTH:
+            return jsonify({'error': f'depth must be an integer between 1 and {MAX_EXPAND_DEPTH}'}), 400
+        depth = int(depth)
         
-        csv_data = read_csv_data()
+        graph = get_graph(session_id)
         
-        if not csv_data:
-            return jsonify({'error': 'No CSV data found'}), 500
+        if not graph:
+            return session_missing(session_id)
         
         # Find the specific node
-        target_node = None
-        for node in csv_data:
-            if node.get('node_id') == node_id:
-                target_node = node
-                break
+        target_node = graph.get(node_id)
         
         if not target_node:
             return jsonify({'error': 'Node not found'}), 404
         
-        # Get current network data (all nodes that are already visible)
-        current_nodes = []
-        current_links = []
-        
-        # Get all nodes that should be visible
-        visible_node_ids = set()
-        
-        # Always include Korean War and key people
-        visible_node_ids.update(['e1', 'p1', 'p2', 'p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10'])
-        
-        # Add the clicked node
-        visible_node_ids.add(node_id)
-        
-        # If expanding a person, add their related events
-        if target_node.get('node_type') == 'Person':
-            if node_id == 'p3':  # Truman
-                visible_node_ids.update(['e1', 'e4', 'e5'])  # Korean War, WWI, WWII
-            elif node_id == 'p4':  # Eisenhower
-                visible_node_ids.update(['e1', 'e4', 'e5', 'e15', 'e16'])  # Korean War, WWI, WWII, Overlord, Normandy
-            elif node_id == 'p5':  # MacArthur
-                visible_node_ids.update(['e1', 'e4', 'e5', 'e35', 'e36', 'e51', 'e52'])  # Korean War, WWI, WWII, Philippines campaigns
-            elif node_id == 'p6':  # Ridgway
-                visible_node_ids.update(['e1', 'e4', 'e5', 'e15', 'e16'])  # Korean War, WWI, WWII, Overlord, Normandy
-            elif node_id == 'p7':  # Walker
-                visible_node_ids.update(['e1', 'e4', 'e5', 'e15', 'e16'])  # Korean War, WWI, WWII, Overlord, Normandy
-            elif node_id == 'p8':  # Van Fleet
-                visible_node_ids.update(['e1', 'e4', 'e5', 'e15', 'e16'])  # Korean War, WWI, WWII, Overlord, Normandy
-            elif node_id == 'p9':  # Stratemeyer
-                visible_node_ids.update(['e1', 'e4', 'e5'])  # Korean War, WWI, WWII
-            elif node_id == 'p10':  # Joy
-                visible_node_ids.update(['e1', 'e4', 'e5'])  # Korean War, WWI, WWII
-            elif node_id == 'p1':  # Syngman Rhee
-                visible_node_ids.update(['e1'])  # Korean War
-            elif node_id == 'p2':  # Paik Sun-yup
-                visible_node_ids.update(['e1'])  # Korean War
-        
-        # If expanding an event, add related people
-        elif target_node.get('node_type') == 'Event':
-            if node_id == 'e1':  # Korean War
-                visible_node_ids.update(['p1', 'p2', 'p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10'])
-            elif node_id in ['e4', 'e5']:  # WWI, WWII
-                visible_node_ids.update(['p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10'])
-            elif node_id in ['e15', 'e16']:  # Overlord, Normandy
-                visible_node_ids.update(['p4', 'p5', 'p6', 'p7', 'p8'])
-            elif node_id in ['e35', 'e36', 'e51', 'e52']:  # Philippines campaigns
-                visible_node_ids.update(['p5'])
-        
-        # Build nodes and links for visible nodes
-        for node in csv_data:
-            if node.get('node_id') in visible_node_ids:
-                network_node = {
-                    'id': node.get('node_id', ''),
-                    'title': node.get('name', ''),
-                    'node_type': node.get('node_type', ''),
-                    'degree': int(node.get('degree', 0)),
-                    'description': node.get('description', ''),
-                    'start_date': node.get('start_date', ''),
-                    'end_date': node.get('end_date', ''),
-                    'metadata': node.get('metadata', {})
-                }
-                current_nodes.append(network_node)
-        
-        # Create links between visible nodes
-        for source_id in visible_node_ids:
-            for target_id in visible_node_ids:
-                if source_id != target_id:
-                    # Create logical connections based on Korean War relationships
-                    if source_id == 'e1' and target_id.startswith('p'):  # Korean War to people
-                        current_links.append({
-                            'source': source_id,
-                            'target': target_id,
-                            'type': 'involvement'
-                        })
-                    elif source_id.startswith('p') and target_id == 'e1':  # People to Korean War
-                        current_links.append({
-                            'source': source_id,
-                            'target': target_id,
-                            'type': 'involvement'
-                        })
-                    elif source_id.startswith('p') and target_id.startswith('e'):  # People to events
-                        # Add specific relationships
-                        if (source_id in ['p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10'] and 
-                            target_id in ['e4', 'e5']):  # Key people to WWI/WWII
-                            current_links.append({
-                                'source': source_id,
-                                'target': target_id,
-                                'type': 'involvement'
-                            })
-                        elif (source_id in ['p4', 'p5', 'p6', 'p7', 'p8'] and 
-                              target_id in ['e15', 'e16']):  # Military leaders to Overlord/Normandy
-                            current_links.append({
-                                'source': source_id,
-                                'target': target_id,
-                                'type': 'involvement'
-                            })
-                        elif source_id == 'p5' and target_id in ['e35', 'e36', 'e51', 'e52']:  # MacArthur to Philippines
-                            current_links.append({
-                                'source': source_id,
-                                'target': target_id,
-                                'type': 'involvement'
-                            })
+        # Always include Korean War and key people, plus everything within
+        # depth hops of the clicked node
+        visible_node_ids = {visible_id for visible_id in DEFAULT_VISIBLE_IDS if graph.get(visible_id)}
+        visible_node_ids.update(graph.within(node_id, depth))
+        
+        # Build nodes for visible nodes
+        current_nodes = [network_node(node, wants_metadata()) for node in graph.in_file_order(visible_node_ids)]
+        
+        # Create links for the relationships between visible nodes
+        current_links = graph.links_between(visible_node_ids)
         
         return jsonify({
             'nodes': current_nodes,
@@ -317,67 +889,17 @@ def expand_node(session_id, node_id):
 
 @app.route('/api/sessions/<int:session_id>/network', methods=['GET'])
 def get_network_data(session_id):
-    """Get network data for visualization - start with Korean War and key people"""
+    """Get network data for visualization - start with Korean War and key people.
+
+    ?include=metadata adds each node's infobox metadata.
+    """
     try:
-        if session_id != 1:
-            return jsonify({'error': 'Session not found'}), 404
+        graph = get_graph(session_id)
         
-        csv_data = read_csv_data()
+        if not graph:
+            return session_missing(session_id)
         
-        if not csv_data:
-            return jsonify({'error': 'No CSV data found'}), 500
-        
-        # Start with only Korean War and key people
-        initial_nodes = []
-        initial_links = []
-        
-        # Find Korean War (e1)
-        korean_war = None
-        key_people = []
-        
-        for node in csv_data:
-            if node.get('node_id') == 'e1':  # Korean War
-                korean_war = node
-            elif node.get('node_id') in ['p1', 'p2', 'p3', 'p4', 'p5', 'p6', 'p7', 'p8', 'p9', 'p10']:  # Key people
-                key_people.append(node)
-        
-        # Add Korean War
-        if korean_war:
-            initial_nodes.append({
-                'id': korean_war.get('node_id', ''),
-                'title': korean_war.get('name', ''),
-                'node_type': korean_war.get('node_type', ''),
-                'degree': int(korean_war.get('degree', 0)),
-                'description': korean_war.get('description', ''),
-                'start_date': korean_war.get('start_date', ''),
-                'end_date': korean_war.get('end_date', ''),
-                'metadata': korean_war.get('metadata', {})
-            })
-        
-        # Add key people and their connections to Korean War
-        for person in key_people:
-            initial_nodes.append({
-                'id': person.get('node_id', ''),
-                'title': person.get('name', ''),
-                'node_type': person.get('node_type', ''),
-                'degree': int(person.get('degree', 0)),
-                'description': person.get('description', ''),
-                'start_date': person.get('start_date', ''),
-                'end_date': person.get('end_date', ''),
-                'metadata': person.get('metadata', {})
-            })
-            
-            # Connect to Korean War
-            initial_links.append({
-                'source': person.get('node_id', ''),
-                'target': 'e1',
-                'type': 'involvement'
-            })
-        
-        return jsonify({
-            'nodes': initial_nodes,
-            'links': initial_links
-        })
+        return serve_precomputed(graph, 'network+metadata' if wants_metadata() else 'network')
         
     except Exception as e:
         print(f"Error in get_network_data: {e}")
@@ -385,32 +907,156 @@ def get_network_data(session_id):
 
 @app.route('/api/extract', methods=['POST'])
 def start_extraction():
-    """Start extraction (for prototype, just return success)"""
+    """Start a crawl in the background; it becomes a new session"""
     try:
-        # For prototype, we don't actually run extraction
-        # Just return a success response
-        return jsonify({
-            'session_id': 1,
-            'message': 'Prototype mode - using existing CSV data'
+        config = request.get_json(silent=True) or {}
+        seed_url = config.get('seed_url', '')
+        parsed = urlparse(seed_url)
+        if parsed.scheme not in ('http', 'https') or not parsed.path.startswith('/wiki/'):
+            return jsonify({'error': 'seed_url must be a Wikipedia article URL'}), 400
+        max_degree = config.get('max_degree', 3)
+        if not isinstance(max_degree, int) or not 0 <= max_degree <= MAX_JOB_DEGREE:
+            return jsonify({'error': f'max_degree must be an integer between 0 and {MAX_JOB_DEGREE}'}), 400
+        output_type = config.get('output_type', 'sql')
+        if output_type not in ('sql', 'csv'):
+            return jsonify({'error': "output_type must be 'sql' or 'csv'"}), 400
+        
+        job = get_job_manager().start({
+            'seed_url': seed_url,
+            'max_degree': max_degree,
+            'output_type': output_type
         })
         
+        return jsonify({
+            'session_id': job.job_id,
+            'message': f'Extraction {job.job_id} started'
+        }), 202
+        
     except Exception as e:
         print(f"Error in start_extraction: {e}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/extract/<int:session_id>/status', methods=['GET'])
 def get_extraction_status(session_id):
-    """Get extraction status (for prototype, always completed)"""
+    """Get extraction status: pages fetched, nodes per degree, queue depth and fetch rate"""
     try:
+        if session_id == CSV_SESSION_ID:
+            return jsonify({
+                'status': 'completed',
+                'progress': 100,
+                'message': 'Using existing CSV data'
+            })
+        
+        job = get_job_manager().get(session_id)
+        if job is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        progress = job.progress
         return jsonify({
-            'status': 'completed',
-            'progress': 100,
-            'message': 'Using existing CSV data'
+            'status': job.status,
+            'progress': job.percent_done(),
+            'message': job.error or (job.logs[-1] if job.logs else job.status),
+            'degree': progress.get('degree', 0),
+            'max_degree': job.config.get('max_degree'),
+            'pages_fetched': progress.get('pages_fetched', 0),
+            'cache_hits': progress.get('cache_hits', 0),
+            'nodes': progress.get('nodes', 0),
+            'nodes_per_degree': progress.get('nodes_per_degree', {}),
+            'queue_depth': progress.get('queue_depth', 0),
+            'fetch_rate': round(progress.get('fetch_rate', 0.0), 2),
+            'started_at': job.started_at,
+            'completed_at': job.completed_at
         })
         
     except Exception as e:
         print(f"Error in get_extraction_status: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/extract/<int:session_id>/events', methods=['GET'])
+def stream_extraction_events(session_id):
+    """Server-sent events for an extraction: log, progress, nodes and status.
+
+    Each event carries an increasing id; a client reconnecting with
+    Last-Event-ID gets everything it missed that is still buffered. The
+    stream ends after the final status event.
+    """
+    try:
+        job = get_job_manager().get(session_id) if session_id != CSV_SESSION_ID else None
+        if job is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or '0'
+        if not (last_event_id.isascii() and last_event_id.isdigit()):
+            return jsonify({'error': 'Last-Event-ID must be a non-negative integer'}), 400
+        
+        def generate(last_id):
+            # Tell the browser how soon to reconnect if the connection drops
+            yield 'retry: 3000\n\n'
+            while True:
+                events = job.events.since(last_id, timeout=EVENT_STREAM_HEARTBEAT)
+                if not events:
+                    if job.events.closed:
+                        # The client already has the final status
+                        return
+                    if job.finished and job.events.last_id == 0:
+                        # Finished before this server started: only the outcome is known
+                        yield f"event: status\ndata: {json.dumps({'status': job.status, 'error': job.error})}\n\n"
+                        return
+                    yield ': keep-alive\n\n'
+                    continue
+                for event_id, kind, data in events:
+                    last_id = event_id
+                    yield f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                    if kind == 'status' and data['status'] in ('completed', 'stopped', 'failed'):
+                        return
+        
+        response = Response(generate(int(last_event_id)), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        # Keep reverse proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+        
+    except Exception as e:
+        print(f"Error in stream_extraction_events: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/extract/<int:session_id>/metrics', methods=['GET'])
+def get_extraction_metrics(session_id):
+    """Crawl metrics of an extraction in the Prometheus text format, or as JSON with ?format=json"""
+    try:
+        job = get_job_manager().get(session_id) if session_id != CSV_SESSION_ID else None
+        if job is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        if request.args.get('format') == 'json':
+            return jsonify(job.metrics)
+        from instrumentation import prometheus_text
+        return Response(prometheus_text(job.metrics, {'session_id': job.job_id}),
+                        mimetype='text/plain; version=0.0.4')
+        
+    except Exception as e:
+        print(f"Error in get_extraction_metrics: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/extract/<int:session_id>/stop', methods=['POST'])
+def stop_extraction(session_id):
+    """Ask a running extraction to stop; nodes found so far are kept"""
+    try:
+        if session_id == CSV_SESSION_ID:
+            return jsonify({'error': 'The CSV session is not a running extraction'}), 409
+        
+        job = get_job_manager().stop(session_id)
+        if job is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        return jsonify({
+            'session_id': job.job_id,
+            'status': job.status if job.finished else 'stopping'
+        })
+        
+    except Exception as e:
+        print(f"Error in stop_extraction: {e}")
+        return jsonify({'error': str(e)}), 500
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""Measure API latency and throughput per endpoint on synthetic data sets.
+
+For each size a synthetic Nodes.csv and Edges.csv are written to a
+temporary directory and api/csv_reader.py serves them through the Flask
+test client in a fresh process. Every endpoint is requested --requests
+times, reporting p50/p99 latency and requests/sec, along with the time to
+load the data and peak RSS:
+
+    python benchmarks/bench_api.py --sizes 1000,100000,1000000
+    python benchmarks/bench_api.py --sizes 1000,100000 --baseline
+"""
+import os
+import sys
+import io
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, 'api')
+sys.path.insert(0, ROOT)
+
+from result_sinks import EDGES_CSV_FIELDS, NODES_CSV_FIELDS
+from harness import (baseline_path, compare_to_baseline, peak_rss_mb, percentile, run_in_fresh_process,
+                     save_baseline)
+
+# (method, path); {cursor} is replaced with a position in the middle of the data set
+ENDPOINTS = [
+    ('GET', '/api/sessions'),
+    ('GET', '/api/sessions/1'),
+    ('GET', '/api/sessions/1/nodes'),
+    ('GET', '/api/sessions/1/nodes?limit=100&cursor={cursor}'),
+    ('GET', '/api/sessions/1/nodes?node_type=Person&degree=2&limit=100'),
+    ('GET', '/api/sessions/1/nodes?fields=id,name,degree&limit=1000&format=ndjson'),
+    ('GET', '/api/sessions/1/network'),
+    ('POST', '/api/sessions/1/nodes/p1/expand?depth=2'),
+]
+
+PERSON_KEYS = ['Allegiance', 'Branch', 'Years of service', 'Rank', 'Commands', 'Awards']
+EVENT_KEYS = ['Location', 'Result', 'Territorial changes', 'Belligerents']
+VALUES = ['United States', 'General', 'United States Army', 'Republic of Korea Army', 'Inconclusive']
+
+def write_synthetic_data(directory, rows, seed=7):
+    """Nodes.csv and Edges.csv with rows nodes: a third events, the rest people, spread over degrees 0-3"""
+    rnd = random.Random(seed)
+    events = max(1, rows // 3)
+    people = rows - events
+    with open(os.path.join(directory, 'Nodes.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=NODES_CSV_FIELDS)
+        writer.writeheader()
+        for i in range(rows):
+            is_event = i < events
+            number = i + 1 if is_event else i - events + 1
+            keys = EVENT_KEYS if is_event else PERSON_KEYS
+            writer.writerow({
+                'node_id': f"{'e' if is_event else 'p'}{number}",
+                'node_type': 'Event' if is_event else 'Person',
+                'name': f"{'Battle of Place' if is_event else 'General Person'} {number}",
+                'description': f"Synthetic node {i} of {rows}",
+                'start_date': f"{rnd.randint(1, 28)} June 19{rnd.randint(10, 50)}",
+                'end_date': '',
+                'metadata': json.dumps({key: rnd.choice(VALUES) for key in keys}),
+                'degree': 0 if number == 1 and is_event else min(3, 1 + 3 * number // (events if is_event else people)),
+            })
+    with open(os.path.join(directory, 'Edges.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=EDGES_CSV_FIELDS)
+        writer.writeheader()
+        for person in range(1, people + 1):
+            targets = {1} if person <= 10 else set()
+            targets.update(rnd.randint(1, events) for _ in range(rnd.randint(1, 4)))
+            writer.writerows({'source_id': f"p{person}", 'target_id': f"e{event}", 'relationship': 'involvement'}
+                             for event in sorted(targets))
+
+def run_size(rows, requests, results):
+    sys.path.insert(0, API_DIR)
+    directory = tempfile.mkdtemp(prefix='bench_api_')
+    try:
+        write_synthetic_data(directory, rows)
+        with contextlib.redirect_stdout(io.StringIO()):
+            import csv_reader
+            csv_reader.DATA_DIR = directory
+            start = time.perf_counter()
+            csv_reader.get_graph()
+            load_seconds = time.perf_counter() - start
+        client = csv_reader.app.test_client()
+        endpoints = {}
+        for method, path in ENDPOINTS:
+            path = path.format(cursor=rows // 2)
+            timings = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.open(path, method=method, headers={'Accept-Encoding': 'gzip'})
+                # Streamed responses do their work while the body is read
+                response.get_data()
+                timings.append(time.perf_counter() - start)
+                assert response.status_code == 200, (path, response.status_code)
+            endpoints[f"{method} {path}"] = {
+                'p50_ms': 1000 * percentile(timings, 0.5),
+                'p99_ms': 1000 * percentile(timings, 0.99),
+                'requests_per_sec': len(timings) / sum(timings),
+            }
+        results.put({'rows': rows, 'load_s': load_seconds, 'peak_rss_mb': peak_rss_mb(), 'endpoints': endpoints})
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints against synthetic Nodes.csv files")
+    parser.add_argument('--sizes', default='1000,100000,1000000', help="Comma-separated node counts")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+    parser.add_argument('--baseline', nargs='?', const=baseline_path('api'), metavar='FILE',
+                        help="Compare against a JSON baseline (default benchmarks/baselines/api.json)")
+    parser.add_argument('--save-baseline', nargs='?', const=baseline_path('api'), metavar='FILE',
+                        help="Write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args()
+
+    metrics = {}
+    for rows in [int(size) for size in args.sizes.split(',')]:
+        # A fresh process per size: cached graphs and peak RSS don't carry over
+        result = run_in_fresh_process(run_size, rows, args.requests)
+        if result is None:
+            print(f"\n{rows} nodes: benchmark process died (out of memory?)")
+            continue
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else 'n/a'
+        print(f"\n{rows} nodes: loaded in {result['load_s']:.2f} s, peak RSS {rss} MB")
+        print(f"{'endpoint':<72} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>9}")
+        for endpoint, timing in result['endpoints'].items():
+            print(f"{endpoint:<72} {timing['p50_ms']:>8.2f} {timing['p99_ms']:>8.2f} {timing['requests_per_sec']:>9.0f}")
+            for name, value in timing.items():
+                metrics[f"rows={rows} {endpoint} {name}"] = value
+        metrics[f"rows={rows} load_s"] = result['load_s']
+        metrics[f"rows={rows} peak_rss_mb"] = result['peak_rss_mb']
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, metrics)
+    if args.baseline:
+        return 1 if compare_to_baseline(args.baseline, metrics, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Measure API cold starts: from a fresh interpreter to the first response.
+
+Each run starts a new process that imports api/csv_reader.py and serves
+one request through the Flask test client, once loading the snapshot from
+api/build_snapshot.py and once parsing Nodes.csv:
+
+    python api/build_snapshot.py
+    python benchmarks/bench_api_cold_start.py --runs 10
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, 'api')
+
+CHILD = '''
+import sys, time, io, contextlib, json
+start = time.perf_counter()
+sys.path.insert(0, {api_dir!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    import csv_reader
+    imported = time.perf_counter()
+    if not {use_snapshot!r}:
+        csv_reader.SNAPSHOT_FILE = None
+    response = csv_reader.app.test_client().get({path!r})
+assert response.status_code == 200, response.status_code
+done = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'first_response': done - imported}}))
+'''
+
+def cold_start(use_snapshot, path):
+    code = CHILD.format(api_dir=API_DIR, use_snapshot=use_snapshot, path=path)
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare API cold-start time with and without the startup snapshot")
+    parser.add_argument('--runs', type=int, default=10, help="Fresh processes per mode")
+    parser.add_argument('--path', default='/api/sessions', help="Endpoint requested first")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(ROOT, 'Nodes.snapshot.pickle')):
+        print("No snapshot found; run python api/build_snapshot.py first")
+        return 1
+
+    print(f"{args.runs} cold starts per mode, first request {args.path}")
+    print(f"{'mode':<10} {'import ms':>10} {'load + first response ms':>26}")
+    for name, use_snapshot in (('csv', False), ('snapshot', True)):
+        runs = [cold_start(use_snapshot, args.path) for _ in range(args.runs)]
+        import_ms = statistics.median(run['import'] for run in runs) * 1000
+        first_ms = statistics.median(run['first_response'] for run in runs) * 1000
+        print(f"{name:<10} {import_ms:>10.1f} {first_ms:>26.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
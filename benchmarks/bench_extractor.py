@@ -0,0 +1,171 @@
+"""Measure extract_data offline against a recorded corpus of article HTML.
+
+The corpus (one <Article_title>.html per page) is replayed by a local stub
+server, so runs are repeatable and never touch Wikipedia. Each worker
+count runs in a fresh process and reports pages/sec, parse ms/page and
+peak RSS. Record a real corpus once with --record, or generate a
+synthetic one with --synthetic. --faults makes the stub server throttle,
+fail or drop that share of requests, to check that retries keep every
+node. --backend api crawls through /w/api.php instead, replaying the
+recorded Action API responses in --fixture (benchmarks/fixtures/api_pages.json
+by default; --record with --backend api rewrites it):
+
+    python benchmarks/bench_extractor.py --record Korean_War --degree 2
+    python benchmarks/bench_extractor.py --synthetic
+    python benchmarks/bench_extractor.py --workers 1,4 --baseline
+    python benchmarks/bench_extractor.py --workers 4 --faults 0.1
+    python benchmarks/bench_extractor.py --backend api --workers 1,4 --faults 0.1
+"""
+import os
+import sys
+import io
+import time
+import json
+import argparse
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wikipedia_extractor import WikipediaExtractor
+from harness import (API_FIXTURE, add_api_response, baseline_path, compare_to_baseline, load_api_fixture,
+                     normalize_title, peak_rss_mb, run_in_fresh_process, save_baseline, serve_corpus,
+                     write_synthetic_corpus)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+class RecordingExtractor(WikipediaExtractor):
+    """Saves every page it fetches into the corpus directory"""
+    def __init__(self, corpus, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.corpus = corpus
+
+    def fetch_page_content(self, url, log_callback=None, stop_flag=None):
+        content = super().fetch_page_content(url, log_callback, stop_flag)
+        if content is not None:
+            name = url.split('/wiki/', 1)[-1]
+            with open(os.path.join(self.corpus, name + '.html'), 'wb') as f:
+                f.write(content)
+        return content
+
+def record(seed, degree, corpus, rps):
+    os.makedirs(corpus, exist_ok=True)
+    extractor = RecordingExtractor(corpus, requests_per_second=rps)
+    extractor.max_degree = degree
+    extractor.extract_data(f"{extractor.base_url}/wiki/{seed}")
+    print(f"Recorded {len(os.listdir(corpus))} pages into {corpus}")
+
+def record_api(seed, degree, fixture_path, rps):
+    fixture = {'pages': {}, 'redirects': {}}
+    extractor = WikipediaExtractor(requests_per_second=rps, fetch_backend='api')
+    extractor.max_degree = degree
+    request = extractor.api_client.request
+
+    def recording_request(params, stop_flag=None):
+        data = request(params, stop_flag)
+        add_api_response(fixture, data)
+        return data
+
+    extractor.api_client.request = recording_request
+    extractor.extract_data(f"{extractor.base_url}/wiki/{seed}")
+    os.makedirs(os.path.dirname(fixture_path) or '.', exist_ok=True)
+    with open(fixture_path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f, indent=1, ensure_ascii=False)
+    print(f"Recorded {len(fixture['pages'])} pages into {fixture_path}")
+
+def run_crawl(corpus, seed, degree, workers, fault_rate, fixture_path, results):
+    """Crawl the stub server; through its API replaying fixture_path if given, else its HTML corpus"""
+    fixture = load_api_fixture(fixture_path) if fixture_path else None
+    server, base_url = serve_corpus(None if fixture else corpus, fault_rate, fixture)
+    extractor = WikipediaExtractor(base_url=base_url, max_workers=workers, requests_per_second=1e6,
+                                   fetch_backend='api' if fixture else 'html')
+    extractor.max_degree = degree
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        nodes = extractor.extract_data(f"{base_url}/wiki/{seed}")
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    histograms = extractor.metrics.snapshot()['histograms']
+    parse, infobox = histograms.get('parse_seconds', {}), histograms.get('infobox_seconds', {})
+    # The API backend parses no HTML, only the wikitext infobox
+    parsed = parse.get('count', 0) or infobox.get('count', 0)
+    results.put({
+        'workers': workers,
+        'nodes': len(nodes),
+        'pages': extractor.stats['pages_fetched'],
+        'retries': extractor.stats['retries'],
+        'api_requests': server.api_requests,
+        'seconds': elapsed,
+        'pages_per_sec': extractor.stats['pages_fetched'] / elapsed,
+        'parse_ms_per_page': 1000 * (parse.get('sum', 0) + infobox.get('sum', 0)) / max(1, parsed),
+        'peak_rss_mb': peak_rss_mb(),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_data against a recorded corpus served locally")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="Directory of <Title>.html pages")
+    parser.add_argument('--seed', default='Korean_War', help="Title of the seed article")
+    parser.add_argument('--degree', type=int, default=3, help="max_degree of the crawl")
+    parser.add_argument('--workers', default='1,4', help="Comma-separated fetch worker counts to compare")
+    parser.add_argument('--backend', choices=('html', 'api'), default='html',
+                        help="Crawl the corpus HTML, or the recorded API responses in --fixture through /w/api.php")
+    parser.add_argument('--fixture', default=API_FIXTURE, help="Recorded API responses for --backend api")
+    parser.add_argument('--record', metavar='TITLE',
+                        help="Crawl Wikipedia from TITLE and save every page into --corpus (or --fixture with --backend api)")
+    parser.add_argument('--rps', type=float, default=1.0, help="Request rate while recording")
+    parser.add_argument('--faults', type=float, default=0.0,
+                        help="Share of requests the stub server answers with 429, 503 or a dropped connection")
+    parser.add_argument('--synthetic', action='store_true', help="Write a synthetic corpus into --corpus first")
+    parser.add_argument('--baseline', nargs='?', const=baseline_path('extractor'), metavar='FILE',
+                        help="Compare against a JSON baseline (default benchmarks/baselines/extractor.json)")
+    parser.add_argument('--save-baseline', nargs='?', const=baseline_path('extractor'), metavar='FILE',
+                        help="Write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args()
+
+    api = args.backend == 'api'
+    if args.record:
+        if api:
+            record_api(args.record, args.degree, args.fixture, args.rps)
+        else:
+            record(args.record, args.degree, args.corpus, args.rps)
+        args.seed = args.record
+    if args.synthetic:
+        print(f"Wrote {write_synthetic_corpus(args.corpus)} synthetic pages into {args.corpus}")
+    if api:
+        fixture = load_api_fixture(args.fixture)
+        seed = normalize_title(args.seed)
+        if seed not in fixture['pages'] and seed not in fixture['redirects']:
+            print(f"No {seed} in {args.fixture}; record it with --backend api --record {args.seed}")
+            return 1
+    elif not os.path.exists(os.path.join(args.corpus, f"{args.seed}.html")):
+        print(f"No {args.seed}.html in {args.corpus}; create a corpus with --record or --synthetic first")
+        return 1
+
+    metrics = {}
+    print(f"{'workers':>7} {'nodes':>6} {'pages':>6} {'retries':>7} {'api reqs':>8} {'seconds':>8} {'pages/sec':>10} "
+          f"{'parse ms/page':>14} {'peak RSS MB':>12}")
+    for workers in [int(count) for count in args.workers.split(',')]:
+        # A fresh process per run keeps peak RSS from leaking between runs
+        result = run_in_fresh_process(run_crawl, args.corpus, args.seed, args.degree, workers, args.faults,
+                                      args.fixture if api else None)
+        if result is None:
+            print(f"{workers:>7} crawl process died")
+            continue
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else 'n/a'
+        print(f"{workers:>7} {result['nodes']:>6} {result['pages']:>6} {result['retries']:>7} {result['api_requests']:>8} "
+              f"{result['seconds']:>8.2f} {result['pages_per_sec']:>10.1f} {result['parse_ms_per_page']:>14.2f} {rss:>12}")
+        # Runs with injected faults aren't comparable to the baseline
+        prefix = (f"degree={args.degree} workers={workers}" + (' backend=api' if api else '')
+                  + (f" faults={args.faults}" if args.faults else ''))
+        for name in ('pages_per_sec', 'parse_ms_per_page', 'peak_rss_mb'):
+            metrics[f"{prefix} {name}"] = result[name]
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, metrics)
+    if args.baseline:
+        return 1 if compare_to_baseline(args.baseline, metrics, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
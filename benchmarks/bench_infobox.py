@@ -0,0 +1,75 @@
+"""Measure infobox extraction alone on the pages of a corpus.
+
+Every page is parsed once up front; extract_infobox_data is then timed
+over all of them --repeat times, reporting microseconds per infobox for
+each parser backend:
+
+    python benchmarks/bench_infobox.py --corpus benchmarks/corpus
+    python benchmarks/bench_infobox.py --baseline
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wikipedia_extractor import PARSER_BACKENDS, WikipediaExtractor
+from harness import baseline_path, compare_to_baseline, percentile, save_baseline, write_synthetic_corpus
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+def time_infoboxes(soups, extractor, repeat):
+    """Seconds per pass over every soup, one entry per repeat"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for soup in soups:
+            extractor.extract_infobox_data(soup)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark infobox extraction on the pages of a corpus")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="Directory of <Title>.html pages")
+    parser.add_argument('--repeat', type=int, default=20, help="Passes over the corpus per parser backend")
+    parser.add_argument('--synthetic', action='store_true', help="Write a synthetic corpus into --corpus first")
+    parser.add_argument('--baseline', nargs='?', const=baseline_path('infobox'), metavar='FILE',
+                        help="Compare against a JSON baseline (default benchmarks/baselines/infobox.json)")
+    parser.add_argument('--save-baseline', nargs='?', const=baseline_path('infobox'), metavar='FILE',
+                        help="Write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        print(f"Wrote {write_synthetic_corpus(args.corpus)} synthetic pages into {args.corpus}")
+    paths = sorted(glob.glob(os.path.join(args.corpus, '*.html')))
+    if not paths:
+        print(f"No pages in {args.corpus}; create a corpus with --synthetic or bench_extractor.py --record first")
+        return 1
+
+    metrics = {}
+    print(f"{len(paths)} pages")
+    print(f"{'parser':<12} {'us/infobox p50':>15} {'us/infobox p99':>15}")
+    for backend in PARSER_BACKENDS:
+        extractor = WikipediaExtractor(parser=backend)
+        soups = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                soups.append(extractor.parse_html(f.read()))
+        timings = [1e6 * seconds / len(soups) for seconds in time_infoboxes(soups, extractor, args.repeat)]
+        p50, p99 = percentile(timings, 0.5), percentile(timings, 0.99)
+        print(f"{backend:<12} {p50:>15.1f} {p99:>15.1f}")
+        metrics[f"parser={backend} us_per_infobox_p50"] = p50
+        metrics[f"parser={backend} us_per_infobox_p99"] = p99
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, metrics)
+    if args.baseline:
+        return 1 if compare_to_baseline(args.baseline, metrics, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Measure memory per extracted node for a synthetic crawl.
+
+Compares the original dict-backed dataclass, the slotted ExtractedNode
+with interned keys, and the columnar NodeStore:
+
+    python benchmarks/bench_node_memory.py --nodes 100000
+"""
+import os
+import sys
+import random
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wikipedia_extractor import ExtractedNode
+from node_store import NodeStore
+
+@dataclass
+class DictNode:
+    """ExtractedNode as it was before slots and interning"""
+    title: str
+    url: str
+    node_type: str
+    degree: int
+    parent_url: Optional[str] = None
+    description: Optional[str] = ''
+    start_date: Optional[str] = ''
+    end_date: Optional[str] = ''
+    metadata: dict = field(default_factory=dict)
+
+PERSON_KEYS = ['Allegiance', 'Branch', 'Years of service', 'Rank', 'Commands', 'Awards', 'Spouse']
+EVENT_KEYS = ['Location', 'Result', 'Territorial changes']
+VALUES = ['United States', 'General', 'United States Army', 'Republic of Korea Army', 'Inconclusive']
+
+def fresh(text: str) -> str:
+    # Parsed pages hand out new string objects; defeat constant sharing
+    return ''.join(list(text))
+
+def synthetic_fields(count: int, seed: int = 7):
+    """Field tuples shaped like a deep crawl: shared URL prefix, repeated keys and values"""
+    rnd = random.Random(seed)
+    for i in range(count):
+        node_type = 'Person' if i % 3 else 'Event'
+        title = f"{'General' if node_type == 'Person' else 'Battle of'} Name {i}"
+        keys = PERSON_KEYS if node_type == 'Person' else EVENT_KEYS
+        yield dict(
+            title=title,
+            url=f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
+            node_type=fresh(node_type),
+            degree=min(3, i // 25000),
+            parent_url=f"https://en.wikipedia.org/wiki/Parent_{i // 8}",
+            description=f"Description of {title}",
+            start_date=f"{rnd.randint(1, 28)} June 19{rnd.randint(10, 50)}",
+            end_date='',
+            metadata={fresh(key): fresh(rnd.choice(VALUES)) for key in keys},
+        )
+
+def measure(build, count):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    nodes = build(synthetic_fields(count))
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return nodes, (after - before) / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory per node across node representations")
+    parser.add_argument('--nodes', type=int, default=100000, help="Number of synthetic nodes")
+    args = parser.parse_args()
+
+    builds = [
+        ('dataclass (__dict__)', lambda rows: [DictNode(**row) for row in rows]),
+        ('ExtractedNode (slots)', lambda rows: [ExtractedNode(**row) for row in rows]),
+        ('NodeStore (columnar)', lambda rows: NodeStore(ExtractedNode, (ExtractedNode(**row) for row in rows))),
+    ]
+    print(f"{args.nodes} synthetic nodes")
+    print(f"{'representation':<24} {'bytes/node':>11} {'total MB':>9}")
+    for name, build in builds:
+        nodes, per_node = measure(build, args.nodes)
+        print(f"{name:<24} {per_node:>11.0f} {per_node * args.nodes / (1024 * 1024):>9.1f}")
+        del nodes
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
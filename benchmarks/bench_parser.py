@@ -0,0 +1,135 @@
+"""Compare parse time and peak memory of the extractor's HTML parser backends.
+
+Runs every backend over the saved pages in a fixture directory (one
+<Article_title>.html per page) in a fresh process, so peak RSS is measured
+per backend. Fixture pages can be downloaded once with --download:
+
+    python benchmarks/bench_parser.py --download Korean_War World_War_II
+    python benchmarks/bench_parser.py --repeat 5
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import multiprocessing
+from queue import Empty
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wikipedia_extractor import WikipediaExtractor, PARSER_BACKENDS
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+def load_fixtures(directory):
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(directory, name), 'rb') as f:
+                pages.append((name, f.read()))
+    return pages
+
+def run_backend(parser, directory, repeat, results):
+    pages = load_fixtures(directory)
+    extractor = WikipediaExtractor(parser=parser)
+    tracemalloc.start()
+    timings = []
+    for _ in range(repeat):
+        for _, content in pages:
+            start = time.perf_counter()
+            soup = extractor.parse_html(content)
+            extractor.get_page_title(soup)
+            extractor.extract_infobox_data(soup)
+            extractor.classify_page(soup)
+            timings.append(time.perf_counter() - start)
+            del soup
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss = peak_rss_kb()
+    results.put({
+        'parser': parser,
+        'pages': len(pages),
+        'mean_ms': 1000 * sum(timings) / len(timings),
+        'max_ms': 1000 * max(timings),
+        'traced_peak_mb': traced_peak / (1024 * 1024),
+        'peak_rss_mb': rss / 1024 if rss is not None else None,
+    })
+
+def run_in_child(ctx, backend, directory, repeat, timeout):
+    """Run one backend in a fresh process; its result, or None (with the reason printed) if it failed"""
+    results = ctx.Queue()
+    process = ctx.Process(target=run_backend, args=(backend, directory, repeat, results))
+    process.start()
+    deadline = time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=1)
+        except Empty:
+            if not process.is_alive():
+                # The child may have queued its result just before exiting
+                try:
+                    result = results.get(timeout=1)
+                except Empty:
+                    break
+            elif time.monotonic() > deadline:
+                process.terminate()
+                process.join()
+                print(f"{backend:<12} timed out after {timeout:.0f}s")
+                return None
+    process.join()
+    if result is None or process.exitcode != 0:
+        print(f"{backend:<12} failed (exit code {process.exitcode})")
+        return None
+    return result
+
+def download(titles, directory):
+    extractor = WikipediaExtractor()
+    os.makedirs(directory, exist_ok=True)
+    for title in titles:
+        response = extractor.session.get(f"{extractor.base_url}/wiki/{title}", timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(directory, f"{title}.html"), 'wb') as f:
+            f.write(response.content)
+        print(f"Saved {title} ({len(response.content) // 1024} KiB)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on fixture pages")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help="Directory of saved <Title>.html pages")
+    parser.add_argument('--repeat', type=int, default=3, help="Times to parse every page")
+    parser.add_argument('--download', nargs='+', metavar='TITLE', help="Save these articles as fixtures first")
+    parser.add_argument('--timeout', type=float, default=600, help="Seconds to wait for each backend")
+    args = parser.parse_args()
+
+    if args.download:
+        download(args.download, args.fixtures)
+    if not os.path.isdir(args.fixtures) or not load_fixtures(args.fixtures):
+        print(f"No fixture pages in {args.fixtures}; save some with --download first")
+        return 1
+
+    ctx = multiprocessing.get_context('spawn')
+    failed = False
+    print(f"{'parser':<12} {'pages':>5} {'mean ms':>9} {'max ms':>9} {'traced MB':>10} {'peak RSS MB':>12}")
+    for backend in PARSER_BACKENDS:
+        # A fresh process per backend keeps peak RSS from leaking between runs
+        result = run_in_child(ctx, backend, args.fixtures, args.repeat, args.timeout)
+        if result is None:
+            failed = True
+            continue
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else 'n/a'
+        print(f"{result['parser']:<12} {result['pages']:>5} {result['mean_ms']:>9.1f} {result['max_ms']:>9.1f} "
+              f"{result['traced_peak_mb']:>10.1f} {rss:>12}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
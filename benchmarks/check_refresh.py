@@ -0,0 +1,112 @@
+"""Check that --refresh gives the output of a full crawl, refetching only edited pages.
+
+Crawls the recorded API fixture from the stub server with a journal, then:
+
+1. refreshes with nothing edited, which must fetch no page and write the
+   same Nodes/Edges CSV as the first crawl;
+2. edits pages on the stub (new revision IDs, infobox links added and
+   removed), refreshes again, and compares against a full crawl of the
+   edited wiki, which the refresh must match while fetching only the
+   edited pages and the pages their new links reach.
+
+Exits non-zero on any mismatch:
+
+    python benchmarks/check_refresh.py
+    python benchmarks/check_refresh.py --degree 2
+"""
+import os
+import sys
+import io
+import logging
+import argparse
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wikipedia_extractor import WikipediaExtractor
+from result_sinks import edges_path_for, open_sink
+from harness import API_FIXTURE, load_api_fixture, serve_corpus
+
+# Wikitext replacements made on the stub between the first crawl and the refresh
+EDITS = {
+    'Korean War': ('[[Mark W. Clark]]', '[[Edward Almond]]'),
+    'Peng Dehuai': ('* [[Battle of Chosin Reservoir]]\n', ''),
+}
+
+def edit_page(fixture, title, old, new):
+    """Replace old with new in the page's wikitext as a new revision"""
+    revision = fixture['pages'][title]['revisions'][-1]
+    content = revision['slots']['main']['content']
+    if old not in content:
+        raise ValueError(f"{old!r} is not in the wikitext of {title}")
+    fixture['pages'][title]['revisions'] = [{
+        **revision,
+        'revid': revision['revid'] + 1,
+        'parentid': revision['revid'],
+        'timestamp': '2030-01-01T00:00:00Z',
+        'slots': {'main': {**revision['slots']['main'], 'content': content.replace(old, new)}},
+    }]
+
+def crawl(base_url, seed, degree, output, journal=None, refresh=False):
+    """Run a crawl (or a refresh of journal) into output.
+
+    Returns (nodes CSV, edges CSV, pages fetched, node URLs).
+    """
+    sink = open_sink(output)
+    extractor = WikipediaExtractor(base_url=base_url, requests_per_second=1e6, fetch_backend='api',
+                                   journal_path=journal, sinks=[sink], log_level=logging.WARNING)
+    extractor.max_degree = degree
+    with contextlib.redirect_stdout(io.StringIO()):
+        if refresh:
+            nodes = extractor.refresh()
+        else:
+            nodes = extractor.extract_data(f"{base_url}/wiki/{seed}")
+    sink.close()
+    with open(output, 'r', encoding='utf-8') as f:
+        nodes_csv = f.read()
+    with open(edges_path_for(output), 'r', encoding='utf-8') as f:
+        edges_csv = f.read()
+    return nodes_csv, edges_csv, extractor.stats['pages_fetched'], {node.url for node in nodes}
+
+def check(name, passed, detail):
+    print(f"{'ok  ' if passed else 'FAIL'} {name}: {detail}")
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="Check incremental refresh against full crawls of the API fixture")
+    parser.add_argument('--fixture', default=API_FIXTURE, help="Recorded API responses to serve")
+    parser.add_argument('--seed', default='Korean_War', help="Title of the seed article")
+    parser.add_argument('--degree', type=int, default=3, help="max_degree of the crawl")
+    args = parser.parse_args()
+
+    fixture = load_api_fixture(args.fixture)
+    server, base_url = serve_corpus(None, api_fixture=fixture)
+    directory = tempfile.mkdtemp()
+    journal = os.path.join(directory, 'crawl.jsonl')
+
+    def run(name, **kwargs):
+        return crawl(base_url, args.seed, args.degree, os.path.join(directory, f"{name}.csv"), **kwargs)
+
+    results = []
+    first = run('first', journal=journal)
+    unchanged = run('unchanged', journal=journal, refresh=True)
+    results.append(check('refresh without edits', unchanged[:2] == first[:2] and unchanged[2] == 0,
+                         f"{unchanged[2]} pages fetched, output {'same' if unchanged[:2] == first[:2] else 'differs'}"))
+
+    for title, (old, new) in EDITS.items():
+        edit_page(fixture, title, old, new)
+    edited = run('edited', journal=journal, refresh=True)
+    full = run('full')
+    results.append(check('edits change the crawl', full[:2] != first[:2], f"{full[2]} pages in the full crawl"))
+    # Pages first reached through an added link have no journaled copy to reuse
+    allowed = len(EDITS) + len(full[3] - first[3])
+    results.append(check('refresh after edits', edited[:2] == full[:2] and edited[2] <= allowed,
+                         f"{edited[2]} pages fetched for {len(EDITS)} edited and {allowed - len(EDITS)} newly linked, "
+                         f"output {'matches' if edited[:2] == full[:2] else 'differs from'} the full crawl"))
+    server.shutdown()
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""Shared pieces of the benchmark scripts: a stub wiki server, synthetic
+article pages, peak RSS and JSON baselines for catching regressions."""
+import os
+import sys
+import json
+import random
+import threading
+import multiprocessing
+from queue import Empty
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+# Action API responses (page entries and redirects) the stub server replays for /w/api.php
+API_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'api_pages.json')
+# Categories per API response before the stub answers with a continuation, like cllimit=max
+API_CATEGORY_LIMIT = 500
+
+# Metric name suffixes where a bigger number is better; everything else (ms, MB, s) should shrink
+HIGHER_IS_BETTER = ('_per_sec',)
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values (fraction between 0 and 1)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+def run_in_fresh_process(target, *args):
+    """Call target(*args, results) in a new interpreter and return what it puts on results.
+
+    None if the process died first (for example killed for running out of memory).
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    process = ctx.Process(target=target, args=(*args, results))
+    process.start()
+    while True:
+        try:
+            result = results.get(timeout=1)
+            break
+        except Empty:
+            if not process.is_alive():
+                result = None
+                break
+    process.join()
+    return result
+
+# Failures the stub server injects: throttling with Retry-After, an overloaded server, a dropped connection
+FAULTS = ('429', '503', 'drop')
+
+def load_api_fixture(path=API_FIXTURE):
+    """Recorded API fixture: {'pages': {title: page entry}, 'redirects': {alias: title}}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def add_api_response(fixture, data):
+    """Add the page entries and redirects of one recorded API response to fixture"""
+    query = (data or {}).get('query', {})
+    for entry in query.get('redirects', []):
+        fixture['redirects'][entry['from']] = entry['to']
+    for page in query.get('pages', []):
+        if page.get('missing') or page.get('invalid'):
+            continue
+        recorded = fixture['pages'].setdefault(page['title'], {})
+        for key, value in page.items():
+            # Continuations repeat the page with the next share of its categories
+            if key == 'categories':
+                recorded.setdefault(key, []).extend(value)
+            else:
+                recorded[key] = value
+
+def normalize_title(title):
+    """The title MediaWiki normalizes title to: spaces for underscores, first letter upper case"""
+    title = ' '.join(title.replace('_', ' ').split())
+    return title[:1].upper() + title[1:]
+
+def page_entry(page, props, rvprop):
+    """The parts of a recorded page entry that a query with these props and rvprop returns"""
+    entry = {key: page[key] for key in ('pageid', 'ns', 'title')}
+    if 'pageprops' in props and page.get('pageprops'):
+        entry['pageprops'] = page['pageprops']
+    if 'revisions' in props:
+        fields = {'revid', 'parentid'} if 'ids' in rvprop else set()
+        fields.update(field for field in ('timestamp',) if field in rvprop)
+        if 'content' in rvprop:
+            fields.add('slots')
+        entry['revisions'] = [{key: value for key, value in revision.items() if key in fields}
+                              for revision in page.get('revisions', [])[-1:]]
+    return entry
+
+def api_response(fixture, params, category_limit=API_CATEGORY_LIMIT):
+    """Answer an action=query request from the fixture, like api.php with formatversion=2.
+
+    Titles are normalized and redirects followed (reported in 'normalized'
+    and 'redirects'), unknown titles come back as missing pages, and when
+    the batch has more than category_limit categories the rest follow in
+    continuation responses that carry only the categories.
+    """
+    if params.get('action') != 'query' or params.get('format') != 'json':
+        return {'error': {'code': 'badparams', 'info': 'Only action=query&format=json is replayed'}}
+    props = set(params.get('prop', '').split('|'))
+    rvprop = set(params.get('rvprop', '').split('|'))
+    normalized, redirects, resolved = [], [], []
+    for title in params.get('titles', '').split('|'):
+        name = normalize_title(title)
+        if name != title:
+            normalized.append({'fromencoded': False, 'from': title, 'to': name})
+        target = fixture['redirects'].get(name) if params.get('redirects') else None
+        if target:
+            redirects.append({'from': name, 'to': target})
+            name = target
+        if name not in resolved:
+            resolved.append(name)
+
+    offset = int(params.get('clcontinue', 0))
+    pages, categories = [], 0
+    for name in resolved:
+        page = fixture['pages'].get(name)
+        if page is None:
+            pages.append({'ns': 0, 'title': name, 'missing': True})
+            continue
+        # A continuation only carries the categories that didn't fit in the previous response
+        entry = page_entry(page, props, rvprop) if not offset else {key: page[key] for key in ('pageid', 'ns', 'title')}
+        if 'categories' in props:
+            page_categories = page.get('categories', [])
+            first = min(len(page_categories), max(0, offset - categories))
+            last = min(len(page_categories), max(0, offset + category_limit - categories))
+            if first < last:
+                entry['categories'] = page_categories[first:last]
+            categories += len(page_categories)
+        pages.append(entry)
+
+    query = {'pages': pages}
+    if normalized:
+        query['normalized'] = normalized
+    if redirects:
+        query['redirects'] = redirects
+    response = {'batchcomplete': True, 'query': query}
+    if 'categories' in props and categories > offset + category_limit:
+        response = {'continue': {'clcontinue': str(offset + category_limit), 'continue': '||'}, 'query': query}
+    return response
+
+class CorpusHandler(BaseHTTPRequestHandler):
+    """Serves /wiki/<Title> from <Title>.html in the server's corpus directory.
+
+    With an API fixture, /w/api.php answers queries from it (see
+    api_response). With the server's fault_rate above zero, that share of
+    requests fails with one of FAULTS instead.
+    """
+    # Keep-alive like a real wiki; without TCP_NODELAY every response would wait out a delayed ACK
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def inject_fault(self) -> bool:
+        if not self.server.fault_rate or random.random() >= self.server.fault_rate:
+            return False
+        fault = random.choice(FAULTS)
+        if fault == 'drop':
+            self.close_connection = True
+            return True
+        self.send_response(int(fault))
+        if fault == '429':
+            self.send_header('Retry-After', '1')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.inject_fault():
+            return
+        url = urlsplit(self.path)
+        if url.path == '/w/api.php' and self.server.api_fixture is not None:
+            with self.server.lock:
+                self.server.api_requests += 1
+            response = api_response(self.server.api_fixture, dict(parse_qsl(url.query)), self.server.category_limit)
+            self.send_body(200, 'application/json; charset=utf-8', json.dumps(response).encode('utf-8'))
+            return
+        name = unquote(url.path[len('/wiki/'):]).replace(' ', '_') if url.path.startswith('/wiki/') else ''
+        file_path = os.path.join(self.server.corpus, name + '.html') if self.server.corpus else ''
+        if not name or '/' in name or not os.path.exists(file_path):
+            self.send_body(404, 'text/plain', b'')
+            return
+        with open(file_path, 'rb') as f:
+            self.send_body(200, 'text/html; charset=utf-8', f.read())
+
+def serve_corpus(corpus, fault_rate=0.0, api_fixture=None, category_limit=API_CATEGORY_LIMIT):
+    """Start a local server replaying the pages in corpus; returns (server, base_url)
+
+    api_fixture (see load_api_fixture) makes it answer /w/api.php too; corpus
+    may then be None. server.api_requests counts the API requests served.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CorpusHandler)
+    server.daemon_threads = True
+    server.corpus = corpus
+    server.fault_rate = fault_rate
+    server.api_fixture = api_fixture
+    server.category_limit = category_limit
+    server.api_requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def article_html(title, categories, infobox_rows, paragraphs):
+    """A page with the parts of a Wikipedia article the extractor reads"""
+    rows = ''.join(f'<tr><th>{header}</th><td>{value}</td></tr>' for header, value in infobox_rows)
+    links = ''.join(f'<li><a href="/wiki/Category:{category.replace(" ", "_")}">{category}</a></li>'
+                    for category in categories)
+    return (f'<!DOCTYPE html><html><head><title>{title} - Wikipedia</title></head><body>'
+            f'<div id="content"><h1 id="firstHeading">{title}</h1><div id="bodyContent">'
+            f'<table class="infobox"><caption>{title}</caption>{rows}</table>{paragraphs}</div>'
+            f'<div id="catlinks"><ul>{links}</ul></div></div></body></html>')
+
+def wiki_link(title):
+    return f'<a href="/wiki/{title.replace(" ", "_")}">{title}</a>'
+
+def write_synthetic_corpus(directory, events=300, people=600, paragraphs=40, seed=7):
+    """Write a crawlable corpus: Korean_War plus battles and commanders linking to each other.
+
+    Every page carries ~30 KB of article text around the infobox, so the
+    parser has real work to skip. Returns the number of pages written.
+    """
+    rnd = random.Random(seed)
+    event_titles = ['Korean War'] + [f'Battle of Synthetic Place {i}' for i in range(1, events)]
+    person_titles = [f'General Synthetic Person {i}' for i in range(people)]
+    text = ''.join(f'<p>{" ".join(rnd.choice(["army", "front", "river", "offensive", "division"]) for _ in range(120))}'
+                   f'</p>' for _ in range(paragraphs))
+    os.makedirs(directory, exist_ok=True)
+    for title in event_titles:
+        commanders = rnd.sample(person_titles, rnd.randint(4, 12))
+        rows = [('Date', f'{rnd.randint(1, 28)} June 1950 – 27 July 1953'), ('Location', 'Korean Peninsula'),
+                ('Result', 'Armistice'), ('Commanders and leaders', ''.join(map(wiki_link, commanders)))]
+        page = article_html(title, ['Wars involving South Korea', 'Battles of the Korean War'], rows, text)
+        with open(os.path.join(directory, title.replace(' ', '_') + '.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+    for title in person_titles:
+        battles = rnd.sample(event_titles, rnd.randint(2, 8))
+        rows = [('Born', f'{rnd.randint(1, 28)} May 18{rnd.randint(80, 99)}'), ('Died', '5 April 1964'),
+                ('Allegiance', 'United States'), ('Rank', 'General'), ('Battles/wars', ''.join(map(wiki_link, battles)))]
+        page = article_html(title, ['American military personnel of the Korean War', '1964 deaths'], rows, text)
+        with open(os.path.join(directory, title.replace(' ', '_') + '.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+    return len(event_titles) + len(person_titles)
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def save_baseline(path, metrics):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"Saved baseline to {path}")
+
+def compare_to_baseline(path, metrics, tolerance):
+    """Print metrics that got worse than the baseline by more than tolerance; returns how many did"""
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = 0
+    for name, value in sorted(metrics.items()):
+        expected = baseline.get(name)
+        if expected is None or value is None or not expected:
+            continue
+        change = (value - expected) / expected
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        if worse > tolerance:
+            regressions += 1
+            print(f"REGRESSION {name}: {value:.3f} vs baseline {expected:.3f} ({worse:+.0%} worse)")
+    print(f"{regressions} regressions against {path} (tolerance {tolerance:.0%})")
+    return regressions
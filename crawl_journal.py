@@ -0,0 +1,102 @@
+import os
+import json
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Set, Tuple
+
+@dataclass
+class JournalState:
+    """Crawl progress rebuilt from a journal"""
+    seed_url: Optional[str] = None
+    max_degree: Optional[int] = None
+    nodes: List[dict] = field(default_factory=list)
+    pages: Dict[str, dict] = field(default_factory=dict)
+    # Links claimed while expanding a degree: degree -> [(parent_url, name, url, node_type)]
+    links: Dict[int, List[Tuple[str, str, str, str]]] = field(default_factory=dict)
+    expanded: Set[str] = field(default_factory=set)
+    # Relationships between node URLs: [(source_url, target_url, relationship)]
+    edges: List[Tuple[str, str, str]] = field(default_factory=list)
+    completed_degrees: Set[int] = field(default_factory=set)
+
+class CrawlJournal:
+    """Append-only JSONL journal of a crawl.
+
+    Every parsed page, claimed link, relationship, finished node and completed degree is
+    written as one line as soon as it happens, so an interrupted crawl can
+    be resumed from the journal without fetching those pages again.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, event: str, **data):
+        line = json.dumps({'event': event, **data}, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def record_start(self, seed_url: str, max_degree: int):
+        self.write('start', seed_url=seed_url, max_degree=max_degree)
+
+    def record_page(self, url: str, page: dict):
+        # The revision ID (API backend) or Last-Modified header (HTML) lets a refresh tell whether the page changed
+        self.write('page', url=url, title=page['title'], infobox=page['infobox'],
+                   classification=asdict(page['classification']), revision_id=page.get('revision_id'),
+                   last_modified=page.get('last_modified'), canonical_url=page.get('canonical_url'))
+
+    def record_link(self, degree: int, parent_url: str, name: str, url: str, node_type: str):
+        self.write('link', degree=degree, parent_url=parent_url, name=name, url=url, node_type=node_type)
+
+    def record_edge(self, source_url: str, target_url: str, relationship: str):
+        self.write('edge', source_url=source_url, target_url=target_url, relationship=relationship)
+
+    def record_expanded(self, url: str):
+        self.write('expanded', url=url)
+
+    def record_node(self, node):
+        self.write('node', node=asdict(node))
+
+    def record_degree(self, degree: int):
+        self.write('degree', degree=degree)
+        self.sync()
+
+    def sync(self):
+        """Force everything written so far to disk"""
+        with self.lock:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    @staticmethod
+    def load(path: str) -> JournalState:
+        """Replay a journal into the crawl state it describes"""
+        state = JournalState()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line half written
+                    continue
+                event = record.get('event')
+                if event == 'start':
+                    state.seed_url = state.seed_url or record['seed_url']
+                    state.max_degree = record['max_degree']
+                elif event == 'page':
+                    state.pages[record['url']] = record
+                elif event == 'link':
+                    state.links.setdefault(record['degree'], []).append(
+                        (record['parent_url'], record['name'], record['url'], record['node_type']))
+                elif event == 'edge':
+                    state.edges.append((record['source_url'], record['target_url'], record['relationship']))
+                elif event == 'expanded':
+                    state.expanded.add(record['url'])
+                elif event == 'node':
+                    state.nodes.append(record['node'])
+                elif event == 'degree':
+                    state.completed_degrees.add(record['degree'])
+        return state
@@ -0,0 +1,337 @@
+import os
+import json
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Job states; 'completed', 'stopped' and 'failed' are final
+FINISHED_STATUSES = ('completed', 'stopped', 'failed')
+
+# SessionStore shared by the jobs, in the jobs directory
+SESSION_STORE_FILE = 'sessions.sqlite3'
+
+# Events kept per job for clients that (re)connect to the event stream
+EVENT_BUFFER_SIZE = 1000
+
+class EventSink:
+    """Result sink that forwards finished nodes to the job's events queue in batches"""
+    def __init__(self, job_id: int, events, batch_size: int = 20):
+        self.job_id = job_id
+        self.events = events
+        self.batch_size = batch_size
+        self.buffer: List[dict] = []
+
+    def write(self, node):
+        from result_sinks import node_to_dict
+        record = node_to_dict(node)
+        # Metadata is the bulk of a node and isn't needed to follow the crawl
+        del record['metadata']
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_edge(self, source_url: str, target_url: str, relationship: str):
+        pass
+
+    def flush(self):
+        if self.buffer:
+            self.events.put(('nodes', self.job_id, self.buffer))
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+
+class EventBuffer:
+    """Ring buffer of a job's events with increasing IDs, for server-sent event streams.
+
+    Readers ask for everything after the last ID they saw and can block
+    until something new arrives.
+    """
+    def __init__(self, size: int = EVENT_BUFFER_SIZE):
+        self.events = deque(maxlen=size)
+        self.last_id = 0
+        # Set once the final status has been appended
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def append(self, kind: str, data):
+        with self.condition:
+            self.last_id += 1
+            self.events.append((self.last_id, kind, data))
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def since(self, last_id: int, timeout: Optional[float] = None) -> List[Tuple[int, str, object]]:
+        """Events after last_id, waiting up to timeout seconds if there are none yet"""
+        with self.condition:
+            if self.last_id <= last_id and timeout:
+                self.condition.wait(timeout)
+            # Events older than the buffer are gone; the reader resumes from the oldest kept
+            return [event for event in self.events if event[0] > last_id]
+
+def run_extraction_job(job_id: int, config: dict, output_dir: str, stop_flag, events,
+                       store_path: Optional[str] = None) -> dict:
+    """Run one crawl in a worker process.
+
+    Log lines, progress, metrics and batches of new nodes go to the events
+    queue as ('log', job_id, message), ('progress', job_id, progress),
+    ('metrics', job_id, snapshot) and ('nodes', job_id, [node, ...]). Nodes and edges are inserted into
+    session job_id of the SessionStore at store_path as they are found,
+    or without a store written to Nodes.csv and Edges.csv in output_dir.
+    The crawl journal goes in output_dir. Returns the final status.
+    """
+    # Imported here so the API process doesn't load the extractor's dependencies
+    from urllib.parse import urlparse
+    from wikipedia_extractor import WikipediaExtractor
+    from result_sinks import SqliteSink, open_sink
+    from session_store import SessionStore
+
+    os.makedirs(output_dir, exist_ok=True)
+    seed = urlparse(config['seed_url'])
+    store = None
+    if store_path:
+        store = SessionStore(store_path)
+        title = seed.path.rsplit('/', 1)[-1].replace('_', ' ')
+        store.create_session(title, seed_url=config['seed_url'], max_degree=config['max_degree'], session_id=job_id)
+        sink = SqliteSink(store_path, session_id=job_id, store=store)
+    else:
+        sink = open_sink(os.path.join(output_dir, 'Nodes.csv'))
+    event_sink = EventSink(job_id, events)
+    status = 'failed'
+    extractor = None
+
+    def report(progress):
+        events.put(('progress', job_id, progress))
+        events.put(('metrics', job_id, extractor.metrics.snapshot()))
+
+    try:
+        extractor = WikipediaExtractor(base_url=f"{seed.scheme}://{seed.netloc}",
+                                       max_workers=config.get('workers', 1),
+                                       requests_per_second=config.get('requests_per_second', 1.0),
+                                       journal_path=os.path.join(output_dir, 'journal.jsonl'), sinks=[sink, event_sink])
+        extractor.max_degree = config['max_degree']
+        events.put(('status', job_id, 'running'))
+        extractor.extract_data(config['seed_url'], stop_flag,
+                               log_callback=lambda message: events.put(('log', job_id, message)),
+                               progress_callback=report)
+        extractor.save_results(os.path.join(output_dir, 'extraction_results.json'))
+        status = 'stopped' if stop_flag.is_set() else 'completed'
+        return {'status': status, 'progress': extractor.progress(), 'metrics': extractor.metrics.snapshot(),
+                'error': None}
+    except Exception as e:
+        return {'status': 'failed', 'progress': None, 'metrics': extractor.metrics.snapshot() if extractor else None,
+                'error': str(e)}
+    finally:
+        sink.close()
+        event_sink.close()
+        if store is not None:
+            store.update_session(job_id, status=status, completed_at=datetime.now().isoformat(timespec='seconds'))
+            store.close()
+
+class ExtractionJob:
+    """One crawl run by the JobManager, exposed by the API as a session"""
+    def __init__(self, job_id: int, config: dict, output_dir: str):
+        self.job_id = job_id
+        self.config = config
+        self.output_dir = output_dir
+        self.status = 'queued'
+        self.progress: dict = {}
+        # Latest CrawlMetrics snapshot reported by the worker
+        self.metrics: dict = {}
+        self.logs = deque(maxlen=200)
+        self.events = EventBuffer()
+        self.error: Optional[str] = None
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.completed_at: Optional[str] = None
+        self.stop_flag = None
+        self.future = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def percent_done(self) -> int:
+        """Rough completion estimate: finished degrees plus the share of the current batch fetched"""
+        if self.status == 'completed':
+            return 100
+        max_degree = self.progress.get('max_degree') or self.config.get('max_degree') or 1
+        degree = self.progress.get('degree', 0)
+        nodes_at_degree = self.progress.get('nodes_per_degree', {}).get(degree, 0)
+        queue_depth = self.progress.get('queue_depth', 0)
+        batch_done = 1 - queue_depth / nodes_at_degree if nodes_at_degree and queue_depth < nodes_at_degree else 0
+        return min(99, int(100 * (degree + batch_done) / (max_degree + 1)))
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.job_id,
+            'config': self.config,
+            'status': self.status,
+            'progress': self.progress,
+            'metrics': self.metrics,
+            'error': self.error,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
+        }
+
+class JobManager:
+    """Runs extraction jobs in a process pool and tracks their progress.
+
+    Each job gets a stop flag (a Manager Event passed to extract_data) and
+    reports through one shared Manager queue, drained by a listener thread
+    so request threads never block on a crawl. Job state is saved as
+    job.json in the job's directory under jobs_dir, so finished jobs are
+    listed again after a restart; their nodes are in the SessionStore at
+    store_path under the job ID, or in the job directory's CSV files.
+    """
+    def __init__(self, jobs_dir: str, max_workers: int = 2, first_job_id: int = 2,
+                 store_path: Optional[str] = None):
+        self.jobs_dir = jobs_dir
+        # Jobs with output_type 'sql' write into this SessionStore; others write CSV files
+        self.store_path = store_path or os.path.join(jobs_dir, SESSION_STORE_FILE)
+        self.lock = threading.Lock()
+        self.jobs: Dict[int, ExtractionJob] = {}
+        self.next_id = first_job_id
+        self.max_workers = max_workers
+        # Started with the first job, so listing finished jobs spawns no processes
+        self.manager = None
+        self.events = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.load_finished_jobs()
+
+    def start_pool(self):
+        # Spawned workers don't inherit the API's threads or open sockets
+        context = multiprocessing.get_context('spawn')
+        self.manager = context.Manager()
+        self.events = self.manager.Queue()
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        threading.Thread(target=self.listen, name='extraction-job-events', daemon=True).start()
+
+    def load_finished_jobs(self):
+        if not os.path.isdir(self.jobs_dir):
+            return
+        for name in os.listdir(self.jobs_dir):
+            path = os.path.join(self.jobs_dir, name, 'job.json')
+            if not name.isdigit() or not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            job = ExtractionJob(record['job_id'], record['config'], os.path.dirname(path))
+            job.status = record['status'] if record['status'] in FINISHED_STATUSES else 'failed'
+            job.progress = record.get('progress') or {}
+            job.metrics = record.get('metrics') or {}
+            job.error = record.get('error')
+            job.started_at = record.get('started_at')
+            job.completed_at = record.get('completed_at')
+            self.jobs[job.job_id] = job
+            self.next_id = max(self.next_id, job.job_id + 1)
+
+    def start(self, config: dict) -> ExtractionJob:
+        with self.lock:
+            if self.pool is None:
+                self.start_pool()
+            job_id = self.next_id
+            self.next_id += 1
+            job = ExtractionJob(job_id, config, os.path.join(self.jobs_dir, str(job_id)))
+            job.stop_flag = self.manager.Event()
+            self.save(job)
+            store_path = self.store_path if config.get('output_type') == 'sql' else None
+            # Published only with its future set, so stop() and the listener never see a job without one
+            job.future = self.pool.submit(run_extraction_job, job_id, config, job.output_dir, job.stop_flag,
+                                          self.events, store_path)
+            self.jobs[job_id] = job
+        # Outside the lock: finish() takes it, and runs right away if the job is already done
+        job.future.add_done_callback(lambda future: self.finish(job, future))
+        return job
+
+    def stop(self, job_id: int) -> Optional[ExtractionJob]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if not job.finished:
+            job.stop_flag.set()
+            # A job still waiting for a worker is dropped; its done callback marks it stopped
+            job.future.cancel()
+        return job
+
+    def get(self, job_id: int) -> Optional[ExtractionJob]:
+        return self.jobs.get(job_id)
+
+    def list(self) -> List[ExtractionJob]:
+        return [self.jobs[job_id] for job_id in sorted(self.jobs)]
+
+    def listen(self):
+        while True:
+            try:
+                kind, job_id, data = self.events.get()
+            except (EOFError, OSError):
+                # The manager process has shut down
+                return
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                if job.finished and kind in ('progress', 'metrics', 'status'):
+                    # Stale: finish() has already recorded the final state
+                    continue
+                if kind == 'log':
+                    job.logs.append(data)
+                    job.events.append('log', {'message': data})
+                elif kind == 'progress':
+                    job.progress = data
+                    job.events.append('progress', {**data, 'percent': job.percent_done()})
+                elif kind == 'metrics':
+                    job.metrics = data
+                elif kind == 'status':
+                    job.status = data
+                    job.events.append('status', {'status': data, 'error': None})
+                elif kind == 'nodes':
+                    job.events.append('nodes', data)
+                elif kind == 'finished':
+                    if job.progress:
+                        job.events.append('progress', {**job.progress, 'percent': job.percent_done()})
+                    job.events.append('status', {'status': job.status, 'error': job.error})
+                    job.events.close()
+
+    def finish(self, job: ExtractionJob, future):
+        with self.lock:
+            if future.cancelled():
+                job.status, job.error = 'stopped', None
+            elif future.exception() is not None:
+                # The worker process died before it could report
+                job.status, job.error = 'failed', str(future.exception())
+            else:
+                result = future.result()
+                job.status, job.error = result['status'], result['error']
+                if result['progress']:
+                    job.progress = result['progress']
+                if result['metrics']:
+                    job.metrics = result['metrics']
+            job.completed_at = datetime.now().isoformat(timespec='seconds')
+        self.save(job)
+        # Queued behind everything the worker sent, so stream readers get all
+        # of its nodes and log lines before the final status
+        self.events.put(('finished', job.job_id, None))
+
+    def save(self, job: ExtractionJob):
+        os.makedirs(job.output_dir, exist_ok=True)
+        with open(os.path.join(job.output_dir, 'job.json'), 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def shutdown(self):
+        if self.pool is None:
+            return
+        for job in self.jobs.values():
+            if not job.finished:
+                job.stop_flag.set()
+        self.pool.shutdown(wait=True)
+        self.manager.shutdown()
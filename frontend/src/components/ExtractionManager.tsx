@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { Play, Square, Database, FileText, Settings } from 'lucide-react';
 import type { ExtractionConfig } from '../types';
 import apiService from '../services/api';
@@ -14,33 +14,38 @@ const ExtractionManager = () => {
   const [currentSession, setCurrentSession] = useState<number | null>(null);
   const [logs, setLogs] = useState<string[]>([]);
   const [progress, setProgress] = useState(0);
+  const [nodesFound, setNodesFound] = useState(0);
+  const eventsRef = useRef<EventSource | null>(null);
+
+  // Close the event stream when leaving the page
+  useEffect(() => () => eventsRef.current?.close(), []);
 
   const handleStartExtraction = async () => {
     setIsExtracting(true);
     setLogs([]);
     setProgress(0);
+    setNodesFound(0);
+    eventsRef.current?.close();
     
     try {
       const result = await apiService.startExtraction(config);
       setCurrentSession(result.session_id);
       setLogs(prev => [...prev, `Started extraction session ${result.session_id}`]);
       
-      // Poll for status updates
-      const pollInterval = setInterval(async () => {
-        try {
-          const status = await apiService.getExtractionStatus(result.session_id);
-          setProgress(status.progress);
-          setLogs(prev => [...prev, `Progress: ${status.progress}% - ${status.status}`]);
-          
-          if (status.status === 'completed' || status.status === 'failed') {
-            clearInterval(pollInterval);
+      // Follow the extraction as the server pushes its events
+      const events = apiService.streamExtraction(result.session_id, {
+        onLog: (message) => setLogs(prev => [...prev, message]),
+        onProgress: (update) => setProgress(update.percent),
+        onNodes: (nodes) => setNodesFound(prev => prev + nodes.length),
+        onStatus: (status, error) => {
+          if (status === 'completed' || status === 'failed' || status === 'stopped') {
+            if (status === 'completed') setProgress(100);
             setIsExtracting(false);
-            setLogs(prev => [...prev, `Extraction ${status.status}`]);
+            setLogs(prev => [...prev, `Extraction ${status}${error ? `: ${error}` : ''}`]);
           }
-        } catch (error) {
-          console.error('Failed to get status:', error);
-        }
-      }, 2000);
+        },
+      });
+      eventsRef.current = events;
       
     } catch (error) {
       console.error('Failed to start extraction:', error);
@@ -175,7 +180,7 @@ const ExtractionManager = () => {
           {isExtracting && (
             <div className="mb-4">
               <div className="flex justify-between text-sm text-gray-600 mb-2">
-                <span>Progress</span>
+                <span>Progress ({nodesFound} nodes found)</span>
                 <span>{progress}%</span>
               </div>
               <div className="w-full bg-gray-200 rounded-full h-2">
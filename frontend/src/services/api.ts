@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Node, Session, SessionSummary, NetworkData, ExtractionConfig } from '../types';
+import type { Node, Session, SessionSummary, NetworkData, ExtractionConfig, NodePage, NodePageParams, ExtractionStatus, ExtractionProgress, StreamedNode } from '../types';
 
 const API_BASE_URL = '/api';
 
@@ -10,6 +10,13 @@ const api = axios.create({
   },
 });
 
+export interface ExtractionEventHandlers {
+  onLog?: (message: string) => void;
+  onProgress?: (progress: ExtractionProgress) => void;
+  onNodes?: (nodes: StreamedNode[]) => void;
+  onStatus?: (status: ExtractionStatus['status'], error: string | null) => void;
+}
+
 export const apiService = {
   // Sessions
   async getSessions(): Promise<Session[]> {
@@ -27,6 +34,14 @@ export const apiService = {
     return response.data;
   },
 
+  // One page of nodes; pass the returned nextCursor back to get the following page
+  async getSessionNodesPage(sessionId: number, params: NodePageParams = {}): Promise<NodePage> {
+    const response = await api.get(`/sessions/${sessionId}/nodes`, {
+      params: { limit: 500, ...params, fields: params.fields?.join(',') },
+    });
+    return { nodes: response.data, nextCursor: response.headers['x-next-cursor'] ?? null };
+  },
+
   // Network data
   async getNetworkData(sessionId: number): Promise<NetworkData> {
     const response = await api.get(`/sessions/${sessionId}/network`);
@@ -34,8 +49,8 @@ export const apiService = {
   },
 
   // Node expansion
-  async expandNode(sessionId: number, nodeId: string): Promise<NetworkData> {
-    const response = await api.post(`/sessions/${sessionId}/nodes/${nodeId}/expand`);
+  async expandNode(sessionId: number, nodeId: string, depth: number = 1): Promise<NetworkData> {
+    const response = await api.post(`/sessions/${sessionId}/nodes/${nodeId}/expand`, null, { params: { depth } });
     return response.data;
   },
 
@@ -49,8 +64,24 @@ export const apiService = {
     await api.post(`/extract/${sessionId}/stop`);
   },
 
+  // Live extraction events (server-sent); the stream ends after the final status
+  streamExtraction(sessionId: number, handlers: ExtractionEventHandlers): EventSource {
+    const source = new EventSource(`${API_BASE_URL}/extract/${sessionId}/events`);
+    source.addEventListener('log', (event) => handlers.onLog?.(JSON.parse((event as MessageEvent).data).message));
+    source.addEventListener('progress', (event) => handlers.onProgress?.(JSON.parse((event as MessageEvent).data)));
+    source.addEventListener('nodes', (event) => handlers.onNodes?.(JSON.parse((event as MessageEvent).data)));
+    source.addEventListener('status', (event) => {
+      const { status, error } = JSON.parse((event as MessageEvent).data);
+      handlers.onStatus?.(status, error);
+      if (status === 'completed' || status === 'failed' || status === 'stopped') {
+        source.close();
+      }
+    });
+    return source;
+  },
+
   // Status
-  async getExtractionStatus(sessionId: number): Promise<{ status: string; progress: number }> {
+  async getExtractionStatus(sessionId: number): Promise<ExtractionStatus> {
     const response = await api.get(`/extract/${sessionId}/status`);
     return response.data;
   },
@@ -14,6 +14,19 @@ export interface Node {
   updated_at: string;
 }
 
+export interface NodePageParams {
+  limit?: number;
+  cursor?: string;
+  fields?: (keyof Node | 'id' | 'name')[];
+  node_type?: 'Event' | 'Person';
+  degree?: number;
+}
+
+export interface NodePage {
+  nodes: Partial<Node>[];
+  nextCursor: string | null;
+}
+
 export interface Session {
   id: number;
   session_name: string;
@@ -61,4 +74,41 @@ export interface ExtractionConfig {
   output_type: 'sql' | 'csv';
   seed_url: string;
   max_degree: number;
-} 
\ No newline at end of file
+}
+
+export interface ExtractionStatus {
+  status: 'queued' | 'running' | 'completed' | 'stopped' | 'failed';
+  progress: number;
+  message: string;
+  degree?: number;
+  max_degree?: number;
+  pages_fetched?: number;
+  cache_hits?: number;
+  nodes?: number;
+  nodes_per_degree?: Record<number, number>;
+  queue_depth?: number;
+  fetch_rate?: number;
+}
+
+export interface ExtractionProgress {
+  degree: number;
+  max_degree: number;
+  nodes: number;
+  nodes_per_degree: Record<number, number>;
+  pages_fetched: number;
+  cache_hits: number;
+  queue_depth: number;
+  fetch_rate: number;
+  percent: number;
+}
+
+export interface StreamedNode {
+  title: string;
+  url: string;
+  node_type: 'Event' | 'Person';
+  degree: number;
+  parent_url: string | null;
+  description: string;
+  start_date: string;
+  end_date: string;
+}
@@ -0,0 +1,237 @@
+import time
+import random
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.util import Retry, make_headers
+from instrumentation import CrawlMetrics
+
+# Responses that mean the server is throttling or failing: retried, and counted by the circuit breaker
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Of those, the ones that say the whole host is busy rather than that the request itself failed
+THROTTLE_STATUSES = (429, 503)
+
+@dataclass
+class HttpConfig:
+    """Settings of the crawl's HTTP layer"""
+    timeout: float = 10.0  # seconds to connect and between bytes of the response
+    pool_size: Optional[int] = None  # connections kept alive per host; default max(10, workers)
+    retries: int = 5  # retries of a request after errors and RETRY_STATUSES responses
+    backoff_factor: float = 0.5  # backoff before retry n is about backoff_factor * 2 ** (n - 1) seconds
+    backoff_max: float = 30.0
+    retry_after_max: float = 120.0  # longest Retry-After the crawl will wait for
+    breaker_threshold: int = 5  # consecutive failed requests to a host that open its circuit
+    breaker_cooldown: float = 30.0  # seconds an open circuit holds requests back
+    max_outage: float = 600.0  # seconds a request keeps being resent while its host keeps failing
+    max_resends: int = 20  # resends of one request after its retries are used up
+
+class CrawlRetry(Retry):
+    """urllib3 Retry with jittered backoff, a cap on Retry-After and retries counted in metrics.
+
+    Jitter spreads out the workers that hit the same throttled host at once.
+    """
+    metrics: Optional[CrawlMetrics] = None
+    max_retry_after: float = 120.0
+
+    def new(self, **kwargs):
+        # Retry copies itself on every attempt, keeping only its constructor arguments
+        retry = super().new(**kwargs)
+        retry.metrics = self.metrics
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_retry_after)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        if self.metrics:
+            self.metrics.count('retries')
+        return retry
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After threshold consecutive failures (connection errors, timeouts or
+    RETRY_STATUSES once retries are used up) a host's circuit opens and
+    wait() holds its requests back for cooldown seconds. Then one request
+    goes through as a trial: success closes the circuit, failure opens it
+    for another cooldown. With send_until_settled, requests that failed are
+    sent again once the breaker lets them through, so a struggling server
+    costs time but no pages. A host counts as failing from its first failed
+    request until any request to it succeeds (see outage_start).
+    """
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, metrics: Optional[CrawlMetrics] = None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.metrics = metrics
+        self.failures: Dict[str, int] = {}
+        # Hosts with an open circuit, and when their next trial request may go
+        self.open_until: Dict[str, float] = {}
+        # Failing hosts, and when their first failure since the last success was recorded
+        self.failing_since: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url: str, stop_flag=None) -> bool:
+        """Block while the host's circuit is open; returns False if stopped while waiting"""
+        host = urlparse(url).netloc
+        while True:
+            with self.lock:
+                until = self.open_until.get(host)
+                if until is None:
+                    return True
+                now = time.monotonic()
+                if now >= until:
+                    # Half-open: this request is the trial, the rest wait another cooldown
+                    self.open_until[host] = now + self.cooldown
+                    return True
+                wait = until - now
+            if stop_flag and stop_flag.is_set():
+                return False
+            # Sleep in short slices so a stop request is noticed promptly
+            time.sleep(min(wait, 0.25))
+
+    def record(self, url: str, ok: bool):
+        host = urlparse(url).netloc
+        with self.lock:
+            if ok:
+                self.failures.pop(host, None)
+                self.open_until.pop(host, None)
+                self.failing_since.pop(host, None)
+                return
+            self.failing_since.setdefault(host, time.monotonic())
+            failures = self.failures.get(host, 0) + 1
+            if failures < self.threshold and host not in self.open_until:
+                self.failures[host] = failures
+                return
+            self.failures.pop(host, None)
+            self.open_until[host] = time.monotonic() + self.cooldown
+        if self.metrics:
+            self.metrics.count('circuit_opened')
+
+    def outage_start(self, url: str) -> Optional[float]:
+        """When the url's host started failing (time.monotonic()), or None if its last request succeeded"""
+        with self.lock:
+            return self.failing_since.get(urlparse(url).netloc)
+
+def send_until_settled(send: Callable[[], Optional[requests.Response]], url: str,
+                       breaker: Optional[CircuitBreaker], max_outage: float, stop_flag=None,
+                       max_resends: int = 20) -> Optional[requests.Response]:
+    """Call send() until the request neither fails to connect nor gets a RETRY_STATUSES response.
+
+    send() makes one request, with the session's own retries; it returns
+    None when it was stopped before sending. Once those retries are used
+    up, the request waits for the host's circuit breaker and is sent
+    again. A 500, 502 or 504 is only resent while the host has been
+    failing throughout: if any other request to it succeeded in the
+    meantime, the fault is in this URL. Throttling (THROTTLE_STATUSES)
+    and connection errors are resent either way. The last response is
+    returned (or the error re-raised) once the request is given up on,
+    stop_flag is set, the host has been failing for max_outage seconds,
+    or after max_resends resends.
+    """
+    first_outage, resends = None, 0
+
+    def resend(throttled: bool) -> bool:
+        nonlocal first_outage, resends
+        if not breaker or resends >= max_resends:
+            return False
+        since = breaker.outage_start(url)
+        if first_outage is None:
+            first_outage = since
+        if not throttled and (since is None or since != first_outage):
+            return False
+        if since is not None and time.monotonic() - since >= max_outage:
+            return False
+        if not breaker.wait(url, stop_flag) or (stop_flag and stop_flag.is_set()):
+            return False
+        resends += 1
+        if breaker.metrics:
+            breaker.metrics.count('resends')
+        return True
+
+    while True:
+        try:
+            response = send()
+        except (requests.ConnectionError, requests.Timeout):
+            if resend(True):
+                continue
+            raise
+        if (response is None or response.status_code not in RETRY_STATUSES
+                or not resend(response.status_code in THROTTLE_STATUSES)):
+            return response
+
+class TimedConnectionMixin:
+    """Times the whole setup of each new connection"""
+    metrics: CrawlMetrics = None
+
+    def connect(self):
+        # Includes the DNS lookup and, for https, the TLS handshake
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            self.metrics.observe('connect_seconds', time.perf_counter() - start)
+            self.metrics.count('connections')
+
+class CrawlAdapter(HTTPAdapter):
+    """requests transport adapter of the crawl.
+
+    Its connection pools record into a CrawlMetrics, and every request's
+    outcome, after retries, is reported to the circuit breaker.
+    """
+    __attrs__ = HTTPAdapter.__attrs__ + ['metrics', 'breaker']
+
+    def __init__(self, metrics: CrawlMetrics, breaker: Optional[CircuitBreaker] = None, **kwargs):
+        self.metrics = metrics
+        self.breaker = breaker
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attributes = {'metrics': self.metrics}
+        http = type('TimedHTTPConnection', (TimedConnectionMixin, HTTPConnection), attributes)
+        https = type('TimedHTTPSConnection', (TimedConnectionMixin, HTTPSConnection), attributes)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {'ConnectionCls': http}),
+            'https': type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {'ConnectionCls': https}),
+        }
+
+    def send(self, request, *args, **kwargs):
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.RequestException:
+            if self.breaker:
+                self.breaker.record(request.url, False)
+            raise
+        if self.breaker:
+            self.breaker.record(request.url, response.status_code not in RETRY_STATUSES)
+        return response
+
+def new_session(config: HttpConfig, metrics: CrawlMetrics, breaker: Optional[CircuitBreaker] = None,
+                workers: int = 1) -> requests.Session:
+    """A requests session with keep-alive pools sized for workers, compression and retries"""
+    retry = CrawlRetry(total=config.retries, backoff_factor=config.backoff_factor, backoff_max=config.backoff_max,
+                       status_forcelist=RETRY_STATUSES, allowed_methods=frozenset({'GET', 'HEAD'}),
+                       raise_on_status=False)
+    retry.metrics = metrics
+    retry.max_retry_after = config.retry_after_max
+    # One kept-alive connection per worker, so concurrent fetches never open and discard extra ones
+    pool_size = config.pool_size or max(DEFAULT_POOLSIZE, workers)
+    adapter = CrawlAdapter(metrics, breaker, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # gzip and deflate always; br and zstd when brotli / zstandard are installed for urllib3 to decode them
+    session.headers['Accept-Encoding'] = make_headers(accept_encoding=True)['accept-encoding']
+    return session
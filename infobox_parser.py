@@ -0,0 +1,137 @@
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from url_index import title_from_href
+
+# Rows whose links are followed by the crawl, keyed by their exact header
+LINK_SECTIONS = ('Commanders and leaders', 'Battles/wars')
+
+START_DATE_HEADERS = ('born', 'start date', 'started', 'begin', 'birth')
+END_DATE_HEADERS = ('died', 'end date', 'ended', 'death')
+# Headers holding a whole period, split into start and end date
+RANGE_HEADERS = ('date',)
+
+# Footnote marks ([1], [a], [citation needed]) and a trailing duration ("(3 years, 1 month)")
+FOOTNOTE = re.compile(r'\[[^\]]*\]')
+DURATION = re.compile(r'\([^()]*\)$')
+# En dash, em dash or a spaced hyphen; a bare hyphen is left alone so ISO dates stay whole
+RANGE_DASH = re.compile(r'\s*[–—]\s*|\s+-\s+')
+# get_text(strip=True) glues "17" and "September" together; ordinals and decades ("3rd", "1960s") stay whole
+DIGIT_LETTER = re.compile(r'(\d)(?!(?:s|st|nd|rd|th)\b)([^\W\d_])')
+# "1941–45": an end year abbreviated to its last two digits, completed from the start's year
+SHORT_YEAR = re.compile(r'^\d{2}$')
+START_YEAR = re.compile(r'(?<!\d)(\d{2})(\d{2})$')
+YEAR_SUFFIX = re.compile(r',?\s*\d{3,4}(?:\s*(?:BC|BCE|AD|CE))?$')
+LEADING_DAY = re.compile(r'^\d{1,2}(?=\s)')
+DAY_ONLY = re.compile(r'^\d{1,2}$')
+MONTH_PREFIX = re.compile(r'^([^\W\d_]+)\s+\d')
+DAY_COMMA_YEAR = re.compile(r'^\d{1,2},\s*\d{3,4}')
+
+def split_date_range(text: str) -> Tuple[str, str]:
+    """Split an infobox period into (start, end), filling in what one side leaves implicit.
+
+    "8–16 November 1942" gives ("8 November 1942", "16 November 1942") and
+    "February 19–24, 1943" gives ("February 19, 1943", "February 24, 1943").
+    "1941–45" gives ("1941", "1945"). Text without a range is returned
+    unchanged as the start.
+    """
+    cleaned = DURATION.sub('', FOOTNOTE.sub('', text).replace('\xa0', ' ')).strip()
+    parts = RANGE_DASH.split(cleaned, maxsplit=1)
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        return text, ''
+    start, end = (DIGIT_LETTER.sub(r'\1 \2', part).strip() for part in parts)
+    start_year = START_YEAR.search(start)
+    if start_year and SHORT_YEAR.match(end):
+        century, year = int(start_year.group(1)), int(start_year.group(2))
+        # "1998–03" ends in the next century
+        end = f"{century + (int(end) < year)}{end}"
+    month = MONTH_PREFIX.match(start)
+    if month and DAY_COMMA_YEAR.match(end):
+        # "February 19–24, 1943": the end borrows the month
+        end = f"{month.group(1)} {end}"
+    year = YEAR_SUFFIX.search(end)
+    if DAY_ONLY.match(start) and not DAY_ONLY.match(end):
+        # "8–16 November 1942": the start borrows month and year
+        start += LEADING_DAY.sub('', end, count=1)
+    elif year and not YEAR_SUFFIX.search(start):
+        # "9 July – 17 August 1943": the start borrows the year
+        suffix = year.group(0)
+        start += suffix if suffix.startswith(',') else ' ' + suffix.strip()
+    return start, end
+
+def set_start(infobox_data: dict, text: str):
+    infobox_data['start_date'] = text
+
+def set_end(infobox_data: dict, text: str):
+    infobox_data['end_date'] = text
+
+def set_range(infobox_data: dict, text: str):
+    start, end = split_date_range(text)
+    infobox_data['start_date'] = start
+    if end:
+        infobox_data['end_date'] = end
+
+# Lower-cased header -> what to do with the row's text; other headers go to metadata
+HEADER_HANDLERS: Dict[str, Callable[[dict, str], None]] = {
+    **{header: set_start for header in START_DATE_HEADERS},
+    **{header: set_end for header in END_DATE_HEADERS},
+    **{header: set_range for header in RANGE_HEADERS},
+}
+
+def section_links(td) -> Tuple[List[str], List[str]]:
+    """Link texts of the article links in a link section's cell, in order, and the canonical titles they point to"""
+    values, targets = [], []
+    for link in td.find_all('a'):
+        href = link.get('href')
+        if href and href.startswith('/wiki/'):
+            title = link.get_text(strip=True)
+            if title:
+                values.append(title)
+                targets.append(title_from_href(href) or title)
+    return values, targets
+
+def set_links(infobox_data: dict, section: str, td):
+    values, targets = section_links(td)
+    if values:
+        infobox_data[section] = values
+        infobox_data.setdefault('link_titles', {})[section] = targets
+
+def parse_infobox(soup) -> Dict[str, any]:
+    """Description, dates, metadata and link sections of a page's infobox, in one pass over its rows"""
+    infobox = soup.find('table', class_='infobox')
+    if not infobox:
+        return {}
+    infobox_data = {'description': ''}
+    caption = infobox.find('caption')
+    description: Optional[str] = caption.get_text(strip=True) if caption else None
+    metadata = {}
+    # Set by a link section header without its own cell; the links are in the next row
+    pending_section = None
+    for row in infobox.find_all('tr'):
+        th = row.find('th')
+        td = row.find('td')
+        if pending_section is not None:
+            if td:
+                set_links(infobox_data, pending_section, td)
+            pending_section = None
+        if not th:
+            # Description: from caption or first summary row
+            if description is None and td:
+                description = td.get_text(strip=True)
+            continue
+        header_text = th.get_text(strip=True)
+        if header_text in LINK_SECTIONS:
+            if td:
+                set_links(infobox_data, header_text, td)
+            else:
+                pending_section = header_text
+            continue
+        if not td:
+            continue
+        handler = HEADER_HANDLERS.get(header_text.lower())
+        if handler:
+            handler(infobox_data, td.get_text(strip=True))
+        else:
+            metadata[header_text] = td.get_text(strip=True)
+    infobox_data['description'] = description or ''
+    infobox_data['metadata'] = metadata
+    return infobox_data
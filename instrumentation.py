@@ -0,0 +1,206 @@
+import sys
+import json
+import time
+import atexit
+import logging
+import weakref
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Upper bounds (seconds) of the histogram buckets, from sub-millisecond parses to slow fetches
+TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = 'wikipedia_extractor'
+# Counters that go down as well as up; exported as gauges
+GAUGES = ('queue_depth',)
+
+LOG_LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO, 'warning': logging.WARNING, 'error': logging.ERROR}
+
+class Histogram:
+    """Bucketed distribution of observed values, Prometheus style (value <= bucket bound)"""
+    def __init__(self, buckets=TIME_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given quantile (the max for the overflow bucket)"""
+        rank, seen = fraction * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[repr(bound)] = cumulative
+        buckets['+Inf'] = self.count
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': buckets,
+        }
+
+class CrawlMetrics:
+    """Thread-safe counters and timing histograms of one extractor.
+
+    Counters: pages_fetched, cache_hits, fetches_saved, pages_reused,
+    queue_depth (a gauge), bytes_downloaded, connections, fetch_errors,
+    retries, resends and circuit_opened. Histograms (seconds): connect_seconds
+    per new connection (DNS lookup included), request_seconds (request sent until response headers),
+    transfer_seconds (reading the body), and parse_seconds,
+    infobox_seconds and classify_seconds per page.
+    """
+    def __init__(self):
+        self.counters: Dict[str, float] = {'pages_fetched': 0, 'cache_hits': 0, 'fetches_saved': 0,
+                                           'pages_reused': 0, 'queue_depth': 0, 'bytes_downloaded': 0,
+                                           'connections': 0, 'fetch_errors': 0, 'retries': 0}
+        self.histograms: Dict[str, Histogram] = {}
+        self.lock = threading.Lock()
+
+    def count(self, name: str, amount: float = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Observe the time spent in the with block under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def record_response(self, response, seconds: float):
+        """Time and size of a finished requests response that took seconds in total"""
+        waited = response.elapsed.total_seconds()
+        raw = getattr(response, 'raw', None)
+        # Bytes as they came over the wire (compressed, if the server compressed them)
+        size = raw.tell() if raw is not None and hasattr(raw, 'tell') else 0
+        with self.lock:
+            self.counters['bytes_downloaded'] += size or len(response.content)
+        self.observe('request_seconds', waited)
+        self.observe('transfer_seconds', max(0.0, seconds - waited))
+
+    def counter_values(self) -> Dict[str, float]:
+        with self.lock:
+            return dict(self.counters)
+
+    def snapshot(self) -> dict:
+        """JSON-serializable copy of every counter and histogram"""
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+            }
+
+def prometheus_text(snapshot: dict, labels: Optional[Dict[str, str]] = None) -> str:
+    """Render a CrawlMetrics snapshot in the Prometheus text exposition format"""
+    label_text = ','.join(f'{key}="{value}"' for key, value in (labels or {}).items())
+
+    def series(name, value, extra=''):
+        inner = ','.join(part for part in (label_text, extra) if part)
+        return f"{name}{{{inner}}} {value}" if inner else f"{name} {value}"
+
+    lines: List[str] = []
+    for name, value in sorted(snapshot.get('counters', {}).items()):
+        if name in GAUGES:
+            metric, kind = f"{METRIC_PREFIX}_{name}", 'gauge'
+        else:
+            metric, kind = f"{METRIC_PREFIX}_{name}_total", 'counter'
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(series(metric, value))
+    for name, histogram in sorted(snapshot.get('histograms', {}).items()):
+        metric = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# TYPE {metric} histogram")
+        for bound, count in histogram['buckets'].items():
+            lines.append(series(f"{metric}_bucket", count, f'le="{bound}"'))
+        lines.append(series(f"{metric}_sum", histogram['sum']))
+        lines.append(series(f"{metric}_count", histogram['count']))
+    return '\n'.join(lines) + '\n'
+
+def write_metrics(path: str, snapshot: dict):
+    """Save a snapshot as Prometheus text (.prom or .txt) or as JSON (anything else)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith(('.prom', '.txt')):
+            f.write(prometheus_text(snapshot))
+        else:
+            json.dump(snapshot, f, indent=2)
+            f.write('\n')
+
+# Every StatusLog still alive, flushed by the one atexit handler below
+_status_logs: 'weakref.WeakSet[StatusLog]' = weakref.WeakSet()
+
+@atexit.register
+def _flush_status_logs():
+    for status_log in list(_status_logs):
+        status_log.flush()
+
+class StatusLog:
+    """Level-gated status lines, written to stdout in batches by a background thread.
+
+    Crawl threads only append to a list; the writer thread flushes it every
+    flush_interval seconds, so a slow terminal never holds up a fetch.
+    Lines still queued are flushed by flush() and at interpreter exit.
+    """
+    def __init__(self, level: int = logging.INFO, flush_interval: float = 0.25):
+        self.level = level
+        self.flush_interval = flush_interval
+        self.lines: List[str] = []
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.writer: Optional[threading.Thread] = None
+        _status_logs.add(self)
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def write(self, line: str):
+        with self.lock:
+            self.lines.append(line)
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.run, name='status-log', daemon=True)
+                self.writer.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            with self.lock:
+                # Idle: the next write starts a new writer
+                if not self.lines:
+                    self.writer = None
+                    return
+
+    def flush(self):
+        # write_lock keeps batches in order when flush() races the writer thread
+        with self.write_lock:
+            with self.lock:
+                lines, self.lines = self.lines, []
+            if lines:
+                sys.stdout.write('\n'.join(lines) + '\n')
+                sys.stdout.flush()
@@ -0,0 +1,265 @@
+import re
+import time
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+from infobox_parser import split_date_range
+
+# The Action API accepts at most 50 titles per query for regular clients
+MAX_TITLES_PER_QUERY = 50
+
+WIKILINK = re.compile(r'\[\[([^\[\]|#]+)(?:#[^\[\]|]*)?(?:\|([^\[\]]*))?\]\]')
+REF = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.S)
+COMMENT = re.compile(r'<!--.*?-->', re.S)
+HTML_TAG = re.compile(r'<[^>]+>')
+# Templates whose positional arguments are a date: {{birth date|1884|5|8}}
+DATE_TEMPLATE = re.compile(r'\{\{\s*(?:birth|death|start|end)[ _]date(?:[ _]and[ _]age)?\s*\|([^{}]*)\}\}', re.I)
+TEMPLATE = re.compile(r'\{\{([^{}|]*)((?:\|[^{}]*)?)\}\}')
+# Templates that wrap display text; their positional arguments are kept
+TEXT_TEMPLATES = {'flag', 'flagicon', 'flagcountry', 'flagu', 'plainlist', 'plain list', 'ubl',
+                  'unbulleted list', 'hlist', 'flatlist', 'nowrap', 'small', 'nobr', 'lang'}
+
+# Infobox parameters that hold the dates and traversal links, mirroring the
+# HTML infobox rows the extractor reads
+START_DATE_PARAMS = ('birth_date', 'start_date', 'began')
+# Split into start and end date, like the infobox's Date row
+RANGE_PARAMS = ('date',)
+END_DATE_PARAMS = ('death_date', 'end_date', 'ended')
+LINK_SECTIONS = {'commander': 'Commanders and leaders', 'battles': 'Battles/wars'}
+SKIPPED_PARAMS = {'name', 'conflict', 'partof', 'image', 'image_size', 'alt', 'caption', 'signature',
+                  'signature_alt', 'module', 'embed'}
+
+def title_from_url(url: str) -> str:
+    """Turn a /wiki/ URL into the page title it refers to"""
+    path = urlparse(url).path
+    return unquote(path.split('/wiki/', 1)[-1]).replace('_', ' ')
+
+def find_infobox(wikitext: str) -> Optional[str]:
+    """Return the body of the first {{Infobox ...}} template in the wikitext"""
+    match = re.search(r'\{\{\s*Infobox', wikitext, re.I)
+    if not match:
+        return None
+    depth, i = 0, match.start()
+    while i < len(wikitext) - 1:
+        pair = wikitext[i:i + 2]
+        if pair == '{{':
+            depth += 1
+            i += 2
+        elif pair == '}}':
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return wikitext[match.start() + 2:i - 2]
+        else:
+            i += 1
+    return None
+
+def split_params(body: str) -> Dict[str, str]:
+    """Split a template body into its named parameters"""
+    params, parts, current, depth = {}, [], [], 0
+    i = 0
+    while i < len(body):
+        pair = body[i:i + 2]
+        if pair in ('{{', '[['):
+            depth += 1
+            current.append(pair)
+            i += 2
+        elif pair in ('}}', ']]'):
+            depth -= 1
+            current.append(pair)
+            i += 2
+        elif body[i] == '|' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            i += 1
+        else:
+            current.append(body[i])
+            i += 1
+    parts.append(''.join(current))
+    for part in parts[1:]:  # parts[0] is the template name
+        if '=' in part:
+            name, value = part.split('=', 1)
+            params[name.strip().lower()] = value.strip()
+    return params
+
+def _render_template(match) -> str:
+    name = match.group(1).strip().lower()
+    if name not in TEXT_TEMPLATES:
+        return ''
+    args = [arg.strip() for arg in match.group(2).split('|')[1:] if '=' not in arg]
+    # The lang template's first argument is the language code
+    return ' '.join(args[1:] if name == 'lang' else args)
+
+def _render_date(match) -> str:
+    # {{death date and age|1970|1|1|1900|1|1}}: only the first date is the value
+    args = [arg.strip() for arg in match.group(1).split('|') if '=' not in arg]
+    return '-'.join(args[:3])
+
+def strip_markup(value: str) -> str:
+    """Reduce a wikitext value to plain text"""
+    value = COMMENT.sub('', value)
+    value = REF.sub('', value)
+    value = DATE_TEMPLATE.sub(_render_date, value)
+    value = WIKILINK.sub(lambda m: m.group(2) if m.group(2) is not None else m.group(1), value)
+    # Innermost templates first, until none are left
+    previous = None
+    while previous != value:
+        previous = value
+        value = TEMPLATE.sub(_render_template, value)
+    value = HTML_TAG.sub(' ', value)
+    value = re.sub(r'^\s*[*#]\s*', '', value, flags=re.M)
+    return re.sub(r'\s+', ' ', value).strip()
+
+def link_targets(value: str) -> List[str]:
+    """Page titles linked from a wikitext value, in order"""
+    value = REF.sub('', COMMENT.sub('', value))
+    titles = []
+    for match in WIKILINK.finditer(value):
+        title = match.group(1).strip().replace('_', ' ')
+        if title and ':' not in title:
+            titles.append(title[0].upper() + title[1:])
+    return titles
+
+def infobox_from_wikitext(wikitext: str) -> Dict[str, any]:
+    """Build the same infobox dict extract_infobox_data returns, from page wikitext"""
+    infobox_data = {}
+    body = find_infobox(wikitext or '')
+    if body is None:
+        return infobox_data
+    params = split_params(body)
+    if params.get('caption'):
+        infobox_data['description'] = strip_markup(params['caption'])
+    elif params.get('partof'):
+        infobox_data['description'] = 'Part of ' + strip_markup(params['partof'])
+    else:
+        infobox_data['description'] = ''
+    metadata = {}
+    for name, value in params.items():
+        if not value:
+            continue
+        section = LINK_SECTIONS.get(name.rstrip('0123456789'))
+        if section:
+            targets = link_targets(value)
+            if targets:
+                infobox_data.setdefault(section, []).extend(targets)
+        elif name in RANGE_PARAMS:
+            start, end = split_date_range(strip_markup(value))
+            infobox_data.setdefault('start_date', start)
+            if end:
+                infobox_data.setdefault('end_date', end)
+        elif name in START_DATE_PARAMS:
+            infobox_data.setdefault('start_date', strip_markup(value))
+        elif name in END_DATE_PARAMS:
+            infobox_data.setdefault('end_date', strip_markup(value))
+        elif name not in SKIPPED_PARAMS:
+            text = strip_markup(value)
+            if text:
+                metadata[name.replace('_', ' ').capitalize()] = text
+    infobox_data['metadata'] = metadata
+    return infobox_data
+
+class MediaWikiApiClient:
+    """Batched page lookups through the MediaWiki Action API.
+
+    One query returns categories, page props, the latest revision ID and
+    wikitext for up to 50 titles, with redirects and title normalization
+    resolved by the server.
+    """
+    def __init__(self, session, api_url: str, rate_limiter=None, metrics=None):
+        self.session = session
+        self.api_url = api_url
+        self.rate_limiter = rate_limiter
+        # CrawlMetrics that request times and sizes are recorded in, if any
+        self.metrics = metrics
+
+    def request(self, params: Dict[str, str], stop_flag=None) -> Optional[dict]:
+        def send():
+            start = time.perf_counter()
+            response = self.session.get(self.api_url, params=params, timeout=30)
+            if self.metrics:
+                self.metrics.record_response(response, time.perf_counter() - start)
+            return response
+
+        # The rate limiter also waits out and resends failures (see RateLimiter.send)
+        response = self.rate_limiter.send(self.api_url, send, stop_flag) if self.rate_limiter else send()
+        if response is None:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def query(self, titles: List[str], prop: str, extra: Optional[Dict[str, str]] = None, stop_flag=None) -> Dict[str, dict]:
+        """Run a prop query for titles, following continuation and resolving redirects.
+
+        Returns a dict keyed by each requested title; pages that don't
+        exist are left out.
+        """
+        results = {}
+        for start in range(0, len(titles), MAX_TITLES_PER_QUERY):
+            batch = titles[start:start + MAX_TITLES_PER_QUERY]
+            params = {
+                'action': 'query',
+                'format': 'json',
+                'formatversion': '2',
+                'redirects': '1',
+                'prop': prop,
+                'titles': '|'.join(batch),
+            }
+            params.update(extra or {})
+            pages: Dict[str, dict] = {}
+            aliases: Dict[str, str] = {}
+            continuation: Dict[str, str] = {}
+            while True:
+                data = self.request({**params, **continuation}, stop_flag)
+                if data is None:
+                    return results
+                query = data.get('query', {})
+                for entry in query.get('normalized', []) + query.get('redirects', []):
+                    aliases[entry['from']] = entry['to']
+                for page in query.get('pages', []):
+                    merged = pages.setdefault(page['title'], {'title': page['title']})
+                    for key, value in page.items():
+                        if isinstance(value, list):
+                            merged.setdefault(key, []).extend(value)
+                        else:
+                            merged[key] = value
+                if 'continue' not in data:
+                    break
+                continuation = data['continue']
+
+            for title in batch:
+                resolved = title
+                # Follow normalization then redirect (A -> a -> B)
+                for _ in range(3):
+                    resolved = aliases.get(resolved, resolved)
+                page = pages.get(resolved)
+                if page and not page.get('missing') and not page.get('invalid'):
+                    results[title] = page
+        return results
+
+    def fetch_pages(self, titles: List[str], stop_flag=None) -> Dict[str, dict]:
+        """Fetch canonical title, categories, revision ID and wikitext for each title"""
+        pages = self.query(titles, 'categories|pageprops|revisions', {
+            'cllimit': 'max',
+            'rvprop': 'ids|content',
+            'rvslots': 'main',
+        }, stop_flag)
+        results = {}
+        for title, page in pages.items():
+            revisions = page.get('revisions') or [{}]
+            revision = revisions[-1]
+            results[title] = {
+                'title': page['title'],
+                'categories': [category['title'].split(':', 1)[-1] for category in page.get('categories', [])],
+                'pageprops': page.get('pageprops', {}),
+                'revision_id': revision.get('revid'),
+                'wikitext': revision.get('slots', {}).get('main', {}).get('content', ''),
+            }
+        return results
+
+    def latest_revisions(self, titles: List[str], stop_flag=None) -> Dict[str, dict]:
+        """Latest revision ID and timestamp of each title, without page content"""
+        pages = self.query(titles, 'revisions', {'rvprop': 'ids|timestamp'}, stop_flag)
+        results = {}
+        for title, page in pages.items():
+            revision = (page.get('revisions') or [{}])[-1]
+            results[title] = {'revision_id': revision.get('revid'), 'timestamp': revision.get('timestamp')}
+        return results
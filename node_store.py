@@ -0,0 +1,126 @@
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+class StringTable:
+    """Deduplicating string table: every distinct string is stored once and referenced by ID"""
+    def __init__(self):
+        # ID 0 is reserved for None
+        self.strings: List[Optional[str]] = [None]
+        self.ids: Dict[Optional[str], int] = {None: 0}
+
+    def add(self, value: Optional[str]) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> Optional[str]:
+        return self.strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+def split_url(url: Optional[str]):
+    """Split a URL into a shared prefix (scheme, host, /wiki/) and the page part"""
+    if url is None:
+        return None, None
+    head, sep, tail = url.partition('/wiki/')
+    if not sep:
+        return '', url
+    return head + sep, tail
+
+class NodeStore:
+    """Columnar storage for extracted nodes.
+
+    Each field is an array of integer IDs into one shared string table, so
+    repeated values (URL prefixes, node types, infobox keys and values)
+    are stored once. Metadata is kept as flat key/value ID arrays with
+    per-node offsets. Behaves like a list of node_class instances
+    (ExtractedNode): append(), len(), indexing and iteration. Nodes are
+    materialized on access, so changing a returned node does not change
+    the store.
+    """
+    def __init__(self, node_class, nodes=None):
+        self.node_class = node_class
+        self.strings = StringTable()
+        self.titles = array('I')
+        self.url_prefixes = array('I')
+        self.url_paths = array('I')
+        self.node_types = array('I')
+        self.degrees = array('H')
+        self.parent_prefixes = array('I')
+        self.parent_paths = array('I')
+        self.descriptions = array('I')
+        self.start_dates = array('I')
+        self.end_dates = array('I')
+        self.metadata_offsets = array('I', [0])
+        self.metadata_keys = array('I')
+        self.metadata_values = array('I')
+        for node in nodes or []:
+            self.append(node)
+
+    def append(self, node) -> int:
+        """Store a node and return its position"""
+        add = self.strings.add
+        self.titles.append(add(node.title))
+        prefix, path = split_url(node.url)
+        self.url_prefixes.append(add(prefix))
+        self.url_paths.append(add(path))
+        self.node_types.append(add(node.node_type))
+        self.degrees.append(node.degree)
+        prefix, path = split_url(node.parent_url)
+        self.parent_prefixes.append(add(prefix))
+        self.parent_paths.append(add(path))
+        self.descriptions.append(add(node.description))
+        self.start_dates.append(add(node.start_date))
+        self.end_dates.append(add(node.end_date))
+        for key, value in (node.metadata or {}).items():
+            self.metadata_keys.append(add(key))
+            self.metadata_values.append(add(value))
+        self.metadata_offsets.append(len(self.metadata_keys))
+        return len(self.titles) - 1
+
+    def extend(self, nodes):
+        for node in nodes:
+            self.append(node)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _url(self, prefixes: array, paths: array, i: int) -> Optional[str]:
+        if not paths[i]:
+            return None
+        return self.strings[prefixes[i]] + self.strings[paths[i]]
+
+    def __getitem__(self, i: int):
+        if i < 0:
+            i += len(self)
+        strings = self.strings
+        start, end = self.metadata_offsets[i], self.metadata_offsets[i + 1]
+        return self.node_class(
+            title=strings[self.titles[i]],
+            url=self._url(self.url_prefixes, self.url_paths, i),
+            node_type=strings[self.node_types[i]],
+            degree=self.degrees[i],
+            parent_url=self._url(self.parent_prefixes, self.parent_paths, i),
+            description=strings[self.descriptions[i]],
+            start_date=strings[self.start_dates[i]],
+            end_date=strings[self.end_dates[i]],
+            metadata={strings[self.metadata_keys[j]]: strings[self.metadata_values[j]] for j in range(start, end)}
+        )
+
+    def __iter__(self) -> Iterator:
+        for i in range(len(self)):
+            yield self[i]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the store, including its strings"""
+        columns = (self.titles, self.url_prefixes, self.url_paths, self.node_types, self.degrees,
+                   self.parent_prefixes, self.parent_paths, self.descriptions, self.start_dates,
+                   self.end_dates, self.metadata_offsets, self.metadata_keys, self.metadata_values)
+        total = sum(sys.getsizeof(column) for column in columns)
+        total += sys.getsizeof(self.strings.strings) + sys.getsizeof(self.strings.ids)
+        total += sum(sys.getsizeof(string) for string in self.strings.strings)
+        return total
@@ -0,0 +1,132 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, quote, unquote
+
+def normalize_url(url: str) -> str:
+    """Normalize a page URL so equivalent spellings share one cache entry"""
+    parts = urlsplit(url.strip())
+    path = quote(unquote(parts.path), safe="/:@!$&'()*+,;=-._~")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+@dataclass
+class CachedPage:
+    """A cached HTTP response body together with its validators"""
+    url: str
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: Optional[float]) -> bool:
+        """True if the page was fetched or revalidated less than ttl seconds ago"""
+        return ttl is not None and time.time() - self.fetched_at < ttl
+
+class PageCache:
+    """Persistent SQLite cache of fetched pages.
+
+    Entries are keyed by the SHA-256 of the normalized URL and store the
+    zlib-compressed body along with the ETag and Last-Modified headers used
+    for conditional revalidation. Once the compressed bodies exceed
+    max_bytes, the least recently used entries are evicted.
+    """
+    def __init__(self, path: str = "page_cache.sqlite3", ttl: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for url, marking it as recently used"""
+        key = self.key_for(url)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, body, etag, last_modified, fetched_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return CachedPage(row[0], zlib.decompress(row[1]), row[2], row[3], row[4])
+
+    def put(self, url: str, content: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a freshly fetched page and evict old entries if over budget"""
+        key = self.key_for(url)
+        body = zlib.compress(content)
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url), body, etag, last_modified, now, now, len(body))
+            )
+            self.total_bytes += len(body)
+            self._evict()
+            self.conn.commit()
+
+    def touch(self, url: str):
+        """Mark a cached page as revalidated (e.g. after a 304 response)"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                              (now, now, self.key_for(url)))
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        if not self.max_bytes or self.total_bytes <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self.total_bytes -= size
+
+    def load_fixtures(self, directory: str, base_url: str = "https://en.wikipedia.org") -> int:
+        """Seed the cache from saved pages named <Article_title>.html in directory.
+
+        Combined with cache-only mode this replays a crawl fully offline.
+        """
+        count = 0
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.html'):
+                continue
+            with open(os.path.join(directory, name), 'rb') as f:
+                self.put(f"{base_url}/wiki/{name[:-len('.html')]}", f.read())
+            count += 1
+        return count
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
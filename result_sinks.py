@@ -0,0 +1,251 @@
+import os
+import csv
+import gzip
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from session_store import SessionStore
+
+# Column layout of Nodes.csv as read by api/csv_reader.py
+NODES_CSV_FIELDS = ['node_id', 'node_type', 'name', 'description', 'start_date', 'end_date', 'metadata', 'degree']
+# Column layout of the Edges.csv file written next to it
+EDGES_CSV_FIELDS = ['source_id', 'target_id', 'relationship']
+
+def node_to_dict(node) -> dict:
+    """The JSON form of a node used by save_results and the JSONL sink"""
+    return {
+        'title': node.title,
+        'url': node.url,
+        'node_type': node.node_type,
+        'degree': node.degree,
+        'parent_url': node.parent_url,
+        'description': node.description,
+        'start_date': node.start_date,
+        'end_date': node.end_date,
+        'metadata': node.metadata
+    }
+
+def edges_path_for(path: str) -> str:
+    """Companion edges file for a nodes CSV: Nodes.csv -> Edges.csv, out.csv.gz -> out.edges.csv.gz"""
+    directory, name = os.path.split(path)
+    if name.startswith('Nodes'):
+        return os.path.join(directory, 'Edges' + name[len('Nodes'):])
+    stem, csv_ext, rest = name.partition('.csv')
+    return os.path.join(directory, f"{stem}.edges{csv_ext}{rest}")
+
+def open_output(path: str):
+    """Open a text file for writing, gzip-compressed when the name ends in .gz"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+class ResultSink:
+    """Writes nodes as soon as the crawl finalizes them.
+
+    Nodes are buffered and written in batches of batch_size, and the file
+    is flushed after every batch so other processes can tail it while the
+    crawl runs.
+    """
+    def __init__(self, path: str, batch_size: int = 100):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer: List = []
+        self.file = open_output(path)
+        self.count = 0
+
+    def write(self, node):
+        self.buffer.append(node)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.count += len(self.buffer)
+            self.buffer = []
+        self.file.flush()
+
+    def write_batch(self, nodes: List):
+        raise NotImplementedError
+
+    def write_edge(self, source_url: str, target_url: str, relationship: str):
+        """Record a relationship between two node URLs; ignored by formats without edges"""
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JsonlSink(ResultSink):
+    """One JSON object per line, in the save_results record format"""
+    def write_batch(self, nodes: List):
+        self.file.write(''.join(json.dumps(node_to_dict(node), ensure_ascii=False) + '\n' for node in nodes))
+
+class NodeIds:
+    """e1/p1 style node IDs for the nodes a sink has written, and the edges between them.
+
+    An edge is held back until both of its nodes have IDs, filed under the
+    URL of an endpoint still missing one, so assigning an ID only looks at
+    the edges waiting for that node. Edges to pages that never became
+    nodes are never written.
+    """
+    def __init__(self):
+        self.type_counts: Dict[str, int] = {}
+        self.node_ids: Dict[str, str] = {}
+        # Edges as (sequence, source_url, target_url, relationship); the sequence keeps them in the order added
+        self.waiting_edges: Dict[str, List[Tuple[int, str, str, str]]] = {}
+        self.resolved_edges: List[Tuple[int, str, str, str]] = []
+        self.seen_edges: Set[Tuple[str, str, str]] = set()
+
+    def node_id_for(self, node) -> str:
+        node_id = self.node_ids.get(node.url)
+        if node_id is None:
+            number = self.type_counts.get(node.node_type, 0) + 1
+            self.type_counts[node.node_type] = number
+            node_id = self.node_ids[node.url] = f"{node.node_type[:1].lower()}{number}"
+            for edge in self.waiting_edges.pop(node.url, ()):
+                self.file_edge(edge)
+        return node_id
+
+    def add_edge(self, source_url: str, target_url: str, relationship: str):
+        edge = (source_url, target_url, relationship)
+        if edge not in self.seen_edges:
+            self.seen_edges.add(edge)
+            self.file_edge((len(self.seen_edges), *edge))
+
+    def file_edge(self, edge: Tuple[int, str, str, str]):
+        _, source_url, target_url, _ = edge
+        missing = next((url for url in (source_url, target_url) if url not in self.node_ids), None)
+        if missing is None:
+            self.resolved_edges.append(edge)
+        else:
+            self.waiting_edges.setdefault(missing, []).append(edge)
+
+    def ready_edges(self) -> List[Tuple[str, str, str]]:
+        """(source_id, target_id, relationship) for the edges whose nodes both got IDs since the last call"""
+        ready = [(self.node_ids[source_url], self.node_ids[target_url], relationship)
+                 for _, source_url, target_url, relationship in sorted(self.resolved_edges)]
+        self.resolved_edges = []
+        return ready
+
+class CsvSink(ResultSink):
+    """Rows in the Nodes.csv layout the API reads, with e1/p1 style node IDs.
+
+    Relationships go to a companion Edges.csv (see edges_path_for) once
+    both of their nodes have been written.
+    """
+    def __init__(self, path: str, batch_size: int = 100):
+        super().__init__(path, batch_size)
+        self.writer = csv.DictWriter(self.file, fieldnames=NODES_CSV_FIELDS)
+        self.writer.writeheader()
+        self.ids = NodeIds()
+        self.edges_file = open_output(edges_path_for(path))
+        self.edges_writer = csv.DictWriter(self.edges_file, fieldnames=EDGES_CSV_FIELDS)
+        self.edges_writer.writeheader()
+
+    def write_batch(self, nodes: List):
+        self.writer.writerows({
+            'node_id': self.ids.node_id_for(node),
+            'node_type': node.node_type,
+            'name': node.title,
+            'description': node.description,
+            'start_date': node.start_date,
+            'end_date': node.end_date,
+            'metadata': json.dumps(node.metadata, ensure_ascii=False),
+            'degree': node.degree,
+        } for node in nodes)
+
+    def write_edge(self, source_url: str, target_url: str, relationship: str):
+        self.ids.add_edge(source_url, target_url, relationship)
+
+    def flush(self):
+        super().flush()
+        self.edges_writer.writerows({'source_id': source_id, 'target_id': target_id, 'relationship': relationship}
+                                    for source_id, target_id, relationship in self.ids.ready_edges())
+        self.edges_file.flush()
+
+    def close(self):
+        super().close()
+        self.edges_file.close()
+
+class SqliteSink(ResultSink):
+    """Bulk-inserts nodes and edges into one session of a SessionStore.
+
+    Each batch is a single executemany in one transaction, so the API can
+    query the session while the crawl runs. Node IDs are assigned as in
+    CsvSink. With a session_id the rows go into that session, which the
+    caller creates and finishes (see SessionStore.create_session);
+    otherwise a session named after the seed page is added with the first
+    node and marked completed when the sink is closed.
+    """
+    def __init__(self, path: str, batch_size: int = 100, session_id: Optional[int] = None,
+                 store: Optional[SessionStore] = None):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer: List = []
+        self.count = 0
+        # A store passed in belongs to the caller and stays open
+        self.owns_store = store is None
+        self.store = store or SessionStore(path)
+        self.session_id = session_id
+        self.owns_session = session_id is None
+        self.max_degree = 0
+        self.ids = NodeIds()
+
+    def write_batch(self, nodes: List):
+        if self.session_id is None:
+            self.session_id = self.store.create_session(nodes[0].title, seed_url=nodes[0].url)
+        self.store.insert_nodes(self.session_id, [(
+            self.ids.node_id_for(node),
+            node.node_type,
+            node.title,
+            node.url,
+            node.parent_url,
+            node.description,
+            node.start_date,
+            node.end_date,
+            json.dumps(node.metadata, ensure_ascii=False),
+            node.degree,
+            self.count + offset,
+        ) for offset, node in enumerate(nodes)])
+        self.max_degree = max(self.max_degree, max(node.degree for node in nodes))
+
+    def write_edge(self, source_url: str, target_url: str, relationship: str):
+        self.ids.add_edge(source_url, target_url, relationship)
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.count += len(self.buffer)
+            self.buffer = []
+        edges = self.ids.ready_edges()
+        if edges:
+            self.store.insert_edges(self.session_id, edges)
+
+    def close(self):
+        self.flush()
+        if self.owns_session and self.session_id is not None:
+            self.store.update_session(self.session_id, status='completed', max_degree=self.max_degree,
+                                      completed_at=datetime.now().isoformat(timespec='seconds'))
+        if self.owns_store:
+            self.store.close()
+
+# File names written as a SessionStore database rather than a text file
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+def open_sink(path: str, batch_size: int = 100) -> ResultSink:
+    """Pick a sink from the file name: .jsonl or .csv, optionally with .gz, or a SQLite database"""
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SqliteSink(path, batch_size)
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.jsonl'):
+        return JsonlSink(path, batch_size)
+    if name.endswith('.csv'):
+        return CsvSink(path, batch_size)
+    raise ValueError(f"Unsupported output format: {path}")
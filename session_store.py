@@ -0,0 +1,249 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SESSION_FIELDS = ['id', 'name', 'seed_url', 'max_degree', 'status', 'started_at', 'completed_at']
+NODE_FIELDS = ['node_id', 'node_type', 'name', 'url', 'parent_url', 'description',
+               'start_date', 'end_date', 'metadata', 'degree', 'position']
+
+# SQLite's default limit on bound parameters is 999
+MAX_IN_PARAMS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    seed_url TEXT,
+    max_degree INTEGER,
+    status TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    session_id INTEGER NOT NULL,
+    node_id TEXT NOT NULL,
+    node_type TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    parent_url TEXT,
+    description TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    metadata TEXT,
+    degree INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (session_id, node_id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_nodes_position ON nodes (session_id, position);
+CREATE INDEX IF NOT EXISTS idx_nodes_degree_type ON nodes (session_id, degree, node_type, position);
+CREATE TABLE IF NOT EXISTS edges (
+    session_id INTEGER NOT NULL,
+    source_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    relationship TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_edges_source ON edges (session_id, source_id);
+CREATE INDEX IF NOT EXISTS idx_edges_target ON edges (session_id, target_id);
+"""
+
+# Removes a session together with its nodes and edges
+DELETE_SESSION = [
+    "DELETE FROM edges WHERE session_id = ?",
+    "DELETE FROM nodes WHERE session_id = ?",
+    "DELETE FROM sessions WHERE id = ?",
+]
+
+def chunks(items: List, size: int = MAX_IN_PARAMS):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def placeholders(count: int) -> str:
+    return ','.join('?' * count)
+
+class SessionStore:
+    """SQLite store of crawl sessions with their nodes and edges.
+
+    Every call borrows a connection from a pool of at most pool_size,
+    opened on first need and reused after that, so API request threads
+    and extraction workers query and write concurrently without opening
+    a connection per request; WAL mode lets readers proceed while a crawl
+    is inserting. Node rows keep the order they were written in as
+    position, which is what cursors page by.
+    """
+    def __init__(self, path: str = "sessions.sqlite3", pool_size: int = 8):
+        self.path = path
+        self.pool_size = pool_size
+        self.idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self.opened = 0
+        self.lock = threading.Lock()
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def open_connection(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, one thread at a time
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent across crashes; only the last commits can be lost
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection; with pool_size in use, wait for one to be returned"""
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                can_open = self.opened < self.pool_size
+                if can_open:
+                    self.opened += 1
+            if can_open:
+                try:
+                    conn = self.open_connection()
+                except Exception:
+                    with self.lock:
+                        self.opened -= 1
+                    raise
+            else:
+                conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self.idle.put(conn)
+
+    def create_session(self, name: str, seed_url: Optional[str] = None, max_degree: Optional[int] = None,
+                       session_id: Optional[int] = None, status: str = 'running') -> int:
+        """Add a session, replacing any stored under session_id, and return its ID"""
+        with self.connection() as conn, conn:
+            if session_id is not None:
+                for statement in DELETE_SESSION:
+                    conn.execute(statement, (session_id,))
+            cursor = conn.execute(
+                "INSERT INTO sessions (id, name, seed_url, max_degree, status, started_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, name, seed_url, max_degree, status, datetime.now().isoformat(timespec='seconds')))
+        return cursor.lastrowid
+
+    def update_session(self, session_id: int, **fields):
+        unknown = set(fields) - set(SESSION_FIELDS[1:])
+        if unknown:
+            raise ValueError(f"Unknown session fields: {', '.join(sorted(unknown))}")
+        with self.connection() as conn, conn:
+            conn.execute(f"UPDATE sessions SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                         (*fields.values(), session_id))
+
+    def delete_session(self, session_id: int):
+        with self.connection() as conn, conn:
+            for statement in DELETE_SESSION:
+                conn.execute(statement, (session_id,))
+
+    def get_session(self, session_id: int) -> Optional[dict]:
+        with self.connection() as conn:
+            row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_sessions(self) -> List[dict]:
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM sessions ORDER BY id")]
+
+    def insert_nodes(self, session_id: int, rows: Iterable[tuple]):
+        """Bulk-insert node rows given as tuples in NODE_FIELDS order"""
+        with self.connection() as conn, conn:
+            conn.executemany(f"INSERT INTO nodes (session_id, {', '.join(NODE_FIELDS)}) "
+                             f"VALUES (?, {placeholders(len(NODE_FIELDS))})",
+                             ((session_id, *row) for row in rows))
+
+    def insert_edges(self, session_id: int, edges: Iterable[Tuple[str, str, str]]):
+        """Bulk-insert (source_id, target_id, relationship) edges"""
+        with self.connection() as conn, conn:
+            conn.executemany("INSERT INTO edges (session_id, source_id, target_id, relationship) VALUES (?, ?, ?, ?)",
+                             ((session_id, *edge) for edge in edges))
+
+    def node_columns(self, with_metadata: bool) -> str:
+        return ', '.join(field for field in NODE_FIELDS if with_metadata or field != 'metadata')
+
+    def get_nodes(self, session_id: int, node_ids: Iterable[str], with_metadata: bool = True) -> List[dict]:
+        """The stored rows for node_ids, in position order; unknown IDs are skipped"""
+        rows = []
+        with self.connection() as conn:
+            for chunk in chunks(list(node_ids)):
+                rows.extend(conn.execute(
+                    f"SELECT {self.node_columns(with_metadata)} FROM nodes "
+                    f"WHERE session_id = ? AND node_id IN ({placeholders(len(chunk))})", (session_id, *chunk)))
+        return [dict(row) for row in sorted(rows, key=lambda row: row['position'])]
+
+    def page_nodes(self, session_id: int, node_type: Optional[str] = None, degree: Optional[int] = None,
+                   start: int = 0, limit: Optional[int] = None, with_metadata: bool = True) -> List[dict]:
+        """Rows matching the filters with position >= start, in position order"""
+        where, params = ["session_id = ?", "position >= ?"], [session_id, start]
+        if degree is not None:
+            where.append("degree = ?")
+            params.append(degree)
+        if node_type is not None:
+            where.append("node_type = ?")
+            params.append(node_type)
+        sql = f"SELECT {self.node_columns(with_metadata)} FROM nodes WHERE {' AND '.join(where)} ORDER BY position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def node_count(self, session_id: int, node_type: Optional[str] = None) -> int:
+        if node_type is None:
+            sql, params = "SELECT COUNT(*) FROM nodes WHERE session_id = ?", (session_id,)
+        else:
+            sql, params = "SELECT COUNT(*) FROM nodes WHERE session_id = ? AND node_type = ?", (session_id, node_type)
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def degree_counts(self, session_id: int) -> Dict[int, Dict[str, int]]:
+        """Node counts per degree and type"""
+        counts: Dict[int, Dict[str, int]] = {}
+        with self.connection() as conn:
+            rows = conn.execute("SELECT degree, node_type, COUNT(*) FROM nodes WHERE session_id = ? "
+                                "GROUP BY degree, node_type ORDER BY degree", (session_id,)).fetchall()
+        for degree, node_type, count in rows:
+            counts.setdefault(degree, {'Event': 0, 'Person': 0})
+            if node_type in counts[degree]:
+                counts[degree][node_type] = count
+        return counts
+
+    def neighbors(self, session_id: int, node_ids: Iterable[str]) -> List[Tuple[str, str]]:
+        """(node_id, neighbor_id) for every edge touching node_ids, in either direction"""
+        pairs = []
+        with self.connection() as conn:
+            for chunk in chunks(list(node_ids)):
+                marks = placeholders(len(chunk))
+                pairs.extend(conn.execute(
+                    f"SELECT source_id, target_id FROM edges WHERE session_id = ? AND source_id IN ({marks}) "
+                    f"UNION ALL SELECT target_id, source_id FROM edges WHERE session_id = ? AND target_id IN ({marks})",
+                    (session_id, *chunk, session_id, *chunk)))
+        return [tuple(pair) for pair in pairs]
+
+    def edges_from(self, session_id: int, node_ids: Iterable[str]) -> List[dict]:
+        """Edges leaving node_ids, ordered by the source's position and then insertion"""
+        rows = []
+        with self.connection() as conn:
+            for chunk in chunks(list(node_ids)):
+                rows.extend(conn.execute(
+                    f"SELECT e.source_id, e.target_id, e.relationship, n.position, e.rowid AS edge_order FROM edges e "
+                    f"JOIN nodes n ON n.session_id = e.session_id AND n.node_id = e.source_id "
+                    f"WHERE e.session_id = ? AND e.source_id IN ({placeholders(len(chunk))})", (session_id, *chunk)))
+        return [dict(row) for row in sorted(rows, key=lambda row: (row['position'], row['edge_order']))]
+
+    def close(self):
+        """Close the pooled connections not in use"""
+        while True:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            with self.lock:
+                self.opened -= 1
+            conn.close()
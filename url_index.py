@@ -0,0 +1,107 @@
+import math
+import re
+from hashlib import blake2b
+from typing import Dict, Iterable, Optional
+from urllib.parse import unquote, urlsplit
+
+WHITESPACE = re.compile(r'\s+')
+# Redirect chains longer than this are cut short (MediaWiki itself follows one hop)
+MAX_REDIRECT_HOPS = 3
+
+def canonical_title(title: str) -> str:
+    """MediaWiki's form of a page title: spaces for underscores, single spaces, first letter upper case"""
+    title = WHITESPACE.sub(' ', title.replace('_', ' ')).strip()
+    return title[:1].upper() + title[1:]
+
+def title_from_href(href: str) -> Optional[str]:
+    """Canonical title of the article a /wiki/ link points to, or None for other links"""
+    path = urlsplit(href).path
+    if '/wiki/' not in path:
+        return None
+    # The fragment (a section of the page) and query are already split off; the title is percent-decoded
+    title = canonical_title(unquote(path.split('/wiki/', 1)[1]))
+    return title or None
+
+def article_url(base_url: str, title: str) -> str:
+    """URL of an article; only characters that would end the path are escaped"""
+    return f"{base_url}/wiki/{title.replace(' ', '_').replace('%', '%25').replace('?', '%3F')}"
+
+def canonical_url(url: str) -> str:
+    """url with its /wiki/ title in canonical form; other URLs are returned unchanged"""
+    base, sep, _ = url.partition('/wiki/')
+    title = title_from_href(url) if sep else None
+    return article_url(base, title) if title else url
+
+def fingerprint(url: str) -> int:
+    return int.from_bytes(blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class BloomFilter:
+    """Fixed-size set of strings that can answer "maybe present" for a string never added"""
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key: str):
+        digest = blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, step = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * step) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+class UrlIndex:
+    """Visited article URLs, deduplicated by canonical URL.
+
+    URLs are compared in canonical form, after following the redirects
+    learned from responses (add_redirect), so every spelling of an article
+    and every alias of it counts as the same page. Only a 64-bit
+    fingerprint of each URL is kept. With bloom_capacity set they go into
+    a BloomFilter of that capacity instead, whose memory doesn't grow with
+    the crawl but which may take about error_rate of unvisited pages for
+    visited ones.
+    """
+    def __init__(self, urls: Iterable[str] = (), bloom_capacity: Optional[int] = None, error_rate: float = 0.001):
+        self.redirects: Dict[str, str] = {}
+        self.seen = BloomFilter(bloom_capacity, error_rate) if bloom_capacity else set()
+        self.count = 0
+        self.update(urls)
+
+    def resolve(self, url: str) -> str:
+        """Canonical URL of the page url refers to, as far as redirects are known"""
+        url = canonical_url(url)
+        for _ in range(MAX_REDIRECT_HOPS):
+            target = self.redirects.get(url)
+            if target is None:
+                break
+            url = target
+        return url
+
+    def add_redirect(self, alias: str, target: str):
+        alias, target = canonical_url(alias), canonical_url(target)
+        if alias != target:
+            self.redirects[alias] = target
+
+    def key(self, url: str):
+        url = self.resolve(url)
+        return url if isinstance(self.seen, BloomFilter) else fingerprint(url)
+
+    def __contains__(self, url: str) -> bool:
+        return self.key(url) in self.seen
+
+    def add(self, url: str):
+        key = self.key(url)
+        if key not in self.seen:
+            self.seen.add(key)
+            self.count += 1
+
+    def update(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def __len__(self) -> int:
+        return self.count
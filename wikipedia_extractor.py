@@ -1,15 +1,158 @@
-import requests
 import time
 import json
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+from urllib.parse import urlparse
 import re
 from typing import Dict, List, Set, Tuple, Optional
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import os
 import sys
+import argparse
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from page_cache import PageCache
+from node_store import NodeStore
+from result_sinks import ResultSink, node_to_dict, open_sink
+from crawl_journal import CrawlJournal, JournalState
+from infobox_parser import parse_infobox
+from mediawiki_api import MediaWikiApiClient, infobox_from_wikitext, title_from_url
+from instrumentation import LOG_LEVELS, CrawlMetrics, StatusLog, write_metrics
+from http_transport import CircuitBreaker, HttpConfig, new_session, send_until_settled
+from url_index import UrlIndex, article_url, title_from_href
+
+try:
+    from bs4.filter import ElementFilter  # beautifulsoup4 >= 4.13
+except ImportError:
+    ElementFilter = None
+
+def is_page_region(name, attrs=None) -> bool:
+    """True for the elements the extractor reads: the title heading, canonical link, infoboxes and category links"""
+    attrs = attrs or {}
+    if name == 'link':
+        rel = attrs.get('rel') or ''
+        if isinstance(rel, str):
+            rel = rel.split()
+        return 'canonical' in rel
+    if name == 'h1':
+        return attrs.get('id') == 'firstHeading'
+    if name == 'table':
+        classes = attrs.get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return 'infobox' in classes
+    if name == 'a':
+        return '/wiki/Category:' in (attrs.get('href') or '')
+    return False
+
+if ElementFilter is not None:
+    class PageRegionFilter(ElementFilter):
+        """Only lets the page regions (and everything inside them) into the tree"""
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return is_page_region(name, attrs)
+
+        def allow_string_creation(self, string) -> bool:
+            return False
+
+def page_region_filter():
+    if ElementFilter is not None:
+        return PageRegionFilter()
+    # Older versions call the strainer function with the tag name and attributes
+    return SoupStrainer(is_page_region)
+
+# Parser backends: 'lxml' uses the C parser and only materializes the page
+# regions the extractor reads; 'html.parser' builds the full tree in pure Python
+PARSER_BACKENDS = ('lxml', 'html.parser')
+# Fetch backends: 'html' scrapes each rendered article, 'api' pulls categories
+# and infobox wikitext for up to 50 pages per MediaWiki Action API request
+FETCH_BACKENDS = ('html', 'api')
+
+# Minimum seconds between two progress_callback reports
+PROGRESS_INTERVAL = 0.5
+
+CATEGORY_HREF = re.compile(r'/wiki/Category:')
+EVENT_INDICATORS = ('wars', 'battles', 'conflicts', 'campaigns', 'operations')
+PERSON_INDICATORS = ('people', 'person', 'military', 'generals', 'commanders', 'leaders')
+# One alternation per type, so each category text is scanned once per type
+EVENT_PATTERN = re.compile('|'.join(map(re.escape, EVENT_INDICATORS)))
+PERSON_PATTERN = re.compile('|'.join(map(re.escape, PERSON_INDICATORS)))
 
 @dataclass
+class PageClassification:
+    """Page type decided from the page's categories"""
+    page_type: Optional[str]  # 'Event', 'Person' or None
+    is_event: bool
+    is_person: bool
+    confidence: float  # share of indicator categories that agree with page_type
+
+    @property
+    def ambiguous(self) -> bool:
+        """Both event and person categories matched (resolved as Event)"""
+        return self.is_event and self.is_person
+
+def classify_categories(categories) -> PageClassification:
+    """Classify a page from its category names"""
+    event_hits = person_hits = 0
+    for category in categories:
+        text = category.lower()
+        if EVENT_PATTERN.search(text):
+            event_hits += 1
+        if PERSON_PATTERN.search(text):
+            person_hits += 1
+
+    is_event, is_person = event_hits > 0, person_hits > 0
+    # Pages matching both kinds of categories are treated as events
+    if is_event:
+        page_type, hits = 'Event', event_hits
+    elif is_person:
+        page_type, hits = 'Person', person_hits
+    else:
+        page_type, hits = None, 0
+    confidence = hits / (event_hits + person_hits) if hits else 0.0
+    return PageClassification(page_type, is_event, is_person, confidence)
+
+def page_from_record(record: dict) -> dict:
+    """Rebuild a parsed page from its crawl journal record"""
+    return {
+        'title': record['title'],
+        'infobox': record['infobox'],
+        'classification': PageClassification(**record['classification']),
+        'revision_id': record.get('revision_id'),
+        'last_modified': record.get('last_modified'),
+        'canonical_url': record.get('canonical_url'),
+    }
+
+def pages_by_url(records: Dict[str, dict]) -> Dict[str, dict]:
+    """Rebuild journaled pages, keyed by the URL they were fetched as and by their canonical URL"""
+    pages = {}
+    for url, record in records.items():
+        page = pages[url] = page_from_record(record)
+        if record.get('canonical_url'):
+            pages.setdefault(record['canonical_url'], page)
+    return pages
+
+def page_unchanged(record: dict, latest: dict) -> bool:
+    """Whether a journaled page is still at the latest revision reported by the API"""
+    if record.get('revision_id') is not None:
+        return record['revision_id'] == latest.get('revision_id')
+    if record.get('last_modified') and latest.get('timestamp'):
+        try:
+            fetched = parsedate_to_datetime(record['last_modified'])
+            edited = datetime.strptime(latest['timestamp'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            return False
+        return edited <= fetched
+    # Nothing to compare against: assume it changed
+    return False
+
+# Slotted dataclasses need Python 3.10+; older versions keep a per-instance __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class ExtractedNode:
     """Represents a node (Event or Person) extracted from Wikipedia"""
     title: str
@@ -22,121 +165,290 @@ class ExtractedNode:
     end_date: Optional[str] = ''
     metadata: dict = field(default_factory=dict)
 
+    def __post_init__(self):
+        # Node types and infobox keys ("Allegiance", "Rank", ...) repeat across
+        # nearly every node, so share one copy of each
+        self.node_type = sys.intern(self.node_type)
+        if self.metadata:
+            self.metadata = {sys.intern(key): value for key, value in self.metadata.items()}
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how often a request may start"""
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, stop_flag=None) -> bool:
+        """Block until a token is available; returns False if stopped while waiting"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if stop_flag and stop_flag.is_set():
+                return False
+            # Sleep in short slices so a stop request is noticed promptly
+            time.sleep(min(wait, 0.25))
+
+class RateLimiter:
+    """One requests_per_second budget shared by every worker, across all hosts.
+
+    With host_requests_per_second each host also gets a token bucket of its
+    own, so no single server takes more than that share. With a circuit breaker, requests to a host whose circuit is open also
+    wait here until it lets them through, and send() sends failed requests
+    again while their host keeps failing, for up to max_outage seconds and
+    max_resends times.
+    """
+    def __init__(self, requests_per_second: float, breaker: Optional[CircuitBreaker] = None,
+                 max_outage: float = 600.0, max_resends: int = 20, host_requests_per_second: Optional[float] = None):
+        self.requests_per_second = requests_per_second
+        self.host_requests_per_second = host_requests_per_second
+        self.breaker = breaker
+        self.max_outage = max_outage
+        self.max_resends = max_resends
+        self.bucket = TokenBucket(requests_per_second) if requests_per_second and requests_per_second > 0 else None
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url: str, stop_flag=None) -> bool:
+        if self.breaker and not self.breaker.wait(url, stop_flag):
+            return False
+        if self.host_requests_per_second and self.host_requests_per_second > 0:
+            host = urlparse(url).netloc
+            with self.lock:
+                bucket = self.buckets.get(host)
+                if bucket is None:
+                    bucket = self.buckets[host] = TokenBucket(self.host_requests_per_second)
+            if not bucket.acquire(stop_flag):
+                return False
+        return self.bucket is None or self.bucket.acquire(stop_flag)
+
+    def send(self, url: str, send, stop_flag=None):
+        """Wait for a turn and call send(), again after failures (see send_until_settled); None if stopped"""
+        return send_until_settled(lambda: send() if self.acquire(url, stop_flag) else None, url, self.breaker,
+                                  self.max_outage, stop_flag, self.max_resends)
+
 class WikipediaExtractor:
-    def __init__(self, base_url: str = "https://en.wikipedia.org"):
+    def __init__(self, base_url: str = "https://en.wikipedia.org", max_workers: int = 1,
+                 requests_per_second: float = 1.0, page_cache: Optional[PageCache] = None,
+                 cache_only: bool = False, memo_size: int = 4096, parser: str = 'lxml',
+                 fetch_backend: str = 'html', api_url: Optional[str] = None,
+                 journal_path: Optional[str] = None, columnar: bool = False,
+                 sinks: Optional[List[ResultSink]] = None, log_level: int = logging.INFO,
+                 metrics_path: Optional[str] = None, http_config: Optional[HttpConfig] = None,
+                 bloom_capacity: Optional[int] = None, host_requests_per_second: Optional[float] = None):
         self.base_url = base_url
-        self.session = requests.Session()
+        # Counters and timing histograms of the crawl (see instrumentation);
+        # the session's connection pools time DNS lookups and connects into it
+        self.metrics = CrawlMetrics()
+        self.stats = self.metrics.counters
+        # extract_data writes a snapshot of the metrics here when it ends
+        self.metrics_path = metrics_path
+        # Kept-alive connections for every worker, retries with backoff on
+        # throttling and errors, and a per-host circuit breaker (see http_transport)
+        self.http_config = http_config or HttpConfig()
+        self.breaker = CircuitBreaker(self.http_config.breaker_threshold, self.http_config.breaker_cooldown,
+                                      self.metrics)
+        self.session = new_session(self.http_config, self.metrics, self.breaker, max_workers)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
-        self.extracted_nodes: List[ExtractedNode] = []
-        self.visited_urls: Set[str] = set()
+        # columnar=True keeps nodes in a NodeStore (string table + integer
+        # columns) instead of a list of objects, for very large crawls
+        self.columnar = columnar
+        self.extracted_nodes = self.new_node_list()
+        # Per-degree frontier queues and a (degree, node_type) index of node
+        # positions, kept in step with extracted_nodes so scheduling and
+        # summaries never rescan it
+        self.nodes_by_degree: Dict[int, List[int]] = defaultdict(list)
+        self.nodes_by_degree_type: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+        # Claimed article URLs, compared by canonical URL through the redirects
+        # learned from fetched pages; bloom_capacity trades exactness for a
+        # fixed-size Bloom filter (see url_index)
+        self.bloom_capacity = bloom_capacity
+        self.visited_urls = UrlIndex(bloom_capacity=bloom_capacity)
         self.max_degree = 3
+        # Fetches overlap across max_workers threads while the rate limiter keeps
+        # their combined request rate within requests_per_second (and, with
+        # host_requests_per_second, each host's within that)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(requests_per_second, self.breaker, self.http_config.max_outage,
+                                        self.http_config.max_resends, host_requests_per_second)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Pages are served from the cache while fresh and revalidated with
+        # conditional requests afterwards; cache_only never touches the network
+        self.page_cache = page_cache
+        self.cache_only = cache_only
+        # Parsed pages of the current crawl (URL -> title, infobox, page type),
+        # so a page loaded for its node's fields is not fetched again when the
+        # node is expanded at the next degree. Bounded as an LRU.
+        self.memo_size = memo_size
+        self.page_memo: "OrderedDict[str, dict]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        # Set by refresh(): journaled pages still at their latest revision,
+        # used instead of fetching, and changed pages that must bypass the
+        # page cache
+        self.reused_pages: Dict[str, dict] = {}
+        self.refetch_urls: Set[str] = set()
+        # Last-Modified of each page fetched by the HTML backend, until load_page stores it with the page
+        self.last_modified: Dict[str, str] = {}
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {parser}")
+        self.parser = parser
+        if fetch_backend not in FETCH_BACKENDS:
+            raise ValueError(f"Unknown fetch backend: {fetch_backend}")
+        self.fetch_backend = fetch_backend
+        self.api_client = MediaWikiApiClient(self.session, api_url or f"{base_url}/w/api.php", self.rate_limiter,
+                                             self.metrics)
+        # Progress is appended to the journal as it happens so resume() can
+        # pick an interrupted crawl back up
+        self.journal_path = journal_path
+        self.journal: Optional[CrawlJournal] = None
+        # Every finalized node is streamed to these sinks (see result_sinks)
+        self.sinks: List[ResultSink] = sinks or []
+        self._stats_lock = threading.Lock()
+        # Set for the duration of extract_data; see report_progress
+        self._progress_callback = None
+        self._progress_reported = 0.0
+        self._started = 0.0
+        self.current_degree = 0
+        # Status lines below log_level are dropped; the rest are written to stdout in batches
+        self.status_log = StatusLog(log_level)
+
+    def count(self, name: str, amount: int = 1):
+        """Increment a crawl statistic"""
+        self.metrics.count(name, amount)
+
+    def progress(self) -> dict:
+        """Snapshot of crawl progress: pages fetched, nodes per degree, queue depth and fetch rate"""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        stats = self.metrics.counter_values()
+        return {
+            'degree': self.current_degree,
+            'max_degree': self.max_degree,
+            'nodes': len(self.extracted_nodes),
+            'nodes_per_degree': {degree: len(positions) for degree, positions in self.nodes_by_degree.items()},
+            'pages_fetched': stats['pages_fetched'],
+            'cache_hits': stats['cache_hits'],
+            'fetches_saved': stats['fetches_saved'],
+            'pages_reused': stats['pages_reused'],
+            'queue_depth': stats['queue_depth'],
+            'fetch_rate': stats['pages_fetched'] / elapsed if elapsed > 0 else 0.0,
+            'elapsed': elapsed,
+        }
+
+    def report_progress(self, force: bool = False):
+        """Send progress() to the progress callback, at most every PROGRESS_INTERVAL seconds unless forced"""
+        callback = self._progress_callback
+        if callback is None:
+            return
+        now = time.monotonic()
+        with self._stats_lock:
+            if not force and now - self._progress_reported < PROGRESS_INTERVAL:
+                return
+            self._progress_reported = now
+        try:
+            callback(self.progress())
+        except Exception as e:
+            self.log_status(f"Error reporting progress: {str(e)}", level=logging.WARNING)
 
-    def log_status(self, message: str, log_callback=None):
-        """Print status message with timestamp"""
+    def log_status(self, message: str, log_callback=None, level: int = logging.INFO):
+        """Print status message with timestamp, if level is at or above the extractor's log level"""
+        if not self.status_log.enabled(level):
+            return
         timestamp = datetime.now().strftime("%H:%M:%S")
         msg = f"[{timestamp}] {message}"
-        print(msg)
-        sys.stdout.flush()
+        self.status_log.write(msg)
         if log_callback:
             log_callback(msg)
 
-    def get_wikipedia_page(self, url: str, log_callback=None) -> Optional[BeautifulSoup]:
+    def get_wikipedia_page(self, url: str, log_callback=None, stop_flag=None) -> Optional[BeautifulSoup]:
         """Fetch and parse a Wikipedia page"""
         try:
-            self.log_status(f"Fetching: {url}", log_callback)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            content = self.fetch_page_content(url, log_callback, stop_flag)
+            if content is None:
+                return None
+            with self.metrics.timer('parse_seconds'):
+                return self.parse_html(content)
         except Exception as e:
-            self.log_status(f"Error fetching {url}: {str(e)}", log_callback)
+            self.count('fetch_errors')
+            self.log_status(f"Error fetching {url}: {str(e)}", log_callback, logging.WARNING)
+            return None
+
+    def parse_html(self, content: bytes) -> BeautifulSoup:
+        """Parse page HTML with the configured backend"""
+        if self.parser == 'html.parser':
+            return BeautifulSoup(content, 'html.parser')
+        # Fall back to the pure Python parser when lxml is not installed, but
+        # still skip everything outside the regions the extractor reads
+        features = 'lxml' if builder_registry.lookup('lxml') else 'html.parser'
+        return BeautifulSoup(content, features, parse_only=page_region_filter())
+
+    def fetch_page_content(self, url: str, log_callback=None, stop_flag=None) -> Optional[bytes]:
+        """Return the raw HTML of a page, going through the page cache when one is set"""
+        cached = self.page_cache.get(url) if self.page_cache else None
+        if cached and (self.cache_only or (cached.is_fresh(self.page_cache.ttl) and url not in self.refetch_urls)):
+            self.count('cache_hits')
+            if cached.last_modified:
+                self.last_modified[url] = cached.last_modified
+            return cached.content
+        if self.cache_only:
+            self.log_status(f"Not in cache (cache-only mode): {url}", log_callback, logging.WARNING)
+            return None
+
+        headers = {}
+        if cached:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        def send():
+            self.log_status(f"Fetching: {url}", log_callback, logging.DEBUG)
+            start = time.perf_counter()
+            response = self.session.get(url, timeout=self.http_config.timeout, headers=headers)
+            self.metrics.record_response(response, time.perf_counter() - start)
+            self.count('pages_fetched')
+            return response
+
+        response = self.rate_limiter.send(url, send, stop_flag)
+        if response is None:
             return None
+        if response.status_code == 304 and cached:
+            self.page_cache.touch(url)
+            if cached.last_modified:
+                self.last_modified[url] = cached.last_modified
+            return cached.content
+        response.raise_for_status()
+        if response.headers.get('Last-Modified'):
+            self.last_modified[url] = response.headers['Last-Modified']
+        if self.page_cache:
+            self.page_cache.put(url, response.content, response.headers.get('ETag'),
+                                response.headers.get('Last-Modified'))
+        return response.content
 
     def extract_infobox_data(self, soup: BeautifulSoup) -> Dict[str, any]:
-        infobox_data = {}
-        infobox = soup.find('table', class_='infobox')
-        if not infobox:
-            return infobox_data
-        rows = infobox.find_all('tr')
-        # Description: from caption or first summary row
-        description = None
-        if infobox.find('caption'):
-            description = infobox.find('caption').get_text(strip=True)
-        else:
-            for row in rows:
-                td = row.find('td')
-                if td and not row.find('th'):
-                    description = td.get_text(strip=True)
-                    break
-        infobox_data['description'] = description or ''
-        # Dates and metadata
-        metadata = {}
-        for i, row in enumerate(rows):
-            th = row.find('th')
-            if th:
-                header_text = th.get_text(strip=True)
-                td = row.find('td')
-                if not td:
-                    continue
-                # Dates
-                if header_text.lower() in ['born', 'date', 'start date', 'started', 'begin', 'birth']:
-                    infobox_data['start_date'] = td.get_text(strip=True)
-                elif header_text.lower() in ['died', 'end date', 'ended', 'death']:
-                    infobox_data['end_date'] = td.get_text(strip=True)
-                elif header_text.lower() == 'date':
-                    date_text = td.get_text(strip=True)
-                    if '–' in date_text:
-                        parts = date_text.split('–')
-                        infobox_data['start_date'] = parts[0].strip()
-                        infobox_data['end_date'] = parts[1].strip() if len(parts) > 1 else ''
-                    else:
-                        infobox_data['start_date'] = date_text
-                # Metadata
-                elif header_text not in ['Commanders and leaders', 'Battles/wars']:
-                    metadata[header_text] = td.get_text(strip=True)
-        infobox_data['metadata'] = metadata
-        # --- Restore original logic for extracting links for traversal ---
-        sections_to_find = ['Commanders and leaders', 'Battles/wars']
-        for i, row in enumerate(rows):
-            th = row.find('th')
-            if th:
-                header_text = th.get_text(strip=True)
-                if header_text in sections_to_find:
-                    td = row.find('td')
-                    if not td and i + 1 < len(rows):
-                        next_row = rows[i + 1]
-                        td = next_row.find('td')
-                    if td:
-                        links = td.find_all('a')
-                        values = []
-                        for link in links:
-                            href = link.get('href')
-                            if href and href.startswith('/wiki/'):
-                                title = link.get_text(strip=True)
-                                if title:
-                                    values.append(title)
-                        if values:
-                            infobox_data[header_text] = values
-        return infobox_data
+        """Description, dates, metadata and traversal links from the page's infobox (see infobox_parser)"""
+        return parse_infobox(soup)
+
+    def classify_page(self, soup: BeautifulSoup) -> PageClassification:
+        """Classify a page as Event or Person from a single pass over its categories"""
+        return classify_categories(category.get_text(strip=True) for category in soup.find_all('a', href=CATEGORY_HREF))
 
     def is_event_page(self, soup: BeautifulSoup) -> bool:
         """Determine if the page is an event page"""
-        # Check for event-related categories or templates
-        categories = soup.find_all('a', href=re.compile(r'/wiki/Category:'))
-        category_texts = [cat.get_text(strip=True).lower() for cat in categories]
-
-        event_indicators = ['wars', 'battles', 'conflicts', 'campaigns', 'operations']
-        return any(indicator in ' '.join(category_texts) for indicator in event_indicators)
+        return self.classify_page(soup).is_event
 
     def is_person_page(self, soup: BeautifulSoup) -> bool:
         """Determine if the page is a person page"""
-        # Check for person-related categories or templates
-        categories = soup.find_all('a', href=re.compile(r'/wiki/Category:'))
-        category_texts = [cat.get_text(strip=True).lower() for cat in categories]
-
-        person_indicators = ['people', 'person', 'military', 'generals', 'commanders', 'leaders']
-        return any(indicator in ' '.join(category_texts) for indicator in person_indicators)
+        return self.classify_page(soup).is_person
 
     def get_page_title(self, soup: BeautifulSoup) -> str:
         """Extract the page title"""
@@ -145,158 +457,479 @@ class WikipediaExtractor:
             return title_elem.get_text(strip=True)
         return "Unknown Title"
 
-    def extract_related_nodes(self, url: str, degree: int, log_callback=None, stop_flag=None) -> List[ExtractedNode]:
-        """Extract related nodes based on the current page type"""
+    def get_canonical_url(self, soup: BeautifulSoup) -> Optional[str]:
+        """URL of the article the page really is, from its canonical link (the target, for a redirect)"""
+        link = soup.find('link', rel='canonical')
+        title = title_from_href(link.get('href') or '') if link else None
+        # Rebuilt on base_url so a mirror or a recorded corpus resolves to the URLs the crawl uses
+        return article_url(self.base_url, title) if title else None
+
+    def load_page(self, url: str, log_callback=None, stop_flag=None) -> Optional[dict]:
+        """Fetch a page and pull out the fields the crawl needs from it"""
+        if self.fetch_backend == 'api':
+            return self.load_pages_from_api([url], log_callback, stop_flag)[0]
+        page = self.memo_get(url) or self.reuse_page(url)
+        if page is not None:
+            return page
         if stop_flag and stop_flag.is_set():
-            return []
-        soup = self.get_wikipedia_page(url, log_callback)
+            return None
+        soup = self.get_wikipedia_page(url, log_callback, stop_flag)
         if not soup:
-            return []
+            return None
+        with self.metrics.timer('infobox_seconds'):
+            infobox = self.extract_infobox_data(soup)
+        with self.metrics.timer('classify_seconds'):
+            classification = self.classify_page(soup)
+        page = {
+            'title': self.get_page_title(soup),
+            'infobox': infobox,
+            'classification': classification,
+            'last_modified': self.last_modified.pop(url, None),
+            'canonical_url': self.get_canonical_url(soup),
+        }
+        self.page_loaded(url, page)
+        return page
+
+    def load_pages_from_api(self, urls: List[str], log_callback=None, stop_flag=None) -> List[Optional[dict]]:
+        """Load pages through batched MediaWiki API queries, keeping input order"""
+        pages = {url: self.memo_get(url) or self.reuse_page(url) for url in urls}
+        missing = [url for url, page in pages.items() if page is None]
+        if missing and not (stop_flag and stop_flag.is_set()):
+            titles = {url: title_from_url(url) for url in missing}
+            self.log_status(f"Querying API for {len(missing)} pages", log_callback, logging.DEBUG)
+            try:
+                results = self.api_client.fetch_pages(list(dict.fromkeys(titles.values())), stop_flag)
+            except Exception as e:
+                self.count('fetch_errors')
+                self.log_status(f"Error querying API: {str(e)}", log_callback, logging.WARNING)
+                results = {}
+            self.count('pages_fetched', len(results))
+            for url in missing:
+                result = results.get(titles[url])
+                if result is None:
+                    self.log_status(f"Page not found: {url}", log_callback, logging.WARNING)
+                    continue
+                with self.metrics.timer('infobox_seconds'):
+                    infobox = infobox_from_wikitext(result['wikitext'])
+                with self.metrics.timer('classify_seconds'):
+                    classification = classify_categories(result['categories'])
+                pages[url] = {
+                    'title': result['title'],
+                    'infobox': infobox,
+                    'classification': classification,
+                    'revision_id': result['revision_id'],
+                    # The API resolves redirects and normalizes the title
+                    'canonical_url': article_url(self.base_url, result['title']),
+                }
+                self.page_loaded(url, pages[url])
+        return [pages[url] for url in urls]
 
-        title = self.get_page_title(soup)
-        infobox_data = self.extract_infobox_data(soup)
+    def reuse_page(self, url: str) -> Optional[dict]:
+        """The journaled copy of an unchanged page during a refresh, or None"""
+        page = self.reused_pages.get(url)
+        if page is not None:
+            self.count('pages_reused')
+            self.page_loaded(url, page)
+        return page
 
-        # Determine page type
-        is_event = self.is_event_page(soup)
-        is_person = self.is_person_page(soup)
+    def page_loaded(self, url: str, page: dict):
+        """Remember a freshly parsed page for the rest of the crawl, under its canonical URL too"""
+        self.memo_put(url, page)
+        canonical = page.get('canonical_url')
+        if canonical and canonical != url:
+            self.visited_urls.add_redirect(url, canonical)
+            self.memo_put(canonical, page)
+        if self.journal:
+            self.journal.record_page(url, page)
 
-        nodes = []
-        if is_event:
-            self.log_status(f"Processing EVENT: {title} (Degree {degree})", log_callback)
+    def new_node_list(self):
+        return NodeStore(ExtractedNode) if self.columnar else []
+
+    def nodes_at(self, degree: int, node_type: Optional[str] = None) -> List[ExtractedNode]:
+        """Nodes at a degree (optionally of one type), in discovery order"""
+        if node_type is None:
+            positions = self.nodes_by_degree.get(degree, [])
+        else:
+            positions = self.nodes_by_degree_type.get((degree, node_type), [])
+        return [self.extracted_nodes[i] for i in positions]
+
+    def add_node(self, node: ExtractedNode):
+        self.extracted_nodes.append(node)
+        self.index_node(node, len(self.extracted_nodes) - 1)
+        if self.journal:
+            self.journal.record_node(node)
+        for sink in self.sinks:
+            sink.write(node)
+
+    def add_edge(self, person_url: str, event_url: str, relationship: str = 'involvement'):
+        """Record a person -> event relationship found in an infobox"""
+        if self.journal:
+            self.journal.record_edge(person_url, event_url, relationship)
+        for sink in self.sinks:
+            sink.write_edge(person_url, event_url, relationship)
+
+    def index_node(self, node: ExtractedNode, position: int):
+        self.nodes_by_degree[node.degree].append(position)
+        self.nodes_by_degree_type[(node.degree, node.node_type)].append(position)
+
+    def memo_get(self, url: str) -> Optional[dict]:
+        with self._memo_lock:
+            if url not in self.page_memo:
+                return None
+            self.page_memo.move_to_end(url)
+            self.count('fetches_saved')
+            return self.page_memo[url]
+
+    def memo_put(self, url: str, page: dict):
+        with self._memo_lock:
+            self.page_memo[url] = page
+            while len(self.page_memo) > self.memo_size:
+                self.page_memo.popitem(last=False)
+
+    def discover_related(self, url: str, degree: int, page: Optional[dict], log_callback=None) -> List[Tuple[str, str, str, str]]:
+        """Pick the not yet visited links of a loaded page as (parent_url, name, url, node_type).
+
+        Marks every returned URL as visited, so calls must be made in crawl order
+        for the result to match a serial crawl. Links to pages already visited
+        get their edge here; the edges of the returned links are added by
+        build_related_nodes once their canonical URL is known.
+        """
+        if not page:
+            return []
+        title = page['title']
+        infobox_data = page['infobox']
+        classification = page['classification']
+        if classification.page_type == 'Event':
+            note = " [ambiguous: also has person categories]" if classification.ambiguous else ""
+            self.log_status(f"Processing EVENT: {title} (Degree {degree}){note}", log_callback)
             # Extract people from event
-            if 'Commanders and leaders' in infobox_data:
-                for person_name in infobox_data['Commanders and leaders']:
-                    # Construct Wikipedia URL for the person
-                    person_url = f"{self.base_url}/wiki/{person_name.replace(' ', '_')}"
-
-                    if person_url not in self.visited_urls:
-                        self.visited_urls.add(person_url)
-                        # Fetch person page for extra fields
-                        person_soup = self.get_wikipedia_page(person_url, log_callback)
-                        person_infobox = self.extract_infobox_data(person_soup) if person_soup else {}
-                        node = ExtractedNode(
-                            title=person_name,
-                            url=person_url,
-                            node_type='Person',
-                            degree=degree + 1,
-                            parent_url=url,
-                            description=person_infobox.get('description', ''),
-                            start_date=person_infobox.get('start_date', ''),
-                            end_date=person_infobox.get('end_date', ''),
-                            metadata=person_infobox.get('metadata', {})
-                        )
-                        nodes.append(node)
-                        self.log_status(f"  -> Found PERSON: {person_name}", log_callback)
-        elif is_person:
+            section, node_type = 'Commanders and leaders', 'Person'
+        elif classification.page_type == 'Person':
             self.log_status(f"Processing PERSON: {title} (Degree {degree})", log_callback)
             # Extract events from person
-            if 'Battles/wars' in infobox_data:
-                for event_name in infobox_data['Battles/wars']:
-                    # Construct Wikipedia URL for the event
-                    event_url = f"{self.base_url}/wiki/{event_name.replace(' ', '_')}"
-
-                    if event_url not in self.visited_urls:
-                        self.visited_urls.add(event_url)
-                        # Fetch event page for extra fields
-                        event_soup = self.get_wikipedia_page(event_url, log_callback)
-                        event_infobox = self.extract_infobox_data(event_soup) if event_soup else {}
-                        node = ExtractedNode(
-                            title=event_name,
-                            url=event_url,
-                            node_type='Event',
-                            degree=degree + 1,
-                            parent_url=url,
-                            description=event_infobox.get('description', ''),
-                            start_date=event_infobox.get('start_date', ''),
-                            end_date=event_infobox.get('end_date', ''),
-                            metadata=event_infobox.get('metadata', {})
-                        )
-                        nodes.append(node)
-                        self.log_status(f"  -> Found EVENT: {event_name}", log_callback)
+            section, node_type = 'Battles/wars', 'Event'
+        else:
+            return []
+
+        related = []
+        names = infobox_data.get(section, [])
+        # Canonical link targets; pages parsed from wikitext (or journaled before they were kept) link by name
+        titles = infobox_data.get('link_titles', {}).get(section) or names
+        for name, target in zip(names, titles):
+            related_url = self.visited_urls.resolve(article_url(self.base_url, target))
+            if related_url in self.visited_urls:
+                self.link_related(url, related_url, node_type)
+                continue
+            # Links past max_degree never become nodes, so their edges are dropped with them
+            self.visited_urls.add(related_url)
+            related.append((url, name, related_url, node_type))
+            if self.journal:
+                self.journal.record_link(degree, url, name, related_url, node_type)
+        return related
+
+    def link_related(self, url: str, related_url: str, node_type: str):
+        """Add the edge between a page and a page linked from its infobox"""
+        if node_type == 'Person':
+            self.add_edge(related_url, url)
+        else:
+            self.add_edge(url, related_url)
+
+    def build_related_nodes(self, related: List[Tuple[str, str, str, str]], degree: int,
+                            log_callback=None, stop_flag=None) -> List[ExtractedNode]:
+        """Fetch each related page for its extra fields and build the degree + 1 nodes.
+
+        Links that turn out to lead to the same page (a redirect and its
+        target) make one node, at the first link's place; the others, like a
+        redirect to a page visited earlier, only get their edge to it.
+        """
+        pages = self.map_pages([related_url for _, _, related_url, _ in related], log_callback, stop_flag)
+        claimed = {related_url for _, _, related_url, _ in related}
+        built = set()
+        nodes = []
+        for (parent_url, name, related_url, node_type), page in zip(related, pages):
+            if page is None and stop_flag and stop_flag.is_set():
+                # Skipped because of the stop request; a resumed crawl builds the rest
+                break
+            canonical = self.visited_urls.resolve(related_url)
+            self.link_related(parent_url, canonical, node_type)
+            if canonical in built or (canonical not in claimed and canonical in self.visited_urls):
+                continue
+            built.add(canonical)
+            self.visited_urls.add(canonical)
+            infobox = page['infobox'] if page else {}
+            nodes.append(ExtractedNode(
+                title=name,
+                url=canonical,
+                node_type=node_type,
+                degree=degree + 1,
+                parent_url=parent_url,
+                description=infobox.get('description', ''),
+                start_date=infobox.get('start_date', ''),
+                end_date=infobox.get('end_date', ''),
+                metadata=infobox.get('metadata', {})
+            ))
+            self.log_status(f"  -> Found {node_type.upper()}: {name}", log_callback)
         return nodes
 
-    def extract_data(self, seed_url: str, stop_flag=None, log_callback=None) -> List[ExtractedNode]:
-        """Main extraction method with depth limiting"""
+    def map_pages(self, urls: List[str], log_callback=None, stop_flag=None) -> List[Optional[dict]]:
+        """Load several pages, concurrently when a worker pool is running, keeping input order"""
+        self.count('queue_depth', len(urls))
+        if self.fetch_backend == 'api':
+            pages = self.load_pages_from_api(urls, log_callback, stop_flag)
+            self.count('queue_depth', -len(urls))
+            self.report_progress()
+            return pages
+        if self._executor is None or len(urls) <= 1:
+            return [self.load_queued(url, log_callback, stop_flag) for url in urls]
+        return list(self._executor.map(lambda url: self.load_queued(url, log_callback, stop_flag), urls))
+
+    def load_queued(self, url: str, log_callback=None, stop_flag=None) -> Optional[dict]:
+        """load_page for one URL of a map_pages batch, keeping queue_depth current"""
+        try:
+            return self.load_page(url, log_callback, stop_flag)
+        finally:
+            self.count('queue_depth', -1)
+            self.report_progress()
+
+    def extract_related_nodes(self, url: str, degree: int, log_callback=None, stop_flag=None) -> List[ExtractedNode]:
+        """Extract related nodes based on the current page type"""
+        page = self.load_page(url, log_callback, stop_flag)
+        related = self.discover_related(url, degree, page, log_callback)
+        return self.build_related_nodes(related, degree, log_callback, stop_flag)
+
+    def extract_data(self, seed_url: str, stop_flag=None, log_callback=None,
+                     resume_state: Optional[JournalState] = None, progress_callback=None) -> List[ExtractedNode]:
+        """Main extraction method with depth limiting.
+
+        progress_callback, if given, is called with progress() while the
+        crawl runs and once more when it ends.
+        """
         self.log_status("Starting Wikipedia data extraction...", log_callback)
         self.log_status(f"Seed URL: {seed_url}", log_callback)
         self.log_status(f"Max depth: {self.max_degree} degrees", log_callback)
+        host_limit = self.rate_limiter.host_requests_per_second
+        self.log_status(f"Workers: {self.max_workers}, rate limit: {self.rate_limiter.requests_per_second} req/s"
+                        + (f" ({host_limit} req/s per host)" if host_limit else ''), log_callback)
         self.log_status("-" * 50, log_callback)
 
-        # Initialize with seed event
-        seed_soup = self.get_wikipedia_page(seed_url, log_callback)
-        seed_infobox = self.extract_infobox_data(seed_soup) if seed_soup else {}
-        seed_node = ExtractedNode(
-            title="Korean War",
-            url=seed_url,
-            node_type='Event',
-            degree=0,
-            description=seed_infobox.get('description', ''),
-            start_date=seed_infobox.get('start_date', ''),
-            end_date=seed_infobox.get('end_date', ''),
-            metadata=seed_infobox.get('metadata', {})
-        )
-        self.extracted_nodes.append(seed_node)
-        self.visited_urls.add(seed_url)
+        if self.journal_path:
+            self.journal = CrawlJournal(self.journal_path)
+            if resume_state is None:
+                self.journal.record_start(seed_url, self.max_degree)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+        self._progress_callback = progress_callback
+        self._started = time.monotonic()
+        try:
+            self._crawl(seed_url, stop_flag, log_callback, resume_state)
+        finally:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self.report_progress(force=True)
+            self._progress_callback = None
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            for sink in self.sinks:
+                sink.flush()
+            self.status_log.flush()
+
+        self.log_status("\n" + "=" * 50, log_callback)
+        self.log_status("EXTRACTION COMPLETED", log_callback)
+        self.log_status(f"Total nodes extracted: {len(self.extracted_nodes)}", log_callback)
+        self.log_status(f"Pages fetched: {self.stats['pages_fetched']}, cache hits: {self.stats['cache_hits']}, "
+                        f"fetches saved by page memo: {self.stats['fetches_saved']}", log_callback)
+        if self.metrics_path:
+            write_metrics(self.metrics_path, self.metrics.snapshot())
+            self.log_status(f"Metrics written to: {self.metrics_path}", log_callback)
+        self.status_log.flush()
+        self.page_memo.clear()
+
+        return self.extracted_nodes
+
+    def resume(self, stop_flag=None, log_callback=None, progress_callback=None) -> List[ExtractedNode]:
+        """Continue an interrupted crawl from the journal at journal_path"""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            raise ValueError("No crawl journal to resume from")
+        state = CrawlJournal.load(self.journal_path)
+        if state.seed_url is None:
+            raise ValueError(f"Journal {self.journal_path} does not describe a crawl")
+
+        self.max_degree = state.max_degree
+        self.extracted_nodes = self.new_node_list()
+        self.nodes_by_degree.clear()
+        self.nodes_by_degree_type.clear()
+        for record in state.nodes:
+            node = ExtractedNode(**record)
+            self.extracted_nodes.append(node)
+            self.index_node(node, len(self.extracted_nodes) - 1)
+            # Output files are rewritten from scratch, so replay earlier nodes into them
+            for sink in self.sinks:
+                sink.write(node)
+        for edge in state.edges:
+            for sink in self.sinks:
+                sink.write_edge(*edge)
+        self.visited_urls = UrlIndex([state.seed_url], self.bloom_capacity)
+        for url, record in state.pages.items():
+            if record.get('canonical_url'):
+                self.visited_urls.add_redirect(url, record['canonical_url'])
+        self.visited_urls.update(node.url for node in self.extracted_nodes)
+        for links in state.links.values():
+            self.visited_urls.update(link[2] for link in links)
+        self.log_status(f"Resuming crawl from {self.journal_path}: {len(self.extracted_nodes)} nodes, "
+                        f"{len(self.visited_urls)} visited URLs, degrees done: {sorted(state.completed_degrees)}", log_callback)
+        return self.extract_data(state.seed_url, stop_flag, log_callback, resume_state=state,
+                                 progress_callback=progress_callback)
+
+    def refresh(self, stop_flag=None, log_callback=None, progress_callback=None) -> List[ExtractedNode]:
+        """Redo the crawl in the journal at journal_path, refetching only pages edited since.
+
+        The latest revision of every journaled page is looked up in batched
+        API queries. Pages still at their journaled revision (or, for the
+        HTML backend, not edited since their Last-Modified date) are reused
+        as they are; the rest are refetched and reparsed. The crawl is then
+        replayed from the seed, so links added to or removed from changed
+        infoboxes add or drop nodes and edges exactly as a full crawl would.
+        The journal is replaced once the refresh completes.
+        """
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            raise ValueError("No crawl journal to refresh from")
+        state = CrawlJournal.load(self.journal_path)
+        if state.seed_url is None:
+            raise ValueError(f"Journal {self.journal_path} does not describe a crawl")
+
+        self.max_degree = state.max_degree
+        changed = self.changed_pages(state.pages, log_callback, stop_flag)
+        self.reused_pages = pages_by_url({url: record for url, record in state.pages.items() if url not in changed})
+        self.refetch_urls = changed | {state.pages[url]['canonical_url'] for url in changed
+                                       if state.pages[url].get('canonical_url')}
+        self.log_status(f"Refreshing crawl from {self.journal_path}: {len(changed)} of {len(state.pages)} "
+                        f"pages changed", log_callback)
+
+        # The new journal is written next to the old one, which stays valid if the refresh is interrupted
+        journal_path = self.journal_path
+        self.journal_path = journal_path + '.refresh'
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        try:
+            nodes = self.extract_data(state.seed_url, stop_flag, log_callback, progress_callback=progress_callback)
+        finally:
+            refreshed_journal, self.journal_path = self.journal_path, journal_path
+            self.reused_pages, self.refetch_urls = {}, set()
+        if stop_flag and stop_flag.is_set():
+            self.log_status(f"Refresh stopped; {journal_path} still holds the previous crawl", log_callback)
+        else:
+            os.replace(refreshed_journal, journal_path)
+            self.log_status(f"Pages reused unchanged: {self.stats['pages_reused']}", log_callback)
+        return nodes
+
+    def changed_pages(self, pages: Dict[str, dict], log_callback=None, stop_flag=None) -> Set[str]:
+        """URLs of the journaled pages that were edited, moved or deleted since they were fetched"""
+        titles = {url: title_from_url(url) for url in pages}
+        self.log_status(f"Checking revisions of {len(pages)} pages", log_callback)
+        try:
+            latest = self.api_client.latest_revisions(list(dict.fromkeys(titles.values())), stop_flag)
+        except Exception as e:
+            self.log_status(f"Error querying API, refetching every page: {str(e)}", log_callback, logging.WARNING)
+            latest = {}
+        return {url for url, record in pages.items()
+                if titles[url] not in latest or not page_unchanged(record, latest[titles[url]])}
+
+    def _crawl(self, seed_url: str, stop_flag=None, log_callback=None, resume_state: Optional[JournalState] = None):
+        start_degree, pending, expanded = 0, [], set()
+        if resume_state is None:
+            # Initialize with the seed page, named by its title (or the title in its URL if it couldn't be
+            # fetched); an unclassified seed is treated as an event, as the crawl always did
+            seed_page = self.load_page(seed_url, log_callback, stop_flag)
+            seed_infobox = seed_page['infobox'] if seed_page else {}
+            seed_type = seed_page['classification'].page_type if seed_page else None
+            seed_node = ExtractedNode(
+                title=seed_page['title'] if seed_page else (title_from_href(seed_url) or seed_url),
+                # The seed may be given as a redirect; edges to it use the canonical URL
+                url=self.visited_urls.resolve(seed_url),
+                node_type=seed_type or 'Event',
+                degree=0,
+                description=seed_infobox.get('description', ''),
+                start_date=seed_infobox.get('start_date', ''),
+                end_date=seed_infobox.get('end_date', ''),
+                metadata=seed_infobox.get('metadata', {})
+            )
+            self.add_node(seed_node)
+            self.visited_urls.add(seed_url)
+        else:
+            # Pick up at the first unfinished degree: frontier nodes not yet
+            # expanded, plus links claimed before the interruption whose nodes
+            # were never built
+            start_degree = min((degree for degree in range(self.max_degree + 1)
+                                if degree not in resume_state.completed_degrees), default=self.max_degree + 1)
+            # A link may have turned out to be a redirect to a node of any degree
+            built = {node.url for node in self.extracted_nodes}
+            pending = [link for link in resume_state.links.get(start_degree, [])
+                       if self.visited_urls.resolve(link[2]) not in built]
+            expanded = resume_state.expanded
+            # Reuse the journaled pages of everything still to be expanded or built
+            needed = {node.url for degree in range(start_degree, self.max_degree + 1)
+                      for node in self.nodes_at(degree)}
+            needed.update(link[2] for link in pending)
+            for url, page in pages_by_url(resume_state.pages).items():
+                if url in needed:
+                    self.memo_put(url, page)
 
         # Process nodes by degree
-        for degree in range(self.max_degree + 1):
+        for degree in range(start_degree, self.max_degree + 1):
             if stop_flag and stop_flag.is_set():
                 self.log_status('Extraction stopped by user.', log_callback)
                 break
             self.log_status(f"\n=== Processing Degree {degree} ===", log_callback)
+            self.current_degree = degree
+            self.report_progress(force=True)
 
             # Get all nodes at current degree
-            current_degree_nodes = [node for node in self.extracted_nodes if node.degree == degree]
+            current_degree_nodes = self.nodes_at(degree)
 
             if not current_degree_nodes:
                 self.log_status(f"No nodes found at degree {degree}, stopping extraction.", log_callback)
                 break
 
-            for node in current_degree_nodes:
+            # Pages are fetched in parallel, but links are claimed in frontier
+            # order so the visited set evolves exactly as in a serial crawl
+            frontier = [node for node in current_degree_nodes if node.url not in expanded]
+            pages = self.map_pages([node.url for node in frontier], log_callback, stop_flag)
+            related, pending = pending, []
+            for node, page in zip(frontier, pages):
                 if stop_flag and stop_flag.is_set():
                     self.log_status('Extraction stopped by user.', log_callback)
                     break
                 self.log_status(f"\nProcessing: {node.title} ({node.node_type})", log_callback)
+                related.extend(self.discover_related(node.url, degree, page, log_callback))
+                if self.journal:
+                    self.journal.record_expanded(node.url)
 
-                # Extract related nodes
-                related_nodes = self.extract_related_nodes(node.url, degree, log_callback, stop_flag)
-
-                # Add new nodes to the list
-                for related_node in related_nodes:
-                    if related_node.degree <= self.max_degree:
-                        self.extracted_nodes.append(related_node)
-
-                # Add delay to be respectful to Wikipedia servers
-                time.sleep(1)
+            # Nodes past max_degree are dropped, so don't spend requests on them
+            if degree + 1 <= self.max_degree:
+                for node in self.build_related_nodes(related, degree, log_callback, stop_flag):
+                    self.add_node(node)
 
+            if self.journal and not (stop_flag and stop_flag.is_set()):
+                self.journal.record_degree(degree)
+            for sink in self.sinks:
+                sink.flush()
+            self.report_progress(force=True)
             self.log_status(f"Completed Degree {degree}. Total nodes so far: {len(self.extracted_nodes)}", log_callback)
 
-        self.log_status("\n" + "=" * 50, log_callback)
-        self.log_status("EXTRACTION COMPLETED", log_callback)
-        self.log_status(f"Total nodes extracted: {len(self.extracted_nodes)}", log_callback)
-
-        return self.extracted_nodes
-
     def save_results(self, filename: str = "extraction_results.json"):
         """Save extraction results to JSON file"""
-        results = []
-        for node in self.extracted_nodes:
-            results.append({
-                'title': node.title,
-                'url': node.url,
-                'node_type': node.node_type,
-                'degree': node.degree,
-                'parent_url': node.parent_url,
-                'description': node.description,
-                'start_date': node.start_date,
-                'end_date': node.end_date,
-                'metadata': node.metadata
-            })
-
+        # Written one node at a time (same layout as json.dump(..., indent=2))
+        # so no second copy of the whole result set is built in memory
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+            f.write('[')
+            for i, node in enumerate(self.extracted_nodes):
+                item = json.dumps(node_to_dict(node), indent=2, ensure_ascii=False)
+                f.write((',\n  ' if i else '\n  ') + item.replace('\n', '\n  '))
+            f.write('\n]' if self.extracted_nodes else ']')
 
         self.log_status(f"Results saved to: {filename}")
+        self.status_log.flush()
 
     def print_summary(self):
         """Print a summary of the extraction results"""
@@ -305,9 +938,8 @@ class WikipediaExtractor:
         self.log_status("=" * 50)
 
         for degree in range(self.max_degree + 1):
-            nodes_at_degree = [node for node in self.extracted_nodes if node.degree == degree]
-            events = [node for node in nodes_at_degree if node.node_type == 'Event']
-            people = [node for node in nodes_at_degree if node.node_type == 'Person']
+            events = self.nodes_at(degree, 'Event')
+            people = self.nodes_at(degree, 'Person')
 
             self.log_status(f"\nDegree {degree}:")
             self.log_status(f"  Events: {len(events)}")
@@ -318,17 +950,76 @@ class WikipediaExtractor:
             for person in people:
                 self.log_status(f"    - {person.title}")
 
+        self.log_status(f"\nPages fetched: {self.stats['pages_fetched']}")
+        self.log_status(f"Cache hits: {self.stats['cache_hits']}")
+        self.log_status(f"Fetches saved by page memo: {self.stats['fetches_saved']}")
+        self.status_log.flush()
+
 def main():
     """Main function to run the Wikipedia extraction"""
+    parser = argparse.ArgumentParser(description="Extract events and people from Wikipedia")
+    parser.add_argument('--workers', type=int, default=1, help="Number of concurrent fetch workers")
+    parser.add_argument('--rps', type=float, default=1.0, help="Maximum requests per second, shared by all workers")
+    parser.add_argument('--host-rps', type=float, default=None, help="Also limit the requests per second to each host")
+    parser.add_argument('--cache', default=None, help="Path of the persistent page cache (SQLite)")
+    parser.add_argument('--cache-ttl', type=float, default=168, help="Hours before cached pages are revalidated")
+    parser.add_argument('--cache-only', action='store_true', help="Serve pages from the cache only, never fetch")
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default='lxml', help="HTML parser backend")
+    parser.add_argument('--backend', choices=FETCH_BACKENDS, default='html', help="Scrape article HTML or use the MediaWiki API")
+    parser.add_argument('--fixtures', default=None, help="Directory of saved <Title>.html pages to load into the cache")
+    parser.add_argument('--columnar', action='store_true', help="Keep nodes in a compact columnar store")
+    parser.add_argument('--output', action='append', default=[],
+                        help="Stream nodes to this file while crawling (.jsonl or .csv, optionally .gz, or a .db SQLite session store); repeatable")
+    parser.add_argument('--journal', default=None, help="Append crawl progress to this JSONL journal")
+    parser.add_argument('--resume', action='store_true', help="Resume the interrupted crawl recorded in --journal")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Redo the crawl recorded in --journal, refetching only pages edited since")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Seconds to wait for a server before retrying")
+    parser.add_argument('--retries', type=int, default=5,
+                        help="Retries of a request after errors, 429 and 5xx responses (with backoff)")
+    parser.add_argument('--log-level', choices=LOG_LEVELS, default='info',
+                        help="Least important status lines to print ('debug' adds every fetch)")
+    parser.add_argument('--metrics', default=None,
+                        help="Write crawl metrics here when the crawl ends (.prom for Prometheus text, otherwise JSON)")
+    parser.add_argument('--bloom', type=int, default=None, metavar='PAGES',
+                        help="Track visited pages in a fixed-size Bloom filter sized for this many pages "
+                             "(about 0.1%% of unvisited pages may be skipped)")
+    args = parser.parse_args()
+    if args.resume and not args.journal:
+        parser.error("--resume requires --journal")
+    if args.refresh and not args.journal:
+        parser.error("--refresh requires --journal")
+    if args.resume and args.refresh:
+        parser.error("--resume and --refresh can't be combined")
+
+    page_cache = None
+    if args.cache or args.cache_only or args.fixtures:
+        page_cache = PageCache(args.cache or "page_cache.sqlite3", ttl=args.cache_ttl * 3600)
+        if args.fixtures:
+            page_cache.load_fixtures(args.fixtures)
+
+    sinks = [open_sink(path) for path in args.output]
+
     # Seed URL for Korean War
     seed_url = "https://en.wikipedia.org/wiki/Korean_War"
 
     # Initialize extractor
-    extractor = WikipediaExtractor()
+    extractor = WikipediaExtractor(max_workers=args.workers, requests_per_second=args.rps,
+                                   host_requests_per_second=args.host_rps,
+                                   page_cache=page_cache, cache_only=args.cache_only, parser=args.parser,
+                                   fetch_backend=args.backend, journal_path=args.journal,
+                                   columnar=args.columnar, sinks=sinks, log_level=LOG_LEVELS[args.log_level],
+                                   metrics_path=args.metrics, bloom_capacity=args.bloom,
+                                   http_config=HttpConfig(timeout=args.timeout, retries=args.retries))
 
     try:
         # Run extraction
-        extracted_nodes = extractor.extract_data(seed_url)
+        if args.resume:
+            extractor.resume()
+        elif args.refresh:
+            extractor.refresh()
+        else:
+            extractor.extract_data(seed_url)
 
         # Print summary
         extractor.print_summary()
@@ -340,8 +1031,15 @@ def main():
 
     except KeyboardInterrupt:
         print("\nExtraction interrupted by user.")
+        if args.journal:
+            print(f"Progress is saved in {args.journal}; continue with --journal {args.journal} --resume")
     except Exception as e:
         print(f"\nError during extraction: {str(e)}")
+    finally:
+        for sink in sinks:
+            sink.close()
+        if page_cache:
+            page_cache.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file